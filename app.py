@@ -2,17 +2,47 @@
 Web Frontend for Intelligent SBI Form Filler
 Flask application with form input and PDF download
 """
-from flask import Flask, render_template, request, send_file, jsonify
+from flask import Flask, Response, render_template, request, send_file, jsonify, stream_with_context
 from werkzeug.utils import secure_filename
 import os
+import io
 import json
+import uuid
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from intelligent_form_filler import call_ollama_llm, clean_extracted_data, print_extracted_data
-from step4_fill_form import PDFFormFiller
+from intelligent_form_filler import call_ollama_llm, stream_ollama_llm, clean_extracted_data, print_extracted_data, warm_up_llm
+from step4_fill_form import PDFFormFiller, SAVE_PROFILES
+from template_cache import get_template_registry
+from image_cache import get_image_cache
+from pdf_store import PDFStore
+from extraction_cache import get_extraction_cache
+from ollama_client import configure_ollama_client, configure_ollama_pool, get_ollama_client
+from llm_metrics import get_llm_metrics, llm_call_metrics
+from single_flight import get_single_flight
+from pincode_index import get_pincode_index
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['PERSIST_OUTPUTS'] = False  # Also write generated PDFs to outputs/
+app.config['OUTPUT_STORE_TTL'] = 600  # Seconds a generated PDF stays downloadable from memory
+app.config['OUTPUT_STORE_MAX_ITEMS'] = 64
+app.config['SAVE_PROFILE'] = 'fast'  # Default PDF save profile: fast / compact / incremental
+app.config['OLLAMA_HOST'] = os.environ.get('OLLAMA_HOST')  # None for the default (localhost:11434)
+app.config['OLLAMA_TIMEOUT'] = 120  # Seconds per LLM request
+app.config['OLLAMA_KEEP_ALIVE'] = '30m'  # How long Ollama keeps the model loaded
+app.config['LLM_WARM_UP'] = True  # Load the model and system prompt at startup
+app.config['LLM_KEEP_WARM_INTERVAL'] = 300  # Seconds between idle keep-warm pings (0 to disable)
+app.config['LLM_PARALLEL_SECTIONS'] = False  # Extract form sections as concurrent requests
+app.config['LLM_CASCADE'] = False  # Small model first, larger model only for fields failing validation
+app.config['LLM_INPUT_TOKEN_BUDGET'] = 384  # Compact longer input before prompting (None to disable)
+app.config['LLM_COMPACT_OUTPUT'] = False  # Short field codes, missing fields left out (fewer decode tokens)
+app.config['LLM_REEXTRACT_INVALID'] = True  # Ask again for fields failing validation (focused prompt)
+app.config['OLLAMA_EXTRA_HOSTS'] = []  # More Ollama instances to spread section requests over
+app.config['LLM_DEBUG_METRICS'] = False  # Include per-call LLM timing/token metrics in API responses
+app.config['PDF_PREP_WORKERS'] = 4  # Threads preparing PDFs while the LLM runs
 
 # Create necessary directories
 os.makedirs('outputs', exist_ok=True)
@@ -20,6 +50,38 @@ os.makedirs('uploads', exist_ok=True)
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp'}
 
+# Template PDF path
+TEMPLATE_PATH = '45679523-SBI-Account-Opening-Form-I (1)_removed.pdf'
+
+# Load the template into the process-wide cache once, up front
+if os.path.exists(TEMPLATE_PATH):
+    get_template_registry().get(TEMPLATE_PATH)
+
+# One long-lived Ollama client (pooled connections, explicit keep_alive)
+configure_ollama_client(
+    host=app.config['OLLAMA_HOST'],
+    timeout=app.config['OLLAMA_TIMEOUT'],
+    keep_alive=app.config['OLLAMA_KEEP_ALIVE']
+)
+if app.config['OLLAMA_EXTRA_HOSTS']:
+    configure_ollama_pool(
+        app.config['OLLAMA_EXTRA_HOSTS'],
+        timeout=app.config['OLLAMA_TIMEOUT'],
+        keep_alive=app.config['OLLAMA_KEEP_ALIVE']
+    )
+
+# Template copies and images are prepared here while the LLM extracts the text
+pdf_prep_executor = ThreadPoolExecutor(
+    max_workers=app.config['PDF_PREP_WORKERS'],
+    thread_name_prefix='pdf-prep'
+)
+
+# Recently generated PDFs, served by /download without a disk round trip
+pdf_store = PDFStore(
+    ttl_seconds=app.config['OUTPUT_STORE_TTL'],
+    max_items=app.config['OUTPUT_STORE_MAX_ITEMS']
+)
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -30,6 +92,162 @@ def index():
     return render_template('index.html')
 
 
+def save_uploaded_images(files):
+    """
+    Save uploaded photograph/signature files.
+    
+    Returns:
+        Dict mapping 'photograph' / 'signature' to the saved file paths
+    """
+    timestamp_prefix = datetime.now().strftime('%Y%m%d_%H%M%S')
+    saved = {}
+    
+    for field_name in ('photograph', 'signature'):
+        if field_name in files:
+            upload = files[field_name]
+            if upload and upload.filename and allowed_file(upload.filename):
+                filename = f'{field_name}_{timestamp_prefix}_{secure_filename(upload.filename)}'
+                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                upload.save(filepath)
+                saved[field_name] = filepath
+                print(f"✓ Saved {field_name}: {filepath}")
+    
+    return saved
+
+
+def resolve_images(uploaded_images):
+    """Pick the photograph/signature to use: uploads first, then the default images."""
+    images = dict(uploaded_images)
+    
+    if not images.get('photograph') and os.path.exists('photograph.jpg'):
+        images['photograph'] = 'photograph.jpg'
+    
+    if not images.get('signature') and os.path.exists('signature.png'):
+        images['signature'] = 'signature.png'
+    
+    return images
+
+
+def prepare_filler(files, save_profile):
+    """
+    Do all the PDF work that doesn't need the extracted data.
+    
+    Saves the uploads, copies the template and embeds the (normalized)
+    photograph and signature, so only the text overlay is left once the
+    LLM returns. Runs on pdf_prep_executor alongside the extraction.
+    
+    Args:
+        files: The request's uploaded files
+        save_profile: PDF save profile for the filler
+    
+    Returns:
+        (filler, images) - the prepared PDFFormFiller and the image paths used
+    """
+    images = resolve_images(save_uploaded_images(files))
+    
+    # Template comes from the in-memory cache
+    filler = PDFFormFiller(TEMPLATE_PATH, save_profile=save_profile)
+    filler.prefill(images)
+    return filler, images
+
+
+def discard_prepared(future):
+    """Close a prepared filler that won't be used (e.g. the LLM call failed)."""
+    def close(done):
+        if not done.exception():
+            done.result()[0].close()
+    future.add_done_callback(close)
+
+
+def render_filled_pdf(cleaned_data, filler):
+    """
+    Finish a prepared form in memory.
+    
+    Args:
+        cleaned_data: Extracted form data (including the image paths)
+        filler: PDFFormFiller returned by prepare_filler()
+    
+    Returns:
+        (output_filename, pdf_bytes)
+    """
+    # Generate unique filename
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_filename = f'SBI_filled_{timestamp}_{uuid.uuid4().hex[:8]}.pdf'
+    
+    pdf_bytes = filler.fill_to_bytes(cleaned_data)
+    
+    print(f"\n✓ PDF generated successfully: {output_filename} ({len(pdf_bytes)} bytes)")
+    
+    if app.config['PERSIST_OUTPUTS']:
+        output_path = os.path.join('outputs', output_filename)
+        with open(output_path, 'wb') as f:
+            f.write(pdf_bytes)
+        print(f"✓ Saved copy to: {output_path}")
+    
+    return output_filename, pdf_bytes
+
+
+def build_response_data(cleaned_data, output_filename, pdf_bytes, inline_pdf=False):
+    """Build the JSON response describing a filled form."""
+    response_data = {
+        'success': True,
+        'message': 'Form filled successfully!',
+        'pdf_filename': output_filename,
+        'download_url': f'/download/{output_filename}',
+        'extracted_data': {
+            'personal': {
+                'full_name': cleaned_data.get('full_name', ''),
+                'father_name': cleaned_data.get('father_name', ''),
+                'mother_name': cleaned_data.get('mother_name', ''),
+                'date_of_birth': cleaned_data.get('date_of_birth', ''),
+                'gender': cleaned_data.get('gender', ''),
+                'marital_status': cleaned_data.get('marital_status', '')
+            },
+            'residential': {
+                'address_line1': cleaned_data.get('residential_address_line1', ''),
+                'address_line2': cleaned_data.get('residential_address_line2', ''),
+                'address_line3': cleaned_data.get('residential_address_line3', ''),
+                'landmark': cleaned_data.get('residential_landmark', ''),
+                'city': cleaned_data.get('city', ''),
+                'state': cleaned_data.get('state', ''),
+                'pincode': cleaned_data.get('pincode', ''),
+                'phone': cleaned_data.get('phone_no', ''),
+                'mobile': cleaned_data.get('mobile_number', ''),
+                'email_1': cleaned_data.get('email_id_1', ''),
+                'email_2': cleaned_data.get('email_id_2', '')
+            },
+            'office': {
+                'address_line1': cleaned_data.get('office_address_line1', ''),
+                'address_line2': cleaned_data.get('office_address_line2', ''),
+                'address_line3': cleaned_data.get('office_address_line3', ''),
+                'landmark': cleaned_data.get('office_landmark', ''),
+                'city': cleaned_data.get('office_city', ''),
+                'state': cleaned_data.get('office_state', ''),
+                'pincode': cleaned_data.get('office_pincode', ''),
+                'phone': cleaned_data.get('office_phone_no', ''),
+                'fax': cleaned_data.get('office_fax_no', '')
+            },
+            'bank': {
+                'branch': cleaned_data.get('branch', ''),
+                'code': cleaned_data.get('code_no', ''),
+                'date': cleaned_data.get('date', ''),
+                'cif': cleaned_data.get('cif_no', ''),
+                'pan': cleaned_data.get('income_tax_pan_form', ''),
+                'nationality': cleaned_data.get('nationality', '')
+            },
+            'preferences': {
+                'customer_type': cleaned_data.get('customer_type', ''),
+                'correspondence': cleaned_data.get('correspondence_address', '')
+            }
+        }
+    }
+    
+    if inline_pdf:
+        response_data['pdf_base64'] = base64.b64encode(pdf_bytes).decode('ascii')
+    
+    return response_data
+
+
 @app.route('/api/fill-form', methods=['POST'])
 def fill_form():
     """
@@ -39,8 +257,14 @@ def fill_form():
     - 'input_text': Raw text data
     - 'photograph': Optional image file
     - 'signature': Optional image file
+    - 'response_mode': Optional, 'json' (default) or 'pdf' to stream the
+      filled PDF back directly in this response
+    - 'inline_pdf': Optional, '1' to include the PDF base64-encoded in the
+      JSON response so no separate download request is needed
+    - 'save_profile': Optional PDF save profile (fast / compact / incremental),
+      overriding app.config['SAVE_PROFILE']
     
-    Returns JSON with extraction results and download URL.
+    Returns JSON with extraction results and download URL, or the PDF itself.
     """
     try:
         # Get input data from form
@@ -52,126 +276,69 @@ def fill_form():
                 'error': 'No input text provided'
             }), 400
         
+        save_profile = request.form.get('save_profile') or app.config['SAVE_PROFILE']
+        if save_profile not in SAVE_PROFILES:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown save profile: {save_profile}'
+            }), 400
+        
         print(f"\n{'='*60}")
         print(f"Processing form fill request at {datetime.now()}")
         print(f"{'='*60}")
         print(f"Input text length: {len(raw_input)} characters")
         
-        # Step 1: Extract data using LLM
+        # Step 1: Save the images and prepare the template while the LLM runs
+        prepared = pdf_prep_executor.submit(prepare_filler, request.files, save_profile)
+        
+        # Step 2: Extract data using LLM
         try:
-            extracted_data = call_ollama_llm(raw_input)
+            with llm_call_metrics() as llm_calls:
+                extracted_data = call_ollama_llm(
+                    raw_input,
+                    parallel_sections=app.config['LLM_PARALLEL_SECTIONS'],
+                    cascade=app.config['LLM_CASCADE'],
+                    token_budget=app.config['LLM_INPUT_TOKEN_BUDGET'],
+                    compact_output=app.config['LLM_COMPACT_OUTPUT'],
+                    reextract_invalid=app.config['LLM_REEXTRACT_INVALID']
+                )
         except Exception as e:
             print(f"LLM Error: {str(e)}")
+            discard_prepared(prepared)
             return jsonify({
                 'success': False,
                 'error': f'LLM processing failed: {str(e)}',
                 'suggestion': 'Make sure Ollama is running: ollama serve'
             }), 500
         
-        # Step 2: Clean and validate data
+        # Step 3: Clean and validate data
         cleaned_data = clean_extracted_data(extracted_data)
         
-        # Step 3: Handle uploaded images
-        timestamp_prefix = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Handle photograph upload
-        if 'photograph' in request.files:
-            photograph = request.files['photograph']
-            if photograph and photograph.filename and allowed_file(photograph.filename):
-                filename = f'photograph_{timestamp_prefix}_{secure_filename(photograph.filename)}'
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                photograph.save(filepath)
-                cleaned_data['photograph'] = filepath
-                print(f"✓ Saved photograph: {filepath}")
-        
-        # Handle signature upload
-        if 'signature' in request.files:
-            signature = request.files['signature']
-            if signature and signature.filename and allowed_file(signature.filename):
-                filename = f'signature_{timestamp_prefix}_{secure_filename(signature.filename)}'
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                signature.save(filepath)
-                cleaned_data['signature'] = filepath
-                print(f"✓ Saved signature: {filepath}")
-        
-        # Fallback to default images if they exist
-        if not cleaned_data.get('photograph') and os.path.exists('photograph.jpg'):
-            cleaned_data['photograph'] = 'photograph.jpg'
+        # Step 4: Overlay the text on the prepared PDF
+        filler, images = prepared.result()
+        cleaned_data.update(images)
+        output_filename, pdf_bytes = render_filled_pdf(cleaned_data, filler)
         
-        if not cleaned_data.get('signature') and os.path.exists('signature.png'):
-            cleaned_data['signature'] = 'signature.png'
+        if request.form.get('response_mode', 'json') == 'pdf':
+            return send_file(
+                io.BytesIO(pdf_bytes),
+                as_attachment=True,
+                download_name=output_filename,
+                mimetype='application/pdf'
+            )
         
-        # Step 4: Fill the PDF form
-        # Generate unique filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_filename = f'SBI_filled_{timestamp}.pdf'
-        output_path = os.path.join('outputs', output_filename)
+        pdf_store.put(output_filename, pdf_bytes)
         
-        # Template PDF path
-        template_path = '45679523-SBI-Account-Opening-Form-I (1)_removed.pdf'
-        
-        # Initialize filler with paths
-        filler = PDFFormFiller(template_path, output_path)
-        filler.open_template()
-        filler.fill_form(cleaned_data)
-        filler.save()
-        
-        print(f"\n✓ PDF generated successfully: {output_path}")
-        
-        # Step 5: Prepare response with extracted data
-        response_data = {
-            'success': True,
-            'message': 'Form filled successfully!',
-            'pdf_filename': output_filename,
-            'download_url': f'/download/{output_filename}',
-            'extracted_data': {
-                'personal': {
-                    'full_name': cleaned_data.get('full_name', ''),
-                    'father_name': cleaned_data.get('father_name', ''),
-                    'mother_name': cleaned_data.get('mother_name', ''),
-                    'date_of_birth': cleaned_data.get('date_of_birth', ''),
-                    'gender': cleaned_data.get('gender', ''),
-                    'marital_status': cleaned_data.get('marital_status', '')
-                },
-                'residential': {
-                    'address_line1': cleaned_data.get('residential_address_line1', ''),
-                    'address_line2': cleaned_data.get('residential_address_line2', ''),
-                    'address_line3': cleaned_data.get('residential_address_line3', ''),
-                    'landmark': cleaned_data.get('residential_landmark', ''),
-                    'city': cleaned_data.get('city', ''),
-                    'state': cleaned_data.get('state', ''),
-                    'pincode': cleaned_data.get('pincode', ''),
-                    'phone': cleaned_data.get('phone_no', ''),
-                    'mobile': cleaned_data.get('mobile_number', ''),
-                    'email_1': cleaned_data.get('email_id_1', ''),
-                    'email_2': cleaned_data.get('email_id_2', '')
-                },
-                'office': {
-                    'address_line1': cleaned_data.get('office_address_line1', ''),
-                    'address_line2': cleaned_data.get('office_address_line2', ''),
-                    'address_line3': cleaned_data.get('office_address_line3', ''),
-                    'landmark': cleaned_data.get('office_landmark', ''),
-                    'city': cleaned_data.get('office_city', ''),
-                    'state': cleaned_data.get('office_state', ''),
-                    'pincode': cleaned_data.get('office_pincode', ''),
-                    'phone': cleaned_data.get('office_phone_no', ''),
-                    'fax': cleaned_data.get('office_fax_no', '')
-                },
-                'bank': {
-                    'branch': cleaned_data.get('branch', ''),
-                    'code': cleaned_data.get('code_no', ''),
-                    'date': cleaned_data.get('date', ''),
-                    'cif': cleaned_data.get('cif_no', ''),
-                    'pan': cleaned_data.get('income_tax_pan_form', ''),
-                    'nationality': cleaned_data.get('nationality', '')
-                },
-                'preferences': {
-                    'customer_type': cleaned_data.get('customer_type', ''),
-                    'correspondence': cleaned_data.get('correspondence_address', '')
-                }
+        # Step 5: Build response with extracted data
+        response_data = build_response_data(
+            cleaned_data, output_filename, pdf_bytes,
+            inline_pdf=request.form.get('inline_pdf') == '1'
+        )
+        if app.config['LLM_DEBUG_METRICS']:
+            response_data['llm_metrics'] = {
+                'calls': llm_calls,
+                'rolling': get_llm_metrics().snapshot()
             }
-        }
-        
         return jsonify(response_data), 200
         
     except Exception as e:
@@ -185,12 +352,118 @@ def fill_form():
         }), 500
 
 
+def sse_event(event, payload):
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route('/api/fill-form/stream', methods=['POST'])
+def fill_form_stream():
+    """
+    Streaming variant of /api/fill-form using server-sent events.
+    
+    Accepts the same FormData (except response_mode) and responds with a
+    text/event-stream:
+    - 'field' events ({field, value, source}) as each field is extracted
+    - one 'done' event with the same JSON body /api/fill-form returns
+    - or an 'error' event ({error}) if extraction or filling fails
+    """
+    raw_input = request.form.get('input_text', '').strip()
+    if not raw_input:
+        return jsonify({
+            'success': False,
+            'error': 'No input text provided'
+        }), 400
+    
+    save_profile = request.form.get('save_profile') or app.config['SAVE_PROFILE']
+    if save_profile not in SAVE_PROFILES:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown save profile: {save_profile}'
+        }), 400
+    
+    inline_pdf = request.form.get('inline_pdf') == '1'
+    
+    # Uploads must be read while the request is still open; the template is
+    # prepared alongside the extraction
+    prepared = pdf_prep_executor.submit(prepare_filler, request.files, save_profile)
+    
+    print(f"\n{'='*60}")
+    print(f"Processing streaming form fill request at {datetime.now()}")
+    print(f"{'='*60}")
+    print(f"Input text length: {len(raw_input)} characters")
+    
+    def generate():
+        rendered = False
+        try:
+            cleaned_data = None
+            with llm_call_metrics() as llm_calls:
+                for event in stream_ollama_llm(
+                    raw_input,
+                    parallel_sections=app.config['LLM_PARALLEL_SECTIONS'],
+                    cascade=app.config['LLM_CASCADE'],
+                    token_budget=app.config['LLM_INPUT_TOKEN_BUDGET'],
+                    compact_output=app.config['LLM_COMPACT_OUTPUT'],
+                    reextract_invalid=app.config['LLM_REEXTRACT_INVALID']
+                ):
+                    if event['event'] == 'field':
+                        yield sse_event('field', {
+                            'field': event['field'],
+                            'value': event['value'],
+                            'source': event['source']
+                        })
+                    else:
+                        cleaned_data = event['data']
+            
+            filler, images = prepared.result()
+            cleaned_data.update(images)
+            output_filename, pdf_bytes = render_filled_pdf(cleaned_data, filler)
+            rendered = True
+            pdf_store.put(output_filename, pdf_bytes)
+            response_data = build_response_data(cleaned_data, output_filename, pdf_bytes, inline_pdf)
+            if app.config['LLM_DEBUG_METRICS']:
+                response_data['llm_metrics'] = {
+                    'calls': llm_calls,
+                    'rolling': get_llm_metrics().snapshot()
+                }
+            yield sse_event('done', response_data)
+            
+        except Exception as e:
+            print(f"\n❌ Error: {str(e)}")
+            yield sse_event('error', {
+                'success': False,
+                'error': f'Form filling failed: {str(e)}',
+                'suggestion': 'Make sure Ollama is running: ollama serve'
+            })
+        finally:
+            # Also runs when the client disconnects (GeneratorExit)
+            if not rendered:
+                discard_prepared(prepared)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/download/<filename>')
 def download_file(filename):
     """
     Download endpoint for generated PDFs.
+    Serves from the in-memory store first, then from outputs/ on disk.
     """
     try:
+        filename = secure_filename(filename)
+        pdf_bytes = pdf_store.get(filename)
+        if pdf_bytes is not None:
+            return send_file(
+                io.BytesIO(pdf_bytes),
+                as_attachment=True,
+                download_name=filename,
+                mimetype='application/pdf'
+            )
+        
         file_path = os.path.join('outputs', filename)
         
         if not os.path.exists(file_path):
@@ -217,23 +490,74 @@ def download_file(filename):
 def health_check():
     """Health check endpoint."""
     try:
-        import ollama
         # Try to list models to check Ollama connection
-        models = ollama.list()
+        models = get_ollama_client().list()
         ollama_status = 'connected'
         model_available = any('llama3.1' in str(m) for m in models.get('models', []))
     except:
         ollama_status = 'disconnected'
         model_available = False
     
+    pincode_index = get_pincode_index()
     return jsonify({
         'status': 'running',
         'ollama': ollama_status,
         'model_llama3.1': model_available,
+        'templates': get_template_registry().stats(),
+        'image_cache': get_image_cache().stats(),
+        'pdf_store': pdf_store.stats(),
+        'extraction_cache': get_extraction_cache().stats(),
+        'ollama_client': get_ollama_client().stats(),
+        'llm_metrics': get_llm_metrics().snapshot(),
+        'single_flight': get_single_flight().stats(),
+        'pincode_index': pincode_index.stats() if pincode_index else None,
         'timestamp': datetime.now().isoformat()
     })
 
 
+_warm_up_lock = threading.Lock()
+_warm_up_pid = None
+
+
+def start_llm_warm_up():
+    """
+    Warm the model up in the background so startup isn't blocked.
+    
+    Runs once per process: forked WSGI workers (e.g. gunicorn --preload)
+    start their own, since the parent's thread doesn't survive the fork.
+    """
+    global _warm_up_pid
+    with _warm_up_lock:
+        if _warm_up_pid == os.getpid():
+            return
+        _warm_up_pid = os.getpid()
+    
+    def run():
+        try:
+            warm_up_llm(
+                keep_warm_interval=app.config['LLM_KEEP_WARM_INTERVAL'],
+                compact_output=app.config['LLM_COMPACT_OUTPUT']
+            )
+        except Exception as e:
+            print(f"⚠️  LLM warm-up failed: {e}")
+            print("Make sure Ollama is running: ollama serve")
+    
+    threading.Thread(target=run, name='llm-warm-up', daemon=True).start()
+
+
+@app.before_request
+def ensure_llm_warm_up():
+    """Start the warm-up in worker processes forked after app setup."""
+    if app.config['LLM_WARM_UP']:
+        start_llm_warm_up()
+
+
+# Warm up at app setup, so it also happens under a WSGI server. The debug
+# reloader's parent process only watches files, so it is skipped there.
+if app.config['LLM_WARM_UP'] and (__name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+    start_llm_warm_up()
+
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🤖 INTELLIGENT SBI FORM FILLER - Web Interface")
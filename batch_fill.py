@@ -0,0 +1,343 @@
+"""
+Batch Form Filler
+Fills many SBI forms headlessly from a JSONL or CSV export, using a pool of
+worker processes. Each worker loads the template and default images once.
+
+Usage:
+    python batch_fill.py records.jsonl -o filled/
+    python batch_fill.py records.csv -o filled.zip --workers 8
+    python batch_fill.py records.csv -o print_run.pdf   (one merged PDF)
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+
+from intelligent_form_filler import clean_extracted_data
+from layout_config import get_all_image_fields
+from step4_fill_form import PDFFormFiller, MergedFormWriter, SAVE_PROFILES
+from template_cache import get_template_registry
+from image_cache import get_image_cache
+
+TEMPLATE_PDF = "45679523-SBI-Account-Opening-Form-I (1)_removed.pdf"
+DEFAULT_PHOTOGRAPH = "photograph.jpg"
+DEFAULT_SIGNATURE = "signature.png"
+
+# Per-process state, set up once by init_worker()
+_worker = {}
+
+
+def read_records(input_path, input_format=None):
+    """
+    Stream records from a JSONL or CSV file.
+
+    Args:
+        input_path: Path to the input file
+        input_format: "jsonl" or "csv" (guessed from the extension if None)
+
+    Yields:
+        (record_number, record dict) tuples, numbered from 1
+    """
+    if input_format is None:
+        input_format = "csv" if input_path.lower().endswith(".csv") else "jsonl"
+
+    with open(input_path, "r", encoding="utf-8", newline="") as f:
+        if input_format == "csv":
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield number, row
+        else:
+            number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    # Passed on so the worker reports it as a failed record
+                    yield number, {"_parse_error": str(e)}
+                    continue
+                if not isinstance(record, dict):
+                    yield number, {"_parse_error": f"expected a JSON object, got {type(record).__name__}"}
+                    continue
+                yield number, record
+
+
+def record_filename(number, record):
+    """Output filename for a record: its 'id' column if present, else its number."""
+    record_id = str(record.get("id") or "").strip()
+    if record_id:
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in record_id)
+        return f"SBI_filled_{safe_id}.pdf"
+    return f"SBI_filled_{number:06d}.pdf"
+
+
+def prepare_record(record, photograph, signature):
+    """Clean a record and add the default images it is missing."""
+    if "_parse_error" in record:
+        raise ValueError(f"Invalid JSON: {record['_parse_error']}")
+    data = clean_extracted_data(record)
+    if not data.get("photograph") and photograph:
+        data["photograph"] = photograph
+    if not data.get("signature") and signature:
+        data["signature"] = signature
+    return data
+
+
+def init_worker(template_path, save_profile, output_dir, photograph, signature):
+    """Load the template and default images once per worker process."""
+    _worker.update(
+        template_path=template_path,
+        save_profile=save_profile,
+        output_dir=output_dir,
+        photograph=photograph,
+        signature=signature,
+    )
+
+    get_template_registry().get(template_path)
+    image_fields = get_all_image_fields()
+    for field_name, image_path in (("photograph", photograph), ("signature", signature)):
+        if image_path and os.path.exists(image_path):
+            config = image_fields[field_name]
+            get_image_cache().prepare(image_path, config["width"], config["height"], config["encoding"])
+
+
+def fill_record(task):
+    """
+    Fill one record in a worker process.
+
+    Returns:
+        (number, filename, pdf_bytes or None, error or None). pdf_bytes is
+        only returned when there is no output directory (ZIP output).
+    """
+    number, record = task
+    filename = f"SBI_filled_{number:06d}.pdf"
+    try:
+        filename = record_filename(number, record)
+        data = prepare_record(record, _worker["photograph"], _worker["signature"])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler = PDFFormFiller(_worker["template_path"], save_profile=_worker["save_profile"])
+            pdf_bytes = filler.fill_to_bytes(data)
+
+        if _worker["output_dir"]:
+            with open(os.path.join(_worker["output_dir"], filename), "wb") as f:
+                f.write(pdf_bytes)
+            return number, filename, None, None
+        return number, filename, pdf_bytes, None
+    except Exception as e:
+        return number, filename, None, f"{type(e).__name__}: {e}"
+
+
+def run_batch(input_path, output, workers=None, chunksize=8, save_profile="fast",
+              template_path=TEMPLATE_PDF, photograph=DEFAULT_PHOTOGRAPH,
+              signature=DEFAULT_SIGNATURE, input_format=None, failures_path=None):
+    """
+    Fill every record in an input file.
+
+    Args:
+        input_path: JSONL or CSV file with one record per line/row
+        output: Output directory, or a path ending in .zip
+        workers: Number of worker processes (default: CPU count)
+        chunksize: Records handed to a worker at a time
+        save_profile: PDF save profile (see step4_fill_form.SAVE_PROFILES)
+        template_path: Blank form template
+        photograph: Default photograph for records without one (or None)
+        signature: Default signature for records without one (or None)
+        input_format: "jsonl" or "csv" (guessed from the extension if None)
+        failures_path: Optional JSONL file to write failed records to
+
+    Returns:
+        Summary dict with counts, elapsed time and failures
+    """
+    to_zip = output.lower().endswith(".zip")
+    output_dir = None if to_zip else output
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    photograph = photograph if photograph and os.path.exists(photograph) else None
+    signature = signature if signature and os.path.exists(signature) else None
+    workers = workers or os.cpu_count() or 1
+
+    print(f"📄 Input: {input_path}")
+    print(f"📦 Output: {output}")
+    print(f"⚙️  Workers: {workers}, save profile: {save_profile}")
+
+    succeeded = 0
+    failures = []
+    start = time.perf_counter()
+    last_report = start
+
+    zip_file = zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) if to_zip else None
+    try:
+        with multiprocessing.Pool(
+            workers,
+            initializer=init_worker,
+            initargs=(template_path, save_profile, output_dir, photograph, signature),
+        ) as pool:
+            tasks = read_records(input_path, input_format)
+            for number, filename, pdf_bytes, error in pool.imap_unordered(fill_record, tasks, chunksize):
+                if error:
+                    failures.append({"record": number, "file": filename, "error": error})
+                else:
+                    succeeded += 1
+                    if zip_file:
+                        zip_file.writestr(filename, pdf_bytes)
+
+                now = time.perf_counter()
+                if now - last_report >= 5:
+                    done = succeeded + len(failures)
+                    print(f"  ... {done} records, {done / (now - start):.1f} forms/s")
+                    last_report = now
+    finally:
+        if zip_file:
+            zip_file.close()
+
+    return print_summary(succeeded, failures, time.perf_counter() - start, failures_path)
+
+
+def run_merged(input_path, output_pdf, save_profile="fast", template_path=TEMPLATE_PDF,
+               photograph=DEFAULT_PHOTOGRAPH, signature=DEFAULT_SIGNATURE,
+               input_format=None, failures_path=None):
+    """
+    Fill every record in an input file onto the pages of one merged PDF.
+    
+    The template and the default images are stored once in the output (see
+    MergedFormWriter), so the file grows only by each record's overlay.
+    Runs in this process, since all pages go into one document.
+
+    Args:
+        input_path: JSONL or CSV file with one record per line/row
+        output_pdf: Path of the merged PDF to write
+        save_profile: "fast" or "compact"
+        template_path: Blank form template
+        photograph: Default photograph for records without one (or None)
+        signature: Default signature for records without one (or None)
+        input_format: "jsonl" or "csv" (guessed from the extension if None)
+        failures_path: Optional JSONL file to write failed records to
+
+    Returns:
+        Summary dict with counts, elapsed time and failures
+    """
+    photograph = photograph if photograph and os.path.exists(photograph) else None
+    signature = signature if signature and os.path.exists(signature) else None
+
+    print(f"📄 Input: {input_path}")
+    print(f"📦 Output: {output_pdf} (merged)")
+
+    succeeded = 0
+    failures = []
+    start = time.perf_counter()
+
+    writer = MergedFormWriter(template_path)
+    try:
+        for number, record in read_records(input_path, input_format):
+            try:
+                data = prepare_record(record, photograph, signature)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    writer.add_record(data)
+                succeeded += 1
+            except Exception as e:
+                failures.append({
+                    "record": number,
+                    "file": output_pdf,
+                    "error": f"{type(e).__name__}: {e}",
+                })
+        if succeeded:
+            writer.save(output_pdf, save_profile)
+    finally:
+        writer.close()
+
+    return print_summary(succeeded, failures, time.perf_counter() - start, failures_path)
+
+
+def print_summary(succeeded, failures, elapsed, failures_path=None):
+    """Print the batch summary and optionally write failed records to JSONL."""
+    total = succeeded + len(failures)
+
+    print("\n" + "=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    print(f"Records:    {total}")
+    print(f"Filled:     {succeeded}")
+    print(f"Failed:     {len(failures)}")
+    print(f"Elapsed:    {elapsed:.2f} s")
+    print(f"Throughput: {succeeded / elapsed if elapsed else 0:.1f} forms/s")
+
+    if failures:
+        failures.sort(key=lambda f: f["record"])
+        print("\nFailed records:")
+        for failure in failures[:20]:
+            print(f"  ❌ #{failure['record']} ({failure['file']}): {failure['error']}")
+        if len(failures) > 20:
+            print(f"  ... and {len(failures) - 20} more")
+        if failures_path:
+            with open(failures_path, "w", encoding="utf-8") as f:
+                for failure in failures:
+                    f.write(json.dumps(failure) + "\n")
+            print(f"\n✓ Failed records written to: {failures_path}")
+    print("=" * 60)
+
+    return {
+        "total": total,
+        "succeeded": succeeded,
+        "failed": len(failures),
+        "elapsed": elapsed,
+        "failures": failures,
+    }
+
+
+def main():
+    """Parse command line arguments and run the batch."""
+    parser = argparse.ArgumentParser(description="Fill SBI forms in bulk from a JSONL or CSV file.")
+    parser.add_argument("input", help="JSONL or CSV file with one record per line/row")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Output directory, a .zip file, or a .pdf file for one merged PDF")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from extension)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Records per worker task (default: 8)")
+    parser.add_argument("--save-profile", choices=sorted(SAVE_PROFILES), default="fast")
+    parser.add_argument("--template", default=TEMPLATE_PDF, help="Blank form template PDF")
+    parser.add_argument("--photograph", default=DEFAULT_PHOTOGRAPH, help="Default photograph ('' for none)")
+    parser.add_argument("--signature", default=DEFAULT_SIGNATURE, help="Default signature ('' for none)")
+    parser.add_argument("--failures", help="Write failed records to this JSONL file")
+    args = parser.parse_args()
+
+    if args.output.lower().endswith(".pdf"):
+        if args.workers and args.workers > 1:
+            print("⚠️  --workers is ignored for merged PDF output (all pages go into one document)")
+        summary = run_merged(
+            args.input,
+            args.output,
+            save_profile="compact" if args.save_profile == "compact" else "fast",
+            template_path=args.template,
+            photograph=args.photograph,
+            signature=args.signature,
+            input_format=args.format,
+            failures_path=args.failures,
+        )
+        sys.exit(1 if summary["failed"] else 0)
+
+    summary = run_batch(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        save_profile=args.save_profile,
+        template_path=args.template,
+        photograph=args.photograph,
+        signature=args.signature,
+        input_format=args.format,
+        failures_path=args.failures,
+    )
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+LLM Output Contract Benchmark
+Compares the full output contract (snake_case keys, every field present)
+with the compact one (short field codes, missing fields left out) on the
+bundled sample inputs: tokens generated (eval_count) and wall time per
+extraction, and whether both decode to the same form data.
+
+Runs against the fake Ollama server by default, so no model or GPU is
+needed; pass --host to measure a real Ollama instance instead.
+
+Usage:
+    python benchmark_llm.py [--iterations N] [--tokens-per-second R] [--host URL]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from fake_ollama_server import FakeOllamaServer
+from intelligent_form_filler import SAMPLE_INPUT, call_ollama_llm
+from llm_metrics import llm_call_metrics
+from ollama_client import configure_ollama_client
+
+SAMPLE_INPUT_FILE = "sample_input.txt"
+
+CONTRACTS = (("full", False), ("compact", True))
+
+
+def sample_inputs():
+    """The bundled sample inputs, by name."""
+    with open(SAMPLE_INPUT_FILE, encoding="utf-8") as f:
+        return {"SAMPLE_INPUT": SAMPLE_INPUT, SAMPLE_INPUT_FILE: f.read()}
+
+
+def extract_once(raw_input, compact_output):
+    """
+    Run one uncached, LLM-only extraction with its console output suppressed.
+
+    Returns:
+        (cleaned data, tokens generated, seconds taken)
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), llm_call_metrics() as calls:
+        data = call_ollama_llm(raw_input, use_cache=False, use_rules=False, compact_output=compact_output,
+                               reextract_invalid=False)
+    elapsed = time.perf_counter() - start
+    return data, sum(call["eval_count"] for call in calls), elapsed
+
+
+def benchmark_contracts(inputs, iterations):
+    """Compare eval_count and latency of both output contracts on every input."""
+    print("\n" + "=" * 60)
+    print("OUTPUT CONTRACT: full keys vs compact codes (sparse)")
+    print("=" * 60)
+
+    print(f"\n{'input':<20}{'contract':<10}{'eval_count':>12}{'ms/call':>10}")
+    totals = {label: [0, 0.0] for label, _ in CONTRACTS}
+    for name, raw_input in inputs.items():
+        decoded = {}
+        for label, compact in CONTRACTS:
+            extract_once(raw_input, compact)  # warm-up (evaluates this contract's system prompt)
+            runs = [extract_once(raw_input, compact) for _ in range(iterations)]
+            eval_count = sum(tokens for _, tokens, _ in runs) / len(runs)
+            ms = 1000 * sum(seconds for _, _, seconds in runs) / len(runs)
+            decoded[label] = runs[0][0]
+            totals[label][0] += eval_count
+            totals[label][1] += ms
+            print(f"{name:<20}{label:<10}{eval_count:>12.0f}{ms:>10.1f}")
+        same = decoded["full"] == decoded["compact"]
+        print(f"{'':<20}same decoded fields: {'yes' if same else 'NO'}")
+
+    full_tokens, full_ms = totals["full"]
+    compact_tokens, compact_ms = totals["compact"]
+    print(f"\nTokens generated: {full_tokens:.0f} -> {compact_tokens:.0f} "
+          f"({100 * (1 - compact_tokens / full_tokens):.0f}% fewer)")
+    print(f"Latency: {full_ms:.1f} -> {compact_ms:.1f} ms ({full_ms / compact_ms:.2f}x)")
+    return totals
+
+
+def main():
+    """Parse command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the LLM output contracts.")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--tokens-per-second", type=float, default=20.0,
+                        help="Output token rate of the fake server (CPU-like by default)")
+    parser.add_argument("--host", help="Benchmark this Ollama server instead of the fake one")
+    args = parser.parse_args()
+
+    server = None
+    host = args.host
+    if not host:
+        server = FakeOllamaServer(port=0, tokens_per_second=args.tokens_per_second, seed=0).start()
+        host = server.url
+        print(f"🤖 Fake Ollama server on {host} ({args.tokens_per_second:g} tokens/s)")
+    configure_ollama_client(host=host)
+
+    try:
+        benchmark_contracts(sample_inputs(), args.iterations)
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
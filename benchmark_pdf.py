@@ -0,0 +1,132 @@
+"""
+PDF Rendering Benchmark
+Measures form filling time and output size for the different PDFFormFiller
+rendering options against the bundled template and dummy data.
+
+Usage:
+    python benchmark_pdf.py [iterations]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+from dummy_data import generate_dummy_data
+from step4_fill_form import PDFFormFiller, SAVE_PROFILES
+
+TEMPLATE_PDF = "45679523-SBI-Account-Opening-Form-I (1)_removed.pdf"
+
+
+def benchmark_data():
+    """Dummy data without images, so only the text overlay is measured."""
+    data = generate_dummy_data()
+    data.pop("photograph", None)
+    data.pop("signature", None)
+    return data
+
+
+def fill_once(output_path, data, **filler_options):
+    """Fill and save one form with its console output suppressed; return seconds taken."""
+    filler = PDFFormFiller(TEMPLATE_PDF, output_path, **filler_options)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        filler.fill_and_save(data)
+    return time.perf_counter() - start
+
+
+def content_stats(pdf_path):
+    """Return (number of content streams, total content bytes) for page 0."""
+    doc = fitz.open(pdf_path)
+    page = doc[0]
+    stats = (len(page.get_contents()), len(page.read_contents()))
+    doc.close()
+    return stats
+
+
+def render_page(pdf_path, dpi=150):
+    """Render page 0 to raw pixel samples for comparison."""
+    doc = fitz.open(pdf_path)
+    samples = doc[0].get_pixmap(dpi=dpi).samples
+    doc.close()
+    return samples
+
+
+def benchmark_glyph_batching(iterations, workdir):
+    """Compare per-glyph insert_text against the batched content stream."""
+    print("\n" + "=" * 60)
+    print("GLYPH RENDERING: per-glyph insert_text vs batched stream")
+    print("=" * 60)
+
+    data = benchmark_data()
+    results = {}
+    for label, batch_glyphs in (("per-glyph", False), ("batched", True)):
+        output_path = os.path.join(workdir, f"glyphs_{label}.pdf")
+        fill_once(output_path, data, batch_glyphs=batch_glyphs)  # warm-up
+        times = [fill_once(output_path, data, batch_glyphs=batch_glyphs) for _ in range(iterations)]
+        streams, content_bytes = content_stats(output_path)
+        results[label] = {
+            "path": output_path,
+            "ms": 1000 * sum(times) / len(times),
+            "streams": streams,
+            "content_bytes": content_bytes,
+            "file_bytes": os.path.getsize(output_path),
+        }
+
+    print(f"\n{'mode':<12}{'ms/form':>10}{'streams':>10}{'content B':>12}{'file B':>10}")
+    for label, r in results.items():
+        print(f"{label:<12}{r['ms']:>10.2f}{r['streams']:>10}{r['content_bytes']:>12}{r['file_bytes']:>10}")
+
+    speedup = results["per-glyph"]["ms"] / results["batched"]["ms"]
+    identical = render_page(results["per-glyph"]["path"]) == render_page(results["batched"]["path"])
+    print(f"\nSpeedup: {speedup:.2f}x")
+    print(f"Pixel-identical output: {'yes' if identical else 'NO'}")
+    return results
+
+
+def benchmark_image_preprocessing(iterations, workdir):
+    """Compare embedding the original image files against cached, downsampled ones."""
+    print("\n" + "=" * 60)
+    print("IMAGES: original files vs preprocessed (cached) images")
+    print("=" * 60)
+
+    data = generate_dummy_data()
+    print(f"\n{'mode':<14}{'ms/form':>10}{'file B':>12}")
+    for label, preprocess in (("original", False), ("preprocessed", True)):
+        output_path = os.path.join(workdir, f"images_{label}.pdf")
+        fill_once(output_path, data, preprocess_images=preprocess)  # warm-up (fills the cache)
+        times = [fill_once(output_path, data, preprocess_images=preprocess) for _ in range(iterations)]
+        ms = 1000 * sum(times) / len(times)
+        print(f"{label:<14}{ms:>10.2f}{os.path.getsize(output_path):>12}")
+
+
+def benchmark_save_profiles(iterations, workdir):
+    """Compare wall time and output size of each save profile."""
+    print("\n" + "=" * 60)
+    print("SAVE PROFILES: wall time and output size")
+    print("=" * 60)
+
+    data = generate_dummy_data()
+    print(f"\n{'profile':<14}{'ms/form':>10}{'file B':>12}")
+    for profile in SAVE_PROFILES:
+        output_path = os.path.join(workdir, f"profile_{profile}.pdf")
+        fill_once(output_path, data, save_profile=profile)  # warm-up
+        times = [fill_once(output_path, data, save_profile=profile) for _ in range(iterations)]
+        ms = 1000 * sum(times) / len(times)
+        print(f"{profile:<14}{ms:>10.2f}{os.path.getsize(output_path):>12}")
+
+
+def main():
+    """Run all benchmarks."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as workdir:
+        benchmark_glyph_batching(iterations, workdir)
+        benchmark_image_preprocessing(iterations, workdir)
+        benchmark_save_profiles(iterations, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Extraction Cache
+Two-tier cache for LLM extraction results: a bounded in-memory LRU in front
+of a persistent SQLite store with a time-to-live.
+
+Entries are keyed on the normalised input text (whitespace collapsed, case
+folded) together with the model name, prompt version and model options, so
+changing any of those never serves a stale result.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join("cache", "extraction_cache.sqlite3")
+
+
+def normalize_input(raw_input):
+    """Collapse whitespace and fold case, so trivially different inputs share a key."""
+    return re.sub(r"\s+", " ", raw_input).strip().casefold()
+
+
+def make_cache_key(raw_input, model, prompt_version, options=None):
+    """
+    Build the cache key for an extraction.
+
+    Args:
+        raw_input: Raw text input from the user
+        model: Model name
+        prompt_version: Version (or hash) of the prompt used
+        options: Model options dict
+
+    Returns:
+        Hex digest identifying the extraction
+    """
+    payload = json.dumps(
+        {
+            "input": normalize_input(raw_input),
+            "model": model,
+            "prompt_version": prompt_version,
+            "options": options or {},
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """Thread-safe LRU memory tier + SQLite disk tier for extraction results."""
+
+    def __init__(self, max_entries=256, db_path=DEFAULT_CACHE_PATH, ttl_seconds=7 * 24 * 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            db_path: SQLite file for the persistent tier (None to disable it)
+            ttl_seconds: How long a persisted result stays valid
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()  # key -> (expires_at, data)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS extractions ("
+                    " key TEXT PRIMARY KEY,"
+                    " data TEXT NOT NULL,"
+                    " expires_at REAL NOT NULL)"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _remember(self, key, expires_at, data):
+        """Put an entry in the memory tier, evicting the least recently used."""
+        with self._lock:
+            self._memory[key] = (expires_at, data)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up a cached extraction.
+
+        Returns:
+            A copy of the cached data dict, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item and item[0] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return dict(item[1])
+            if item:
+                del self._memory[key]
+
+        if self.db_path:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data, expires_at FROM extractions WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+            if row:
+                data = json.loads(row[0])
+                self._remember(key, row[1], data)
+                with self._lock:
+                    self.disk_hits += 1
+                return dict(data)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """Store an extraction result in both tiers."""
+        expires_at = time.time() + self.ttl_seconds
+        data = dict(data)
+        self._remember(key, expires_at, data)
+
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, data, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(data), expires_at),
+                )
+
+    def purge_expired(self):
+        """Delete expired rows from the persistent tier."""
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM extractions WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self):
+        """Drop every cached result from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM extractions")
+
+    def stats(self):
+        """Return hit/miss counters and the memory tier size."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_extraction_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """Get the process-wide extraction cache, creating it on first use."""
+    global _extraction_cache
+    with _cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache()
+        return _extraction_cache
+
+
+def configure_extraction_cache(**options):
+    """
+    Replace the process-wide extraction cache with one using new options.
+
+    Accepts the same keyword arguments as ExtractionCache (max_entries,
+    db_path, ttl_seconds).
+    """
+    global _extraction_cache
+    with _cache_lock:
+        _extraction_cache = ExtractionCache(**options)
+        return _extraction_cache
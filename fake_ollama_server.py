@@ -0,0 +1,361 @@
+"""
+Fake Ollama Server
+Stand-in for the Ollama HTTP API, for benchmarking the web pipeline end to
+end without a GPU, the model or network access.
+
+Implements the endpoints the ollama client uses here: /api/chat (streaming
+and non-streaming), /api/generate (warm-up), /api/tags and /api/version.
+Chat replies are derived from the input by the rule-based extractor, with
+the remaining fields taken from the dummy test records, and shaped to the
+requested JSON schema. Latency, token rate and failures are configurable.
+
+Usage:
+    python fake_ollama_server.py --port 11434 --tokens-per-second 40
+    OLLAMA_HOST=http://127.0.0.1:11434 python app.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dummy_data import generate_dummy_data, generate_test_data_variations
+from rule_extractor import extract_with_rules
+from field_codes import field_for_key
+
+DEFAULT_MODEL = "llama3.1:8b-instruct-q8_0"
+
+# Rough characters per token, used for token counts and streaming chunks
+CHARS_PER_TOKEN = 4
+
+
+def build_canned_records():
+    """Full dummy records: the base record overlaid with each variation."""
+    base = generate_dummy_data()
+    records = [dict(base)]
+    for variation in generate_test_data_variations().values():
+        record = dict(base)
+        record.update(variation)
+        if "email_id" in variation:
+            record["email_id_1"] = variation["email_id"]
+        records.append(record)
+    return records
+
+
+def extract_raw_input(messages):
+    """Pull the user's raw input back out of the extraction prompt."""
+    content = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    marker = "raw input:\n\n"
+    if marker in content:
+        content = content.split(marker, 1)[1]
+        for end in ("\n\nOnly these fields", "\n\nReturn valid JSON"):
+            content = content.split(end, 1)[0]
+    return content
+
+
+def shape_to_schema(data, schema):
+    """
+    Keep only the schema's keys and make each value fit its constraints.
+
+    Keys may be field codes (compact contract); optional keys are left out
+    when their value is empty, as a model following the schema would.
+    """
+    shaped = {}
+    required = set(schema.get("required", []))
+    for name, spec in schema.get("properties", {}).items():
+        value = str(data.get(field_for_key(name)) or "")
+        if not value and name not in required:
+            continue
+        if "enum" in spec and value not in spec["enum"]:
+            value = spec["enum"][0] if value else ""
+        if "maxLength" in spec:
+            value = value[:spec["maxLength"]]
+        shaped[name] = value
+    return shaped
+
+
+class FakeOllamaServer:
+    """Threaded HTTP server imitating the Ollama API."""
+
+    def __init__(self, host="127.0.0.1", port=11434, model=DEFAULT_MODEL, latency=0.05,
+                 tokens_per_second=50.0, prompt_tokens_per_second=500.0, load_seconds=0.0,
+                 responses="rules", failure_rate=0.0, malformed_rate=0.0, seed=None):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            model: Model name reported by /api/tags
+            latency: Fixed delay before the first token, in seconds
+            tokens_per_second: Output token rate
+            prompt_tokens_per_second: Prompt evaluation rate (the part of the
+                prompt that repeats the previous system prompt is free, like
+                Ollama's prefix cache)
+            load_seconds: Simulated model load time on the first request
+            responses: "rules" (rule-extracted values over a canned record)
+                or "canned" (a canned record only)
+            failure_rate: Fraction of chat requests answered with HTTP 500
+            malformed_rate: Fraction of chat replies cut off mid-JSON
+            seed: Random seed for reproducible failures
+        """
+        self.model = model
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.load_seconds = load_seconds
+        self.responses = responses
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.records = build_canned_records()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._last_system_prompt = None
+        self.requests = 0
+        self.failures = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL to use as OLLAMA_HOST."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def roll(self, rate):
+        """Decide whether an injected event with the given rate happens."""
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def load_model(self):
+        """Seconds of simulated model load for this request (first one only)."""
+        with self._lock:
+            if self._loaded:
+                return 0.0
+            self._loaded = True
+        return self.load_seconds
+
+    def prompt_eval(self, messages):
+        """
+        Count the prompt tokens that need evaluating.
+
+        A system prompt identical to the previous request's is treated as
+        cached, so only the rest of the prompt counts.
+        """
+        system = "".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        rest = "".join(m.get("content", "") for m in messages if m.get("role") != "system")
+        with self._lock:
+            cached = system == self._last_system_prompt
+            self._last_system_prompt = system
+        chars = len(rest) + (0 if cached else len(system))
+        return max(1, chars // CHARS_PER_TOKEN)
+
+    def reply_for(self, messages, response_format, options):
+        """Build the assistant's reply text for a chat request."""
+        if (options or {}).get("num_predict") == 1:
+            return "{"
+
+        raw_input = extract_raw_input(messages)
+        digest = hashlib.sha256(raw_input.encode("utf-8")).digest()
+        data = dict(self.records[digest[0] % len(self.records)])
+        if self.responses == "rules":
+            rule_data, _ = extract_with_rules(raw_input)
+            data.update(rule_data)
+
+        if isinstance(response_format, dict):
+            data = shape_to_schema(data, response_format)
+        reply = json.dumps(data, indent=2)
+
+        if self.roll(self.malformed_rate):
+            reply = reply[:len(reply) // 2]
+        return reply
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Request handler for FakeOllamaServer."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    @property
+    def fake(self):
+        return self.server.fake
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self.send_json({"models": [{
+                "name": self.fake.model,
+                "model": self.fake.model,
+                "modified_at": datetime.now(timezone.utc).isoformat(),
+                "size": 8540775008,
+                "digest": hashlib.sha256(self.fake.model.encode()).hexdigest(),
+                "details": {"format": "gguf", "family": "llama", "parameter_size": "8.0B",
+                            "quantization_level": "Q8_0"},
+            }]})
+        elif self.path == "/api/version":
+            self.send_json({"version": "0.0.0-fake"})
+        else:
+            self.send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        if self.path == "/api/chat":
+            self.handle_chat()
+        elif self.path == "/api/generate":
+            self.handle_generate()
+        else:
+            self.send_json({"error": "not found"}, 404)
+
+    def handle_generate(self):
+        """Warm-up / load requests: an empty prompt just loads the model."""
+        request = self.read_json()
+        time.sleep(self.fake.load_model())
+        self.send_json({
+            "model": request.get("model", self.fake.model),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "response": "",
+            "done": True,
+            "done_reason": "load",
+        })
+
+    def handle_chat(self):
+        request = self.read_json()
+        fake = self.fake
+        with fake._lock:
+            fake.requests += 1
+
+        if fake.roll(fake.failure_rate):
+            with fake._lock:
+                fake.failures += 1
+            self.send_json({"error": "injected failure"}, 500)
+            return
+
+        start = time.perf_counter()
+        load_seconds = fake.load_model()
+        messages = request.get("messages", [])
+        prompt_tokens = fake.prompt_eval(messages)
+        prompt_seconds = prompt_tokens / fake.prompt_tokens_per_second
+        time.sleep(load_seconds + fake.latency + prompt_seconds)
+
+        reply = fake.reply_for(messages, request.get("format"), request.get("options"))
+        chunks = [reply[i:i + CHARS_PER_TOKEN] for i in range(0, len(reply), CHARS_PER_TOKEN)]
+        token_delay = 1.0 / fake.tokens_per_second if fake.tokens_per_second else 0.0
+        model = request.get("model", fake.model)
+
+        def message(content, done):
+            return {
+                "model": model,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "message": {"role": "assistant", "content": content},
+                "done": done,
+            }
+
+        def final(content):
+            payload = message(content, True)
+            total = time.perf_counter() - start
+            payload.update(
+                done_reason="stop",
+                total_duration=int(total * 1e9),
+                load_duration=int(load_seconds * 1e9),
+                prompt_eval_count=prompt_tokens,
+                prompt_eval_duration=int(prompt_seconds * 1e9),
+                eval_count=len(chunks),
+                eval_duration=int(len(chunks) * token_delay * 1e9),
+            )
+            return payload
+
+        if not request.get("stream", True):
+            time.sleep(len(chunks) * token_delay)
+            self.send_json(final(reply))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write_line(payload):
+            line = (json.dumps(payload) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+            self.wfile.flush()
+
+        for chunk in chunks:
+            time.sleep(token_delay)
+            write_line(message(chunk, False))
+        write_line(final(""))
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def main():
+    """Parse command line arguments and run the server until interrupted."""
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Output token rate")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=500.0,
+                        help="Prompt evaluation rate")
+    parser.add_argument("--load-seconds", type=float, default=0.0, help="Simulated model load time")
+    parser.add_argument("--responses", choices=["rules", "canned"], default="rules")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of replies cut off mid-JSON")
+    parser.add_argument("--seed", type=int, help="Random seed for injected failures")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        host=args.host,
+        port=args.port,
+        model=args.model,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        prompt_tokens_per_second=args.prompt_tokens_per_second,
+        load_seconds=args.load_seconds,
+        responses=args.responses,
+        failure_rate=args.failure_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    print(f"🤖 Fake Ollama server listening on {server.url} (model: {args.model})")
+    print("Press Ctrl+C to stop")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
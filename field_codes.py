@@ -0,0 +1,73 @@
+"""
+Field Codes
+Short JSON keys for the compact LLM output contract. In compact mode the
+model answers with these codes instead of the full snake_case field names
+and leaves out missing fields entirely, which saves decode tokens on every
+call. decode_fields() maps an answer back to the names
+clean_extracted_data() expects.
+"""
+
+FIELD_CODES = {
+    'full_name': 'n',
+    'father_name': 'fn',
+    'mother_name': 'mn',
+    'date_of_birth': 'dob',
+    'gender': 'g',
+    'marital_status': 'ms',
+    'residential_address_line1': 'a1',
+    'residential_address_line2': 'a2',
+    'residential_address_line3': 'a3',
+    'residential_landmark': 'lm',
+    'city': 'c',
+    'state': 's',
+    'pincode': 'p',
+    'phone_no': 'ph',
+    'mobile_number': 'm',
+    'email_id_1': 'e1',
+    'email_id_2': 'e2',
+    'office_address_line1': 'o1',
+    'office_address_line2': 'o2',
+    'office_address_line3': 'o3',
+    'office_landmark': 'olm',
+    'office_city': 'oc',
+    'office_state': 'os',
+    'office_pincode': 'op',
+    'office_phone_no': 'oph',
+    'office_fax_no': 'ofx',
+    'branch': 'br',
+    'code_no': 'bc',
+    'date': 'd',
+    'cif_no': 'cif',
+    'income_tax_pan_form': 'pan',
+    'nationality': 'nat',
+    'customer_type': 'ct',
+    'correspondence_address': 'ca',
+}
+
+CODE_TO_FIELD = {code: field for field, code in FIELD_CODES.items()}
+
+
+def field_code(field_name):
+    """Short code for a field (the field name itself if it has none)."""
+    return FIELD_CODES.get(field_name, field_name)
+
+
+def field_for_key(key):
+    """Field name for an output key, whether a code or already a full name."""
+    return CODE_TO_FIELD.get(key, key)
+
+
+def decode_fields(data):
+    """
+    Map a (possibly compact) LLM answer back to full field names.
+
+    Full field names pass through unchanged, so output in either contract
+    can be decoded.
+
+    Args:
+        data: Flat dict parsed from the LLM output
+
+    Returns:
+        Dict keyed on full field names
+    """
+    return {field_for_key(key): value for key, value in data.items()}
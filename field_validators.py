@@ -0,0 +1,136 @@
+"""
+Field Validators
+Field-level checks on extracted form data (PAN format, 6-digit pincodes,
+10-digit mobile numbers, real DD/MM/YYYY dates, required names present).
+
+Used to decide whether a small model's extraction can be trusted, and which
+fields need to be asked again.
+"""
+import re
+from datetime import datetime
+
+from layout_config import get_field_config
+
+PAN_FORMAT_RE = re.compile(r"^[A-Z]{5}[0-9]{4}[A-Z]$")
+NAME_RE = re.compile(r"^[A-Za-z][A-Za-z .'-]*$")
+EMAIL_FORMAT_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+NON_DIGITS_RE = re.compile(r"[^0-9]")
+
+# Fields that must be present for an extraction to be usable
+REQUIRED_NAMES = ("full_name",)
+
+NAME_FIELDS = ("full_name", "father_name", "mother_name")
+PINCODE_FIELDS = ("pincode", "office_pincode")
+DATE_FIELDS = ("date_of_birth", "date")
+EMAIL_FIELDS = ("email_id_1", "email_id_2")
+# Reduced to their digits by clean_extracted_data()
+NUMERIC_FIELDS = ("pincode", "phone_no", "mobile_number", "office_pincode",
+                  "office_phone_no", "office_fax_no", "code_no", "cif_no")
+
+
+def digits(value):
+    """Keep only the digits of a value, as clean_extracted_data() does."""
+    return NON_DIGITS_RE.sub("", value)
+
+
+def check_pan(value):
+    if not PAN_FORMAT_RE.match(value.upper()):
+        return "PAN must be 5 letters, 4 digits and a letter"
+
+
+def check_pincode(value):
+    number = digits(value)
+    if len(number) != 6 or number[0] == "0":
+        return "pincode must be 6 digits"
+
+
+def check_mobile(value):
+    if len(digits(value)) != 10:
+        return "mobile number must be 10 digits"
+
+
+def check_date(value):
+    try:
+        datetime.strptime(value, "%d/%m/%Y")
+    except ValueError:
+        return "date must be a valid DD/MM/YYYY date"
+
+
+def check_name(value):
+    if not NAME_RE.match(value):
+        return "name must contain letters only"
+
+
+def check_email(value):
+    if not EMAIL_FORMAT_RE.match(value):
+        return "not an email address"
+
+
+FIELD_CHECKS = {
+    "income_tax_pan_form": check_pan,
+    "mobile_number": check_mobile,
+    **{field: check_pincode for field in PINCODE_FIELDS},
+    **{field: check_date for field in DATE_FIELDS},
+    **{field: check_name for field in NAME_FIELDS},
+    **{field: check_email for field in EMAIL_FIELDS},
+}
+
+
+def validate_field(field_name, value):
+    """
+    Check one extracted value.
+
+    Empty values pass (whether a field is required is checked separately),
+    as do fields without a specific check as long as they fit their boxes.
+
+    Args:
+        field_name: Form field name
+        value: Extracted value
+
+    Returns:
+        Reason the value is invalid, or None if it's fine
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+
+    check = FIELD_CHECKS.get(field_name)
+    if check:
+        problem = check(value)
+        if problem:
+            return problem
+
+    config = get_field_config(field_name) or {}
+    if field_name in NUMERIC_FIELDS:
+        value = digits(value)
+    if config.get("type") == "boxed" and len(value) > config["max_chars"]:
+        return f"longer than {config['max_chars']} characters"
+    if config.get("type") == "checkbox" and value.lower() not in {o.lower() for o in config["options"]}:
+        return f"not one of {', '.join(config['options'])}"
+    return None
+
+
+def validate_fields(data, fields, required=REQUIRED_NAMES):
+    """
+    Check every requested field of an extraction.
+
+    Args:
+        data: Extracted field values
+        fields: Field names the extraction was asked for
+        required: Fields that must have a value
+
+    Returns:
+        Dict of field name -> reason for every invalid or missing field
+    """
+    problems = {}
+    for field in fields:
+        value = data.get(field)
+        if field in required and not str(value or "").strip():
+            problems[field] = "missing"
+            continue
+        problem = validate_field(field, value)
+        if problem:
+            problems[field] = problem
+    return problems
@@ -0,0 +1,206 @@
+"""
+Image Preprocessing Cache
+Prepares photograph/signature images for embedding: applies the image's
+orientation, downsamples to the target box at a fixed DPI and re-encodes
+compactly (JPEG for photos, greyscale PNG for signatures).
+
+Results are cached by content hash + target size, in memory (LRU) and
+optionally on disk, so repeated requests with the same image skip decoding
+the full-resolution file entirely.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+
+# Default resolution for embedded images (dots per inch of the target box)
+DEFAULT_IMAGE_DPI = 200
+
+# Supported encodings for prepared images
+ENCODING_JPEG = "jpeg"       # Photographs
+ENCODING_GRAY_PNG = "gray_png"  # Signatures and other line art
+
+
+class ImageCache:
+    """Thread-safe LRU cache of preprocessed images."""
+
+    def __init__(self, dpi=DEFAULT_IMAGE_DPI, max_entries=64, disk_dir=None, jpg_quality=85):
+        """
+        Initialize the image cache.
+
+        Args:
+            dpi: Resolution to resample images to, relative to the target box
+            max_entries: Maximum number of prepared images kept in memory
+            disk_dir: Optional directory for a persistent on-disk tier
+            jpg_quality: JPEG quality used for photographs
+        """
+        self.dpi = dpi
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.jpg_quality = jpg_quality
+        self._entries = OrderedDict()
+        self._digests = OrderedDict()  # (path, mtime_ns, size) -> sha256 of file content, LRU
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _file_digest(self, image_path):
+        """
+        Hash an image file, memoised on its path, mtime and size.
+
+        The file is read and hashed outside the lock, so concurrent requests
+        don't wait on each other's uploads; the memo is bounded like the
+        image entries (every upload has its own path).
+        """
+        stat = os.stat(image_path)
+        memo_key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._digests.get(memo_key)
+            if digest is not None:
+                self._digests.move_to_end(memo_key)
+                return digest
+
+        with open(image_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        with self._lock:
+            self._digests[memo_key] = digest
+            self._digests.move_to_end(memo_key)
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+    def _cache_key(self, digest, width, height, encoding):
+        return f"{digest[:32]}_{width:g}x{height:g}_{self.dpi}dpi_{encoding}"
+
+    def _disk_path(self, key, encoding):
+        ext = "jpg" if encoding == ENCODING_JPEG else "png"
+        return os.path.join(self.disk_dir, f"{key}.{ext}")
+
+    def prepare(self, image_path, width, height, encoding=ENCODING_JPEG):
+        """
+        Get the prepared image bytes for a file and target box.
+
+        Args:
+            image_path: Path to the source image
+            width: Target box width in PDF points
+            height: Target box height in PDF points
+            encoding: ENCODING_JPEG or ENCODING_GRAY_PNG
+
+        Returns:
+            Encoded image bytes, ready for page.insert_image(stream=...)
+        """
+        digest = self._file_digest(image_path)
+        key = self._cache_key(digest, width, height, encoding)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = None
+        if self.disk_dir and os.path.exists(self._disk_path(key, encoding)):
+            with open(self._disk_path(key, encoding), "rb") as f:
+                data = f.read()
+
+        if data is None:
+            data = preprocess_image(image_path, width, height, self.dpi, encoding, self.jpg_quality)
+            if self.disk_dir:
+                tmp_path = self._disk_path(key, encoding) + f".{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._disk_path(key, encoding))
+
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def clear(self):
+        """Drop all in-memory entries (the disk tier is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+
+    def stats(self):
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(d) for d in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "dpi": self.dpi,
+            }
+
+
+def preprocess_image(image_path, width, height, dpi=DEFAULT_IMAGE_DPI, encoding=ENCODING_JPEG, jpg_quality=85):
+    """
+    Orient, downsample and re-encode an image for a target box.
+
+    The image is opened as a MuPDF image document, which applies its stored
+    orientation, then rendered so that it fits inside the box (keeping its
+    aspect ratio, as insert_image does) at the given DPI. Images are never
+    upscaled.
+
+    Args:
+        image_path: Path to the source image
+        width: Target box width in PDF points
+        height: Target box height in PDF points
+        dpi: Target resolution
+        encoding: ENCODING_JPEG or ENCODING_GRAY_PNG
+        jpg_quality: JPEG quality for ENCODING_JPEG
+
+    Returns:
+        Encoded image bytes
+    """
+    doc = fitz.open(image_path)
+    try:
+        page = doc[0]
+        images = page.get_image_info()
+
+        target_w = width * dpi / 72
+        target_h = height * dpi / 72
+        zoom = min(target_w / page.rect.width, target_h / page.rect.height)
+
+        # Don't upscale beyond the image's own pixel resolution
+        if images:
+            zoom = min(zoom, images[0]["width"] / page.rect.width)
+
+        matrix = fitz.Matrix(zoom, zoom)
+        if encoding == ENCODING_GRAY_PNG:
+            pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csGRAY, alpha=False)
+            return pix.tobytes("png")
+        pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+        return pix.tobytes("jpg", jpg_quality=jpg_quality)
+    finally:
+        doc.close()
+
+
+_image_cache = ImageCache()
+
+
+def get_image_cache():
+    """Get the process-wide image cache."""
+    return _image_cache
+
+
+def configure_image_cache(**options):
+    """
+    Replace the process-wide image cache with one using new options.
+
+    Accepts the same keyword arguments as ImageCache (dpi, max_entries,
+    disk_dir, jpg_quality).
+    """
+    global _image_cache
+    _image_cache = ImageCache(**options)
+    return _image_cache
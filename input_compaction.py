@@ -0,0 +1,256 @@
+"""
+Input Compaction
+Pre-LLM relevance filter for long conversational input. The input is split
+into sentences, each sentence is scored for form-relevant signals (field
+label synonyms, digits, emails, address words, field values), and when the
+input exceeds a token budget the least relevant sentences are compressed
+or dropped until it fits.
+
+Sentences carrying hard data (digits, emails) are never dropped, only
+stripped of their asides.
+
+relevant_snippet() uses the same sentence split to pick out the part of the
+input that concerns a few given fields, for focused follow-up prompts.
+"""
+import re
+
+from rule_extractor import (
+    LABEL_TO_FIELD, FIELD_SYNONYMS, STATE_NAMES, CITY_STATES, EMAIL_RE, PAN_RE, PINCODE_RE,
+    MOBILE_RE, PHONE_RE, NUMERIC_DATE_RE, TEXT_DATE_RE,
+)
+
+# Rough characters per token for Llama-style tokenizers on English text
+CHARS_PER_TOKEN = 4
+
+# Default maximum input size (in estimated tokens) before compaction starts
+DEFAULT_TOKEN_BUDGET = 384
+
+# Words that mark address text
+ADDRESS_WORDS = {
+    'flat', 'house', 'road', 'rd', 'street', 'st', 'sector', 'nagar', 'colony', 'near', 'opp',
+    'opposite', 'behind', 'apartment', 'apartments', 'tower', 'towers', 'block', 'floor', 'lane',
+    'marg', 'residency', 'building', 'plot', 'phase', 'society', 'enclave', 'village', 'district',
+    'extension', 'layout', 'cross', 'main', 'gate', 'chowk', 'bazar', 'bazaar', 'market',
+}
+
+# Values of the form's choice fields
+VALUE_WORDS = {
+    'male', 'female', 'single', 'married', 'unmarried', 'widowed', 'divorced', 'indian',
+    'staff', 'public', 'regular', 'employee', 'residential', 'born',
+}
+
+# Common abbreviations whose trailing "." doesn't end a sentence
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'no', 'pvt', 'ltd', 'opp', 'st', 'rd', 'sr', 'jr',
+                 'co', 'nr', 'apt', 'dept', 'govt', 'smt', 'shri', 'late'}
+
+# Hedges and filler that carry no form data
+FILLER_RE = re.compile(
+    r"(?i)\b(?:i think|i guess|not sure|or maybe|maybe|basically|actually|honestly|"
+    r"somewhere around|just in case|to be honest|you know|kind of|sort of)\b,?\s*"
+)
+PARENTHETICAL_RE = re.compile(r"\s*\([^()]*\)")
+SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([.,;:!?])")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[\"“'(A-Z0-9])|\n\s*\n|\n(?=\s*[A-Z])")
+WORD_RE = re.compile(r"[a-z][a-z.'&-]*")
+HARD_DATA_RE = re.compile(r"\d{3,}|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}")
+
+# Multi-word labels and places, matched as phrases
+PHRASES = sorted(
+    {label for label in LABEL_TO_FIELD if ' ' in label}
+    | {name.lower() for name in list(STATE_NAMES) + list(CITY_STATES) if len(name) > 3},
+    key=len, reverse=True,
+)
+# Value patterns that point at the sentence holding a field
+FIELD_PATTERNS = {
+    'income_tax_pan_form': (PAN_RE,),
+    'mobile_number': (MOBILE_RE,),
+    'pincode': (PINCODE_RE,),
+    'office_pincode': (PINCODE_RE,),
+    'phone_no': (PHONE_RE,),
+    'office_phone_no': (PHONE_RE,),
+    'office_fax_no': (PHONE_RE,),
+    'date_of_birth': (NUMERIC_DATE_RE, TEXT_DATE_RE),
+    'date': (NUMERIC_DATE_RE, TEXT_DATE_RE),
+    'email_id_1': (EMAIL_RE,),
+    'email_id_2': (EMAIL_RE,),
+}
+
+SINGLE_WORDS = (
+    {label for label in LABEL_TO_FIELD if ' ' not in label}
+    | {name.lower() for name in list(STATE_NAMES) + list(CITY_STATES) if ' ' not in name and len(name) > 3}
+)
+
+
+def estimate_tokens(text):
+    """Estimate the number of tokens in text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_sentences(text):
+    """
+    Split text into sentences (and lines), keeping abbreviations intact.
+
+    Returns:
+        List of non-empty, stripped sentences
+    """
+    pieces = SENTENCE_END_RE.split(text)
+    sentences = []
+    for piece in pieces:
+        piece = " ".join(piece.split())
+        if not piece:
+            continue
+        # Re-join a split after an abbreviation like "Mr." or "Pvt."
+        if sentences:
+            last_word = sentences[-1].rsplit(" ", 1)[-1].rstrip(".").lower()
+            if sentences[-1].endswith(".") and last_word in ABBREVIATIONS:
+                sentences[-1] += " " + piece
+                continue
+        sentences.append(piece)
+    return sentences
+
+
+def has_hard_data(sentence):
+    """True if the sentence holds digits or an email (never dropped)."""
+    return bool(HARD_DATA_RE.search(sentence) or EMAIL_RE.search(sentence))
+
+
+def score_sentence(sentence):
+    """
+    Score how much form data a sentence is likely to carry.
+
+    Returns:
+        Relevance score (0 for pure chatter)
+    """
+    lowered = sentence.lower()
+    score = 3 * len(HARD_DATA_RE.findall(sentence)) + 3 * len(EMAIL_RE.findall(sentence))
+    for phrase in PHRASES:
+        if phrase in lowered:
+            score += 2
+            lowered = lowered.replace(phrase, " ")
+    for word in WORD_RE.findall(lowered):
+        word = word.strip(".'")
+        if word in SINGLE_WORDS:
+            score += 2
+        elif word in ADDRESS_WORDS or word in VALUE_WORDS:
+            score += 1
+    return score
+
+
+def compress_sentence(sentence):
+    """Strip hedges and the parenthetical asides that hold no hard data."""
+    def drop_aside(match):
+        aside = match.group(0)
+        # Keep data and short qualifiers like "(office)"
+        if has_hard_data(aside) or len(aside.split()) <= 3:
+            return aside
+        return ""
+
+    compressed = PARENTHETICAL_RE.sub(drop_aside, sentence)
+    compressed = FILLER_RE.sub("", compressed)
+    return SPACE_BEFORE_PUNCT_RE.sub(r"\1", " ".join(compressed.split()))
+
+
+def compact_input(raw_input, token_budget=DEFAULT_TOKEN_BUDGET):
+    """
+    Shrink long input to the form-relevant sentences.
+
+    Input within the budget is returned unchanged. Otherwise sentences are
+    processed from least to most relevant: first compressed, then (if they
+    hold no hard data and the input is still over budget) dropped.
+
+    Args:
+        raw_input: Raw text input from user
+        token_budget: Estimated token count to get the input under
+
+    Returns:
+        (compacted_text, stats) where stats has tokens_before, tokens_after,
+        sentences, dropped and compressed counts
+    """
+    tokens_before = estimate_tokens(raw_input)
+    stats = {
+        'tokens_before': tokens_before,
+        'tokens_after': tokens_before,
+        'sentences': 0,
+        'dropped': 0,
+        'compressed': 0,
+    }
+    if tokens_before <= token_budget:
+        return raw_input, stats
+
+    sentences = split_sentences(raw_input)
+    kept = list(sentences)
+    stats['sentences'] = len(sentences)
+    total = sum(estimate_tokens(s) + 1 for s in kept)
+
+    # Least relevant first; among equals, the longest first
+    order = sorted(range(len(sentences)), key=lambda i: (score_sentence(sentences[i]), -len(sentences[i])))
+
+    for i in order:
+        if total <= token_budget:
+            break
+        compressed = compress_sentence(kept[i])
+        if compressed != kept[i]:
+            total -= estimate_tokens(kept[i]) - estimate_tokens(compressed)
+            kept[i] = compressed
+            stats['compressed'] += 1
+
+    for i in order:
+        if total <= token_budget:
+            break
+        if kept[i] and not has_hard_data(kept[i]) and score_sentence(kept[i]) < 2:
+            total -= estimate_tokens(kept[i]) + 1
+            kept[i] = ""
+            stats['dropped'] += 1
+
+    compacted = "\n".join(sentence for sentence in kept if sentence)
+    stats['tokens_after'] = estimate_tokens(compacted)
+    return compacted, stats
+
+
+def field_labels(field_name):
+    """Label synonyms that refer to a field (address lines share their address's labels)."""
+    return [label for key, labels in FIELD_SYNONYMS.items()
+            if field_name == key or field_name.startswith(key + "_")
+            for label in labels]
+
+
+def relevant_snippet(raw_input, fields, values=(), max_sentences=6):
+    """
+    Pick the sentences of the input that concern the given fields.
+
+    A sentence is relevant if it mentions one of the fields' labels, holds
+    a value matching a field's pattern (PAN, mobile, pincode, date, ...) or
+    contains one of the given values (e.g. the rejected ones).
+
+    Args:
+        raw_input: Raw text input from user
+        fields: Field names of interest
+        values: Extracted values to look for as well
+        max_sentences: Most sentences to return
+
+    Returns:
+        The relevant sentences in input order, or the whole input if none
+        were found
+    """
+    sentences = split_sentences(raw_input)
+    labels = [label for field in fields for label in field_labels(field)]
+    patterns = [pattern for field in fields for pattern in FIELD_PATTERNS.get(field, ())]
+    values = [str(value).lower() for value in values if value and len(str(value)) > 2]
+    address_fields = any(part in field for field in fields
+                         for part in ('address', 'landmark', 'city', 'state'))
+
+    scored = []
+    for index, sentence in enumerate(sentences):
+        lowered = sentence.lower()
+        score = 3 * sum(1 for value in values if value in lowered)
+        score += 2 * sum(1 for pattern in patterns if pattern.search(sentence))
+        score += sum(1 for label in labels if re.search(r"\b" + re.escape(label) + r"\b", lowered))
+        if address_fields:
+            score += sum(1 for word in WORD_RE.findall(lowered) if word.strip(".'") in ADDRESS_WORDS)
+        if score:
+            scored.append((score, index))
+
+    if not scored:
+        return raw_input
+    best = sorted(sorted(scored, reverse=True)[:max_sentences], key=lambda item: item[1])
+    return "\n".join(sentences[index] for _, index in best)
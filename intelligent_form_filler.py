@@ -4,7 +4,323 @@ Uses Llama 3.1 8B to parse raw/messy input and map it to form fields.
 """
 import json
 import sys
+import hashlib
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from step4_fill_form import PDFFormFiller
+from extraction_cache import get_extraction_cache, make_cache_key
+from rule_extractor import extract_with_rules, covers_required_fields, is_prose, HIGH_CONFIDENCE
+from llm_json import IncrementalJSONParser, repair_json
+from input_compaction import compact_input, estimate_tokens, relevant_snippet, DEFAULT_TOKEN_BUDGET
+from field_codes import field_code, field_for_key, decode_fields
+from single_flight import get_single_flight, LeaderCancelled
+from pincode_index import resolve_locations, normalize_state
+from layout_config import get_field_config
+from ollama_client import get_ollama_client, get_ollama_pool
+from llm_metrics import call_metrics, get_llm_metrics
+from field_validators import validate_field, validate_fields, REQUIRED_NAMES
+
+# Model used for extraction and the options it is called with
+LLM_MODEL = 'llama3.1:8b-instruct-q8_0'  # Llama 3.1 8B Instruct
+# Every request uses exactly these options: a different num_ctx makes Ollama
+# reload the model and lose the cached system prompt prefix
+LLM_OPTIONS = {
+    'temperature': 0.1,  # Lower temperature for more deterministic output
+    'top_p': 0.9,
+    'num_ctx': 4096,
+    'seed': 42,
+}
+# Small model tried first in cascade mode; fields failing validation are
+# asked again of LLM_MODEL
+LLM_CASCADE_MODEL = 'llama3.2:3b-instruct-q8_0'  # Llama 3.2 3B Instruct
+LLM_MAX_ATTEMPTS = 2  # Calls per extraction when the output can't be parsed or repaired
+# Longer inputs are compacted to their form-relevant sentences before
+# prompting (None to always send the input as-is)
+LLM_INPUT_TOKEN_BUDGET = DEFAULT_TOKEN_BUDGET
+DEFAULT_PROMPT_TOKENS_PER_SECOND = 50.0  # Assumed prompt eval rate until real calls have been measured
+
+# Form fields the LLM can extract, grouped as in the form, with the
+# formatting hint given to the model for each
+FIELD_SECTIONS = [
+    ("PERSONAL DETAILS", [
+        ("full_name", "uppercase"),
+        ("father_name", "uppercase"),
+        ("mother_name", "uppercase"),
+        ("date_of_birth", "DD/MM/YYYY format"),
+        ("gender", "Male/Female"),
+        ("marital_status", "Married/Unmarried/Others"),
+    ]),
+    ("RESIDENTIAL ADDRESS", [
+        ("residential_address_line1", "max 25 chars, uppercase"),
+        ("residential_address_line2", "max 25 chars, uppercase"),
+        ("residential_address_line3", "max 25 chars, uppercase"),
+        ("residential_landmark", "max 27 chars, uppercase"),
+        ("city", "max 18 chars, uppercase"),
+        ("state", "max 30 chars, uppercase"),
+        ("pincode", "6 digits"),
+        ("phone_no", "with STD code, max 12 digits"),
+        ("mobile_number", "10 digits"),
+        ("email_id_1", "max 29 chars, lowercase"),
+        ("email_id_2", "optional, max 29 chars, lowercase"),
+    ]),
+    ("OFFICE/BUSINESS ADDRESS", [
+        ("office_address_line1", "max 25 chars, uppercase"),
+        ("office_address_line2", "max 25 chars, uppercase"),
+        ("office_address_line3", "max 25 chars, uppercase"),
+        ("office_landmark", "max 27 chars, uppercase"),
+        ("office_city", "max 18 chars, uppercase"),
+        ("office_state", "max 30 chars, uppercase"),
+        ("office_pincode", "6 digits"),
+        ("office_phone_no", "with STD code, max 16 digits"),
+        ("office_fax_no", "optional, max 16 digits"),
+    ]),
+    ("BANK DETAILS", [
+        ("branch", "bank branch name, max 23 chars, uppercase"),
+        ("code_no", "branch code, max 5 digits"),
+        ("date", "today's date in DD/MM/YYYY format"),
+        ("cif_no", "Customer ID, 11 digits if available"),
+    ]),
+    ("IDENTITY & NATIONALITY", [
+        ("income_tax_pan_form", "PAN number, 10 chars, uppercase"),
+        ("nationality", "max 10 chars, uppercase, default: INDIAN"),
+    ]),
+    ("SELECTIONS", [
+        ("customer_type", "Public/Staff"),
+        ("correspondence_address", "B for Residential / C for Office"),
+    ]),
+    ("IMAGES (optional)", [
+        ("photograph", "path to photo file, or null"),
+        ("signature", "path to signature file, or null"),
+    ]),
+]
+
+# Text fields the LLM fills (images come from uploads, not from the text)
+TEXT_FIELDS = [
+    name for title, fields in FIELD_SECTIONS if not title.startswith("IMAGES")
+    for name, _ in fields
+]
+
+PROMPT_HEADER = """You are an AI assistant that extracts information from raw text to fill an SBI bank account opening form.
+
+**FORM FIELDS TO EXTRACT:**
+
+"""
+
+PROMPT_INSTRUCTIONS = """
+
+**CRITICAL INSTRUCTIONS:**
+- Extract all available information from the provided text
+- For missing fields, use empty string ""
+- Convert all names and addresses to UPPERCASE
+- Convert emails to lowercase
+- Ensure dates are in DD/MM/YYYY format
+- Truncate text to fit character limits
+- Return ONLY valid JSON with the field names exactly as specified
+- Do not nest the JSON - use FLAT structure with all fields at root level
+- Put ALL values in quotes as strings, including numbers
+- Do not include any explanation or markdown, just the raw JSON object
+
+**OUTPUT FORMAT (FLAT STRUCTURE - ALL VALUES AS STRINGS):**
+"""
+
+# Instructions for the compact output contract: short field codes as keys
+# and no entries for missing fields, so fewer tokens have to be generated
+COMPACT_PROMPT_INSTRUCTIONS = """
+
+**CRITICAL INSTRUCTIONS:**
+- Extract all available information from the provided text
+- Use the short code before each field name as its JSON key
+- Leave out fields that are missing - never output empty strings
+- Convert all names and addresses to UPPERCASE
+- Convert emails to lowercase
+- Ensure dates are in DD/MM/YYYY format
+- Truncate text to fit character limits
+- Do not nest the JSON - use FLAT structure with all fields at root level
+- Put ALL values in quotes as strings, including numbers
+- Write the JSON on one line, without indentation, explanation or markdown
+
+**OUTPUT FORMAT (FLAT, SHORT KEYS, ONLY THE FIELDS FOUND):**
+"""
+
+PROMPT_FOOTER = """
+
+Return valid JSON with this exact flat structure."""
+
+# Example output shown with the full field list
+FULL_OUTPUT_EXAMPLE = """{
+  "full_name": "JOHN DOE",
+  "father_name": "JAMES DOE",
+  "pincode": "201301",
+  "mobile_number": "9876543210",
+  "customer_type": "Public",
+  ...
+}"""
+COMPACT_OUTPUT_EXAMPLE = '{"n": "JOHN DOE", "fn": "JAMES DOE", "p": "201301", "m": "9876543210", "ct": "Public"}'
+
+
+def build_system_prompt(fields=None, compact: bool = False) -> str:
+    """
+    Build the extraction system prompt.
+    
+    Args:
+        fields: Field names to ask for (None for every field)
+        compact: Ask for the compact output contract (field codes as keys,
+            missing fields left out)
+        
+    Returns:
+        System prompt listing only the requested fields
+    """
+    wanted = None if fields is None else set(fields)
+    sections = []
+    for title, section_fields in FIELD_SECTIONS:
+        if compact:
+            # Images never come from the LLM, so they get no code
+            lines = [f"   - {field_code(name)}: {name} ({hint})" for name, hint in section_fields
+                     if name in TEXT_FIELDS and (wanted is None or name in wanted)]
+        else:
+            lines = [f"   - {name} ({hint})" for name, hint in section_fields
+                     if wanted is None or name in wanted]
+        if lines:
+            sections.append(f"{len(sections) + 1}. {title}:\n" + "\n".join(lines))
+    
+    if compact:
+        instructions = COMPACT_PROMPT_INSTRUCTIONS
+        if wanted is None:
+            example = COMPACT_OUTPUT_EXAMPLE
+        else:
+            codes = [field_code(name) for name in TEXT_FIELDS if name in wanted][:5]
+            example = "{" + ", ".join(f'"{code}": "..."' for code in codes) + "}"
+    else:
+        instructions = PROMPT_INSTRUCTIONS
+        if wanted is None:
+            example = FULL_OUTPUT_EXAMPLE
+        else:
+            # A short sample; the JSON schema enforces the full key list
+            names = [name for name in TEXT_FIELDS if name in wanted]
+            lines = [f'  "{name}": ""' for name in names[:5]] + (["  ..."] if len(names) > 5 else [])
+            example = "{\n" + ",\n".join(lines) + "\n}"
+    return PROMPT_HEADER + "\n\n".join(sections) + instructions + example + PROMPT_FOOTER
+
+
+def field_schema(field_name: str, compact: bool = False) -> dict:
+    """
+    JSON schema for one field's value, derived from its layout config.
+    
+    Boxed fields are limited to the number of boxes, dates to DD/MM/YYYY and
+    checkboxes to their options. Every field may also be "" (missing),
+    except in the compact contract, where missing fields are left out.
+    """
+    config = get_field_config(field_name) or {}
+    field_type = config.get("type")
+    
+    if compact:
+        if field_type == "boxed":
+            return {"type": "string", "minLength": 1, "maxLength": config["max_chars"]}
+        if field_type == "date":
+            return {"type": "string", "pattern": "^[0-9]{2}/[0-9]{2}/[0-9]{4}$"}
+        if field_type == "checkbox":
+            return {"type": "string", "enum": list(config["options"])}
+        return {"type": "string", "minLength": 1}
+    
+    if field_type == "boxed":
+        return {"type": "string", "maxLength": config["max_chars"]}
+    if field_type == "date":
+        return {"type": "string", "pattern": "^([0-9]{2}/[0-9]{2}/[0-9]{4})?$"}
+    if field_type == "checkbox":
+        return {"type": "string", "enum": list(config["options"]) + [""]}
+    return {"type": "string"}
+
+
+def build_json_schema(fields, compact: bool = False) -> dict:
+    """
+    Build a JSON schema for a flat object of the given form fields.
+    
+    Passed to Ollama as the response format, so the model can only produce
+    exactly these keys, as strings that fit the form.
+    
+    Args:
+        fields: Field names the response must contain
+        compact: Build the compact contract instead: field codes as keys,
+            every key optional and no empty values
+        
+    Returns:
+        JSON schema dict
+    """
+    if compact:
+        return {
+            "type": "object",
+            "properties": {field_code(name): field_schema(name, compact=True) for name in fields},
+            "required": [],
+        }
+    return {
+        "type": "object",
+        "properties": {name: field_schema(name) for name in fields},
+        "required": list(fields),
+    }
+
+
+def prompt_fingerprint(system_prompt: str, response_format: dict) -> str:
+    """Short hash of a prompt and response schema, used in cache keys."""
+    payload = system_prompt + json.dumps(response_format, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+# System prompt and response schema with all form fields
+SYSTEM_PROMPT = build_system_prompt()
+RESPONSE_SCHEMA = build_json_schema(TEXT_FIELDS)
+
+# The same for the compact output contract
+COMPACT_SYSTEM_PROMPT = build_system_prompt(compact=True)
+COMPACT_RESPONSE_SCHEMA = build_json_schema(TEXT_FIELDS, compact=True)
+
+# User message templates (the only part of the prompt that varies)
+USER_PROMPT_TEMPLATE = """Extract form data from this raw input:
+
+{raw_input}
+
+Return valid JSON only."""
+
+USER_PROMPT_FIELDS_TEMPLATE = """Extract form data from this raw input:
+
+{raw_input}
+
+Only these fields are needed: {fields}
+
+Return valid JSON only."""
+
+# Follow-up asking again for only the fields that failed validation
+FIELD_RETRY_PROMPT_TEMPLATE = """These fields were extracted incorrectly:
+
+{problems}
+
+Relevant part of the raw input:
+
+{raw_input}
+
+Return valid JSON with corrected values for these fields only. {missing_hint}"""
+
+# Changes whenever the prompt or schema does, so cached extractions are invalidated
+PROMPT_VERSION = prompt_fingerprint(SYSTEM_PROMPT + USER_PROMPT_TEMPLATE, RESPONSE_SCHEMA)
+COMPACT_PROMPT_VERSION = prompt_fingerprint(COMPACT_SYSTEM_PROMPT + USER_PROMPT_TEMPLATE, COMPACT_RESPONSE_SCHEMA)
+
+
+# Conversational sample used by main() and benchmark_llm.py
+SAMPLE_INPUT = """
+        My name is Priya Singh, my father Rajesh Singh and mother Sunita Singh.
+        I was born on 25th March 1995. I'm a female and married.
+        
+        I live at B-204 Green Valley Apartments, Malviya Nagar, near Metro Station,
+        New Delhi, Delhi 110017. My phone is 011-26543210 and mobile 9876543210.
+        Email: priya.singh@gmail.com
+        
+        I work at Tech Solutions Pvt Ltd, A-15 Cyber City, Sector 18,
+        Gurgaon, Haryana 122015. Office phone: 0124-4567890.
+        
+        I want to open account at Connaught Place branch, code 12345.
+        My PAN is ABCDE1234F. I am Indian citizen.
+        I'm a regular customer and want correspondence at my home address.
+        """
 
 
 def flatten_nested_dict(d: dict, parent_key: str = '') -> dict:
@@ -28,156 +344,585 @@ def flatten_nested_dict(d: dict, parent_key: str = '') -> dict:
     return dict(items)
 
 
-def call_ollama_llm(raw_input: str) -> dict:
+def compact_llm_input(raw_input: str, token_budget: int) -> str:
     """
-    Call Ollama LLM to parse raw input and extract structured form data.
+    Compact long input for the prompt and log what it saved.
+    
+    The saving in prompt evaluation time is estimated from the median rate
+    measured on recent calls.
     
     Args:
         raw_input: Raw/messy text input from user
+        token_budget: Estimated token budget for the input
         
     Returns:
-        Dictionary with structured form field data
+        The text to put in the prompt
     """
-    try:
-        import ollama
-    except ImportError:
-        raise ImportError("ollama package not installed. Install with: pip install ollama")
-    
-    # Define the system prompt with all form fields
-    system_prompt = """You are an AI assistant that extracts information from raw text to fill an SBI bank account opening form.
+    start = time.perf_counter()
+    compacted, stats = compact_input(raw_input, token_budget)
+    removed = stats['tokens_before'] - stats['tokens_after']
+    if removed > 0:
+        rate = get_llm_metrics().snapshot()['prompt_tokens_per_second'].get('p50') or DEFAULT_PROMPT_TOKENS_PER_SECOND
+        print(f"✓ Compacted input from ~{stats['tokens_before']} to ~{stats['tokens_after']} tokens "
+              f"({stats['dropped']} sentence(s) dropped, {stats['compressed']} compressed) "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms - "
+              f"~{removed} tokens / {removed / rate * 1000:.0f} ms of prompt eval saved")
+    return compacted
 
-**FORM FIELDS TO EXTRACT:**
 
-1. PERSONAL DETAILS:
-   - full_name (uppercase)
-   - father_name (uppercase)
-   - mother_name (uppercase)
-   - date_of_birth (DD/MM/YYYY format)
-   - gender (Male/Female)
-   - marital_status (Married/Unmarried/Others)
-
-2. RESIDENTIAL ADDRESS:
-   - residential_address_line1 (max 25 chars, uppercase)
-   - residential_address_line2 (max 25 chars, uppercase)
-   - residential_address_line3 (max 25 chars, uppercase)
-   - residential_landmark (max 27 chars, uppercase)
-   - city (max 18 chars, uppercase)
-   - state (max 30 chars, uppercase)
-   - pincode (6 digits)
-   - phone_no (with STD code, max 12 digits)
-   - mobile_number (10 digits)
-   - email_id_1 (max 29 chars, lowercase)
-   - email_id_2 (optional, max 29 chars, lowercase)
-
-3. OFFICE/BUSINESS ADDRESS:
-   - office_address_line1 (max 25 chars, uppercase)
-   - office_address_line2 (max 25 chars, uppercase)
-   - office_address_line3 (max 25 chars, uppercase)
-   - office_landmark (max 27 chars, uppercase)
-   - office_city (max 18 chars, uppercase)
-   - office_state (max 30 chars, uppercase)
-   - office_pincode (6 digits)
-   - office_phone_no (with STD code, max 16 digits)
-   - office_fax_no (optional, max 16 digits)
-
-4. BANK DETAILS:
-   - branch (bank branch name, max 23 chars, uppercase)
-   - code_no (branch code, max 5 digits)
-   - date (today's date in DD/MM/YYYY format)
-   - cif_no (Customer ID, 11 digits if available)
-
-5. IDENTITY & NATIONALITY:
-   - income_tax_pan_form (PAN number, 10 chars, uppercase)
-   - nationality (max 10 chars, uppercase, default: INDIAN)
-
-6. SELECTIONS:
-   - customer_type (Public/Staff)
-   - correspondence_address (B for Residential / C for Office)
-
-7. IMAGES (optional):
-   - photograph (path to photo file, or null)
-   - signature (path to signature file, or null)
+def untrusted_rule_values(rule_data: dict, confidence: dict) -> dict:
+    """
+    Find confident rule values that still don't look like the field's value.
+    
+    A value spanning lines, reading like a sentence or failing its field
+    check (field_validators) is left for the LLM rather than treated as
+    already resolved.
+    
+    Returns:
+        Dict of field name -> reason for every rejected value
+    """
+    confident = {field: value for field, value in rule_data.items()
+                 if confidence[field] >= HIGH_CONFIDENCE}
+    problems = validate_fields(confident, list(confident), required=())
+    for field, value in confident.items():
+        if "\n" in str(value):
+            problems[field] = "spans several lines"
+        elif is_prose(str(value)):
+            problems[field] = "reads like free text"
+    if problems:
+        print("⚠️  Leaving rule values to the LLM: "
+              + ", ".join(f"{field} ({reason})" for field, reason in problems.items()))
+    return problems
+
 
-**CRITICAL INSTRUCTIONS:**
-- Extract all available information from the provided text
-- For missing fields, use empty string ""
-- Convert all names and addresses to UPPERCASE
-- Convert emails to lowercase
-- Ensure dates are in DD/MM/YYYY format
-- Truncate text to fit character limits
-- Return ONLY valid JSON with the field names exactly as specified
-- Do not nest the JSON - use FLAT structure with all fields at root level
-- Put ALL values in quotes as strings, including numbers
-- Do not include any explanation or markdown, just the raw JSON object
+def plan_extraction(raw_input: str, use_rules: bool = True, hybrid: bool = True,
+                    parallel_sections: bool = False, cascade: bool = False,
+                    token_budget: int = LLM_INPUT_TOKEN_BUDGET, compact_output: bool = False,
+                    reextract_invalid: bool = False) -> dict:
+    """
+    Decide how an input will be extracted, before any LLM call.
+    
+    Args:
+        raw_input: Raw/messy text input from user
+        use_rules: Try the rule-based extractor before the LLM
+        hybrid: Only ask the LLM for fields the rules couldn't resolve
+        parallel_sections: Whether the sections will be extracted separately
+            (results are cached under a different key)
+        cascade: Whether the model cascade will be used (likewise)
+        token_budget: Compact longer input before prompting (None to disable)
+        compact_output: Ask for the compact output contract (field codes,
+            missing fields left out)
+        reextract_invalid: Whether invalid fields will be asked again
+            (results are cached under a different key)
+        
+    Returns:
+        Dict with 'complete' (rules covered every required field),
+        'local_data' (fields resolved locally), 'llm_input' (the text to
+        prompt with), 'compact_output', 'messages', 'response_format',
+        'missing_fields' and 'cache_key'
+    """
+    plan = {
+        'complete': False,
+        'local_data': {},
+        'llm_input': raw_input,
+        'compact_output': compact_output,
+        'messages': None,
+        'response_format': COMPACT_RESPONSE_SCHEMA if compact_output else RESPONSE_SCHEMA,
+        'missing_fields': list(TEXT_FIELDS),
+        'cache_key': None,
+    }
+    
+    if use_rules:
+        rule_data, confidence = extract_with_rules(raw_input)
+        for field in untrusted_rule_values(rule_data, confidence):
+            del rule_data[field], confidence[field]
+        
+        # Fast path: deterministic parse of structured input
+        if covers_required_fields(confidence):
+            rule_data.setdefault('nationality', 'INDIAN')
+            plan.update(complete=True, local_data=rule_data, missing_fields=[])
+            return plan
+        
+        if hybrid:
+            plan['local_data'] = {
+                field: value for field, value in rule_data.items()
+                if field in TEXT_FIELDS and confidence[field] >= HIGH_CONFIDENCE
+            }
+            # City and state follow from a resolved pincode; no need to ask the LLM
+            if plan['local_data']:
+                resolve_locations(plan['local_data'], overwrite_state=False)
+    
+    # The rules above always see the full input; only the prompt is compacted
+    if token_budget:
+        plan['llm_input'] = compact_llm_input(raw_input, token_budget)
+    
+    if plan['local_data']:
+        missing_fields = [field for field in TEXT_FIELDS if field not in plan['local_data']]
+        plan['missing_fields'] = missing_fields
+        plan['messages'] = build_messages(plan['llm_input'], missing_fields, compact_output)
+        plan['response_format'] = build_json_schema(missing_fields, compact_output)
+        system_prompt = COMPACT_SYSTEM_PROMPT if compact_output else SYSTEM_PROMPT
+        prompt_version = prompt_fingerprint(system_prompt + USER_PROMPT_FIELDS_TEMPLATE, plan['response_format'])
+    else:
+        plan['messages'] = build_messages(plan['llm_input'], compact=compact_output)
+        prompt_version = COMPACT_PROMPT_VERSION if compact_output else PROMPT_VERSION
+    
+    if parallel_sections:
+        prompt_version += "-sections"
+    if cascade:
+        prompt_version += "-cascade"
+    if token_budget:
+        prompt_version += f"-budget{token_budget}"
+    if reextract_invalid:
+        prompt_version += "-reextract"
+    plan['cache_key'] = make_cache_key(raw_input, LLM_MODEL, prompt_version, LLM_OPTIONS)
+    return plan
 
-**OUTPUT FORMAT (FLAT STRUCTURE - ALL VALUES AS STRINGS):**
-{
-  "full_name": "JOHN DOE",
-  "father_name": "JAMES DOE",
-  "pincode": "201301",
-  "mobile_number": "9876543210",
-  "customer_type": "Public",
-  ...
-}
 
-Return valid JSON with this exact flat structure."""
+def build_messages(raw_input: str, fields=None, compact: bool = False) -> list:
+    """
+    Build the chat messages for an extraction request.
+    
+    The system message is always the same SYSTEM_PROMPT (or
+    COMPACT_SYSTEM_PROMPT), byte for byte, so Ollama can reuse its evaluated
+    prefix between requests. Everything that varies (the input, and the
+    field subset in hybrid mode) goes in the user message after it.
+    
+    Args:
+        raw_input: Raw/messy text input from user
+        fields: Field names to ask for (None for every field)
+        compact: Use the compact output contract (fields listed by code)
+        
+    Returns:
+        List of chat messages
+    """
+    if fields is None:
+        user_prompt = USER_PROMPT_TEMPLATE.format(raw_input=raw_input)
+    else:
+        names = [field_code(field) for field in fields] if compact else fields
+        user_prompt = USER_PROMPT_FIELDS_TEMPLATE.format(raw_input=raw_input, fields=", ".join(names))
+    
+    return [
+        {
+            'role': 'system',
+            'content': COMPACT_SYSTEM_PROMPT if compact else SYSTEM_PROMPT
+        },
+        {
+            'role': 'user',
+            'content': user_prompt
+        }
+    ]
 
-    user_prompt = f"""Extract form data from this raw input:
 
-{raw_input}
+def warm_up_llm(keep_warm_interval: float = None, compact_output: bool = False) -> float:
+    """
+    Load the extraction model and evaluate the system prompt ahead of time.
+    
+    Args:
+        keep_warm_interval: If set, keep the model warm from a background
+            thread, pinging every this many seconds while idle
+        compact_output: Warm up the compact contract's system prompt instead
+        
+    Returns:
+        Seconds the initial warm-up took
+    """
+    client = get_ollama_client()
+    messages = build_messages("", compact=compact_output)
+    elapsed = client.warm_up(LLM_MODEL, messages, LLM_OPTIONS)
+    print(f"✓ Warmed up {LLM_MODEL} in {elapsed:.2f} s")
+    if keep_warm_interval:
+        client.start_keep_warm(LLM_MODEL, keep_warm_interval, messages, LLM_OPTIONS)
+    return elapsed
 
-Return valid JSON only."""
 
-    print("\n" + "="*60)
-    print("CALLING OLLAMA LLM (Llama 3.1 8B Instruct)")
-    print("="*60)
-    print("Analyzing input and extracting form fields...")
+def parse_llm_output(llm_output: str) -> dict:
+    """
+    Parse the JSON object from the LLM's response text.
+    
+    Output in the compact contract is decoded back to full field names.
+    
+    Args:
+        llm_output: Raw response content
+        
+    Returns:
+        Flat dictionary of extracted fields
+        
+    Raises:
+        json.JSONDecodeError: If the output isn't a valid JSON object and
+            no field could be salvaged from it
+    """
+    raw_output = llm_output
+    
+    # Try to extract JSON if wrapped in markdown code blocks
+    if '```json' in llm_output:
+        json_start = llm_output.find('```json') + 7
+        json_end = llm_output.find('```', json_start)
+        llm_output = llm_output[json_start:json_end].strip()
+    elif '```' in llm_output:
+        json_start = llm_output.find('```') + 3
+        json_end = llm_output.find('```', json_start)
+        llm_output = llm_output[json_start:json_end].strip()
     
+    # Parse JSON, falling back to a local repair pass before giving up
     try:
+        extracted_data = json.loads(llm_output)
+    except json.JSONDecodeError:
+        extracted_data = repair_json(raw_output)
+        if not extracted_data:
+            raise
+        print(f"⚠️  Repaired malformed JSON from LLM ({len(extracted_data)} fields salvaged)")
+        return decode_fields(extracted_data)
+    
+    # Valid JSON that isn't an object (a list, string, null...) has no fields
+    if not isinstance(extracted_data, dict):
+        raise json.JSONDecodeError(
+            f"Expected a JSON object, got {type(extracted_data).__name__}", llm_output, 0)
+    
+    # Flatten if nested structure
+    if any(isinstance(v, dict) for v in extracted_data.values()):
+        print("⚠️  Detected nested structure, flattening...")
+        extracted_data = flatten_nested_dict(extracted_data)
+    return decode_fields(extracted_data)
+
+
+def request_extraction(client, messages: list, response_format: dict, model: str = LLM_MODEL) -> dict:
+    """
+    Run one extraction chat request and parse its output.
+    
+    Output that can't even be repaired is retried (LLM_MAX_ATTEMPTS calls
+    in total).
+    
+    Args:
+        client: OllamaClient to send the request to
+        messages: Chat messages (see build_messages)
+        response_format: JSON schema for the response
+        model: Model to run the extraction with
+        
+    Returns:
+        Flat dictionary of extracted fields
+        
+    Raises:
+        ValueError: If the output could not be parsed on any attempt
+    """
+    llm_output = ""
+    for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
         # Call Ollama API
-        response = ollama.chat(
-            model='llama3.1:8b-instruct-q8_0',  # Llama 3.1 8B Instruct
-            messages=[
-                {
-                    'role': 'system',
-                    'content': system_prompt
-                },
-                {
-                    'role': 'user',
-                    'content': user_prompt
-                }
-            ],
-            options={
-                'temperature': 0.1,  # Lower temperature for more deterministic output
-                'top_p': 0.9,
-            }
+        response = client.chat(
+            model=model,
+            messages=messages,
+            format=response_format,
+            options=LLM_OPTIONS
         )
         
         # Extract the response content
         llm_output = response['message']['content']
         print("\n✓ LLM Response received")
+        metrics = call_metrics(response)
+        if metrics:
+            print(f"  Prompt eval: {metrics['prompt_eval_count']} tokens in {metrics['prompt_eval_ms']:.0f} ms, "
+                  f"generated {metrics['eval_count']} tokens at {metrics['tokens_per_second'] or 0:.1f} tok/s, "
+                  f"load {metrics['load_ms']:.0f} ms")
         print("\n--- Raw LLM Output ---")
         print(llm_output)
         print("--- End Raw Output ---\n")
         
-        # Parse JSON from response
-        # Try to extract JSON if wrapped in markdown code blocks
-        if '```json' in llm_output:
-            json_start = llm_output.find('```json') + 7
-            json_end = llm_output.find('```', json_start)
-            llm_output = llm_output[json_start:json_end].strip()
-        elif '```' in llm_output:
-            json_start = llm_output.find('```') + 3
-            json_end = llm_output.find('```', json_start)
-            llm_output = llm_output[json_start:json_end].strip()
-        
-        # Parse JSON
-        extracted_data = json.loads(llm_output)
+        try:
+            return parse_llm_output(llm_output)
+        except json.JSONDecodeError as e:
+            if attempt == LLM_MAX_ATTEMPTS:
+                print(f"\n❌ Error: Failed to parse JSON from LLM output: {e}")
+                print("LLM output was:", llm_output)
+                raise ValueError(f"Failed to parse JSON from LLM: {e}")
+            print(f"⚠️  Could not parse or repair LLM output ({e}), retrying...")
+
+
+def section_field_groups(fields) -> list:
+    """
+    Split fields into the form sections of the system prompt.
+    
+    Args:
+        fields: Field names to extract
+        
+    Returns:
+        List of (section title, [field names]) for the non-empty sections
+    """
+    wanted = set(fields)
+    groups = []
+    for title, section_fields in FIELD_SECTIONS:
+        names = [name for name, _ in section_fields if name in wanted]
+        if names:
+            groups.append((title, names))
+    return groups
+
+
+def iter_sections_parallel(raw_input: str, fields, model: str = LLM_MODEL, compact: bool = False):
+    """
+    Extract each form section with its own request, all at once.
+    
+    Every section gets a small prompt (the shared system prompt plus its own
+    field list and schema). Requests are spread round-robin over the Ollama
+    client pool, so with enough parallel slots (OLLAMA_NUM_PARALLEL) or
+    instances the wall-clock time is that of the slowest section.
+    
+    Args:
+        raw_input: Raw/messy text input from user
+        fields: Field names to extract
+        model: Model to run the extractions with
+        compact: Use the compact output contract
+        
+    Yields:
+        (section title, section data) as each section finishes, with only
+        the section's own fields
+    """
+    groups = section_field_groups(fields)
+    clients = get_ollama_pool()
+    print(f"Extracting {len(groups)} section(s) in parallel on {len(clients)} Ollama instance(s)...")
+    
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        # Each request runs in a copy of this context, so per-request metrics
+        # collection (llm_metrics.llm_call_metrics) sees the section calls
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                request_extraction,
+                clients[i % len(clients)],
+                build_messages(raw_input, names, compact),
+                build_json_schema(names, compact),
+                model
+            ): (title, names)
+            for i, (title, names) in enumerate(groups)
+        }
+        
+        for future in as_completed(futures):
+            title, names = futures[future]
+            section_data = future.result()
+            print(f"  ✓ {title}: {len(section_data)} field(s)")
+            yield title, {k: v for k, v in section_data.items() if k in names}
+
+
+def extract_sections_parallel(raw_input: str, fields, model: str = LLM_MODEL, compact: bool = False) -> dict:
+    """
+    Extract each form section with its own concurrent request (see
+    iter_sections_parallel) and merge the results.
+    
+    Returns:
+        Merged flat dictionary of extracted fields
+    """
+    merged = {}
+    for _, section_data in iter_sections_parallel(raw_input, fields, model, compact):
+        merged.update(section_data)
+    return merged
+
+
+def extract_with_cascade(raw_input: str, plan: dict, parallel_sections: bool = False) -> dict:
+    """
+    Extract with the small model first, escalating to LLM_MODEL on failure.
+    
+    The small model's output is checked field by field (field_validators);
+    only the fields that fail are asked again of the larger model, with a
+    reduced prompt and schema. If the small model fails outright, every
+    field is escalated with the plan's own prompt. The escalation and the
+    time spent on each tier are recorded in the LLM metrics.
+    
+    Args:
+        raw_input: Raw/messy text input from user
+        plan: Extraction plan from plan_extraction()
+        parallel_sections: Run the small model's pass section by section
+        
+    Returns:
+        Flat dictionary of extracted fields
+    """
+    fields = plan['missing_fields']
+    compact = plan['compact_output']
+    required = [field for field in REQUIRED_NAMES if field in fields]
+    tier_ms = {}
+    
+    start = time.perf_counter()
+    try:
+        if parallel_sections:
+            data = extract_sections_parallel(raw_input, fields, LLM_CASCADE_MODEL, compact)
+        else:
+            data = request_extraction(get_ollama_client(), plan['messages'], plan['response_format'],
+                                      LLM_CASCADE_MODEL)
+        # Checked as cleaned, the way reextract_invalid_fields() and the form see it
+        problems = validate_fields(clean_extracted_data(data), fields, required)
+    except Exception as e:
+        print(f"⚠️  {LLM_CASCADE_MODEL} extraction failed ({e}), escalating to {LLM_MODEL}")
+        data = {}
+        problems = {field: 'small model failed' for field in fields}
+    tier_ms[LLM_CASCADE_MODEL] = (time.perf_counter() - start) * 1000
+    
+    if problems:
+        print(f"⚠️  {len(problems)} field(s) failed validation, escalating to {LLM_MODEL}: "
+              + ", ".join(f"{field} ({reason})" for field, reason in problems.items()))
+        start = time.perf_counter()
+        try:
+            if len(problems) == len(fields):
+                escalated = request_extraction(get_ollama_client(), plan['messages'], plan['response_format'])
+            else:
+                escalated_fields = list(problems)
+                escalated = request_extraction(get_ollama_client(),
+                                               build_messages(raw_input, escalated_fields, compact),
+                                               build_json_schema(escalated_fields, compact))
+        finally:
+            tier_ms[LLM_MODEL] = (time.perf_counter() - start) * 1000
+            get_llm_metrics().record_cascade(True, tier_ms)
+        data.update({field: value for field, value in escalated.items() if field in problems})
+    else:
+        print(f"✓ {LLM_CASCADE_MODEL} output passed validation - no escalation needed")
+        get_llm_metrics().record_cascade(False, tier_ms)
+    
+    return data
+
+
+def reextract_invalid_fields(plan: dict, extracted_data: dict) -> dict:
+    """
+    Ask the model again for just the fields that fail validation.
+    
+    The LLM's fields are cleaned and checked (field_validators). Each invalid
+    one is listed with its rejected value and the reason, together with the
+    sentences of the input that concern it, in a small follow-up request
+    instead of a whole new extraction.
+    
+    Args:
+        plan: Extraction plan from plan_extraction()
+        extracted_data: Parsed LLM output
+        
+    Returns:
+        Patches for extracted_data: corrected values, or "" where the model
+        found no value (empty if nothing was invalid)
+    """
+    fields = plan['missing_fields']
+    cleaned = clean_extracted_data(extracted_data)
+    required = [field for field in REQUIRED_NAMES if field in fields]
+    problems = validate_fields(cleaned, fields, required)
+    if not problems:
+        return {}
+    
+    compact = plan['compact_output']
+    names = list(problems)
+    problem_lines = "\n".join(
+        f'- {field_code(field) if compact else field}: "{cleaned.get(field) or ""}" ({reason})'
+        for field, reason in problems.items()
+    )
+    snippet = relevant_snippet(plan['llm_input'], names, [extracted_data.get(field) for field in names])
+    user_prompt = FIELD_RETRY_PROMPT_TEMPLATE.format(
+        problems=problem_lines,
+        raw_input=snippet,
+        missing_hint=("Leave out a field whose value is not in the input." if compact
+                      else 'Use "" for a field whose value is not in the input.')
+    )
+    messages = [
+        {'role': 'system', 'content': COMPACT_SYSTEM_PROMPT if compact else SYSTEM_PROMPT},
+        {'role': 'user', 'content': user_prompt}
+    ]
+    
+    print(f"⚠️  {len(problems)} field(s) failed validation: "
+          + ", ".join(f"{field} ({reason})" for field, reason in problems.items()))
+    print(f"   Re-extracting them with a focused prompt (~{estimate_tokens(user_prompt)} input tokens, "
+          f"vs ~{estimate_tokens(plan['messages'][-1]['content'])} for a full re-run)")
+    try:
+        retry_data = request_extraction(get_ollama_client(), messages, build_json_schema(names, compact))
+    except Exception as e:
+        print(f"⚠️  Re-extraction failed ({e}), keeping the original values")
+        return {}
+    
+    patches = {}
+    for field in names:
+        value = retry_data.get(field)
+        if value is None and not compact:
+            continue  # Not answered
+        if not value:
+            patches[field] = ""  # Not in the input after all
+        elif validate_field(field, clean_extracted_data({field: value}).get(field)) is None:
+            patches[field] = value
+        else:
+            print(f"⚠️  {field} is still invalid after re-extraction, keeping it")
+    print(f"✓ Re-extraction patched {len(patches)} of {len(problems)} field(s)")
+    return patches
+
+
+def call_ollama_llm(raw_input: str, use_cache: bool = True, use_rules: bool = True,
+                    hybrid: bool = True, parallel_sections: bool = False, cascade: bool = False,
+                    token_budget: int = LLM_INPUT_TOKEN_BUDGET, compact_output: bool = False,
+                    reextract_invalid: bool = True) -> dict:
+    """
+    Call Ollama LLM to parse raw input and extract structured form data.
+    
+    Structured "Key: value" input is parsed by the rule-based extractor
+    first; the LLM is only called when the rules don't cover every required
+    field with high confidence. In hybrid mode the fields the rules did
+    resolve are kept, and the LLM is asked (with a reduced prompt and JSON
+    schema) for the remaining fields only.
+    
+    Args:
+        raw_input: Raw/messy text input from user
+        use_cache: Look up / store the result in the extraction cache
+        use_rules: Try the rule-based extractor before the LLM
+        hybrid: Only ask the LLM for fields the rules couldn't resolve
+        parallel_sections: Extract each form section with its own
+            concurrent request (see extract_sections_parallel)
+        cascade: Try LLM_CASCADE_MODEL first and only ask LLM_MODEL for
+            the fields that fail validation (see extract_with_cascade)
+        token_budget: Compact longer input to its form-relevant sentences
+            before prompting (None to disable; see input_compaction)
+        compact_output: Have the model answer with short field codes and
+            leave out missing fields, to generate fewer tokens (see field_codes)
+        reextract_invalid: Ask again, with a focused follow-up prompt, for
+            fields that fail validation (see reextract_invalid_fields)
         
-        # Flatten if nested structure
-        if any(isinstance(v, dict) for v in extracted_data.values()):
-            print("⚠️  Detected nested structure, flattening...")
-            extracted_data = flatten_nested_dict(extracted_data)
+    Returns:
+        Dictionary with structured form field data
+    """
+    plan = plan_extraction(raw_input, use_rules, hybrid, parallel_sections, cascade, token_budget,
+                           compact_output, reextract_invalid)
+    local_data = plan['local_data']
+    
+    if plan['complete']:
+        print(f"\n✓ Rule-based extractor covered all required fields ({len(local_data)} fields) - skipping LLM call")
+        return clean_extracted_data(local_data)
+    
+    if local_data:
+        print(f"\n✓ Resolved {len(local_data)} field(s) locally, asking the LLM for {len(plan['missing_fields'])}")
+    
+    # Serve repeated inputs from the extraction cache
+    if use_cache:
+        cached_data = get_extraction_cache().get(plan['cache_key'])
+        if cached_data is not None:
+            print("\n✓ Extraction cache hit - skipping LLM call")
+            return clean_extracted_data(cached_data)
+    
+    def extract():
+        print("\n" + "="*60)
+        print("CALLING OLLAMA LLM (Llama 3.1 8B Instruct)")
+        print("="*60)
+        print("Analyzing input and extracting form fields...")
+        
+        if cascade:
+            extracted_data = extract_with_cascade(plan['llm_input'], plan, parallel_sections)
+        elif parallel_sections:
+            extracted_data = extract_sections_parallel(plan['llm_input'], plan['missing_fields'],
+                                                       compact=compact_output)
+        else:
+            extracted_data = request_extraction(get_ollama_client(), plan['messages'], plan['response_format'])
+        
+        if reextract_invalid:
+            extracted_data.update(reextract_invalid_fields(plan, extracted_data))
+        
+        # Locally resolved fields win over the model's output
+        extracted_data.update(local_data)
+        
+        # Cache the parsed output (cleaning runs on every hit, e.g. for today's date)
+        if use_cache:
+            get_extraction_cache().put(plan['cache_key'], extracted_data)
+        return extracted_data
+    
+    try:
+        # An identical extraction already running (double click, retry) is
+        # waited for and shared rather than started again
+        extracted_data, shared = get_single_flight().do(plan['cache_key'], extract)
+        if shared:
+            print("\n✓ Shared the result of an identical in-flight extraction")
         
         # Clean up and validate data
         cleaned_data = clean_extracted_data(extracted_data)
@@ -185,10 +930,8 @@ Return valid JSON only."""
         print("✓ Successfully parsed and validated form data")
         return cleaned_data
         
-    except json.JSONDecodeError as e:
-        print(f"\n❌ Error: Failed to parse JSON from LLM output: {e}")
-        print("LLM output was:", llm_output)
-        raise ValueError(f"Failed to parse JSON from LLM: {e}")
+    except ValueError:
+        raise
     except Exception as e:
         print(f"\n❌ Error calling Ollama: {e}")
         print("Make sure Ollama is running: ollama serve")
@@ -196,6 +939,154 @@ Return valid JSON only."""
         raise
 
 
+def stream_ollama_llm(raw_input: str, use_cache: bool = True, use_rules: bool = True,
+                      hybrid: bool = True, parallel_sections: bool = False, cascade: bool = False,
+                      token_budget: int = LLM_INPUT_TOKEN_BUDGET,
+                      compact_output: bool = False, reextract_invalid: bool = True):
+    """
+    Streaming variant of call_ollama_llm().
+    
+    Uses a streaming chat request and an incremental JSON parser, so each
+    field is reported as soon as the model has finished generating it.
+    With parallel_sections, fields are reported a section at a time, as
+    each section's request finishes; with cascade, all at once when both
+    tiers are done.
+    
+    Args:
+        raw_input: Raw/messy text input from user
+        use_cache: Look up / store the result in the extraction cache
+        use_rules: Try the rule-based extractor before the LLM
+        hybrid: Only ask the LLM for fields the rules couldn't resolve
+        parallel_sections: Extract each form section with its own
+            concurrent request (see iter_sections_parallel)
+        cascade: Try LLM_CASCADE_MODEL first (see extract_with_cascade)
+        token_budget: Compact longer input before prompting (None to disable)
+        compact_output: Use the compact output contract (see call_ollama_llm)
+        reextract_invalid: Ask again for fields that fail validation
+        
+    Yields:
+        {'event': 'field', 'field': name, 'value': value,
+         'source': 'rules' | 'cache' | 'coalesced' | 'llm' | 'reextract'}
+        for each field, then {'event': 'done', 'data': cleaned data dict}
+    """
+    plan = plan_extraction(raw_input, use_rules, hybrid, parallel_sections, cascade, token_budget,
+                           compact_output, reextract_invalid)
+    local_data = plan['local_data']
+    
+    for field, value in local_data.items():
+        yield {'event': 'field', 'field': field, 'value': value, 'source': 'rules'}
+    
+    if plan['complete']:
+        yield {'event': 'done', 'data': clean_extracted_data(local_data)}
+        return
+    
+    if use_cache:
+        cached_data = get_extraction_cache().get(plan['cache_key'])
+        if cached_data is not None:
+            for field, value in cached_data.items():
+                if field not in local_data:
+                    yield {'event': 'field', 'field': field, 'value': value, 'source': 'cache'}
+            yield {'event': 'done', 'data': clean_extracted_data(cached_data)}
+            return
+    
+    # Wait for an identical extraction that is already running instead of
+    # starting another one
+    flight = get_single_flight()
+    while True:
+        call, is_leader = flight.begin(plan['cache_key'])
+        if is_leader:
+            break
+        print("\n✓ Waiting for an identical in-flight extraction")
+        try:
+            shared_data = call.wait()
+        except LeaderCancelled:
+            print("⚠️  The identical extraction was cancelled, running it here")
+            continue
+        for field, value in shared_data.items():
+            if field not in local_data:
+                yield {'event': 'field', 'field': field, 'value': value, 'source': 'coalesced'}
+        yield {'event': 'done', 'data': clean_extracted_data(shared_data)}
+        return
+    
+    try:
+        if cascade:
+            # Which tier's value is final is only known at the end
+            extracted_data = extract_with_cascade(plan['llm_input'], plan, parallel_sections)
+            for field, value in extracted_data.items():
+                yield {'event': 'field', 'field': field, 'value': value, 'source': 'llm'}
+        elif parallel_sections:
+            extracted_data = {}
+            for _, section_data in iter_sections_parallel(plan['llm_input'], plan['missing_fields'],
+                                                          compact=compact_output):
+                for field, value in section_data.items():
+                    yield {'event': 'field', 'field': field, 'value': value, 'source': 'llm'}
+                extracted_data.update(section_data)
+        else:
+            extracted_data = yield from stream_extraction(plan, local_data)
+        
+        if reextract_invalid:
+            patches = reextract_invalid_fields(plan, extracted_data)
+            for field, value in patches.items():
+                yield {'event': 'field', 'field': field, 'value': value, 'source': 'reextract'}
+            extracted_data.update(patches)
+        
+        extracted_data.update(local_data)
+        if use_cache:
+            get_extraction_cache().put(plan['cache_key'], extracted_data)
+    except BaseException as e:
+        # Also reached when the client disconnects mid-stream (GeneratorExit)
+        flight.finish(plan['cache_key'], call, error=e)
+        raise
+    flight.finish(plan['cache_key'], call, result=extracted_data)
+    yield {'event': 'done', 'data': clean_extracted_data(extracted_data)}
+
+
+def stream_extraction(plan: dict, local_data: dict):
+    """
+    Run the plan's prompt as one streaming chat request.
+    
+    Output that can't even be repaired is retried like request_extraction
+    (LLM_MAX_ATTEMPTS calls in total); fields of a retried attempt may be
+    yielded again, and the later value wins.
+    
+    Yields:
+        A 'field' event for each field as soon as it is complete
+        
+    Returns:
+        The parsed output (via StopIteration, for yield from)
+        
+    Raises:
+        ValueError: If the output could not be parsed on any attempt
+    """
+    llm_output = ""
+    for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
+        parser = IncrementalJSONParser()
+        chunks = []
+        for chunk in get_ollama_client().chat(
+            model=LLM_MODEL,
+            messages=plan['messages'],
+            format=plan['response_format'],
+            options=LLM_OPTIONS,
+            stream=True
+        ):
+            text = chunk['message']['content']
+            chunks.append(text)
+            for key, value in parser.feed(text):
+                field = field_for_key(key)
+                if field not in local_data:
+                    yield {'event': 'field', 'field': field, 'value': value, 'source': 'llm'}
+        
+        llm_output = "".join(chunks)
+        try:
+            return parse_llm_output(llm_output)
+        except json.JSONDecodeError as e:
+            if attempt == LLM_MAX_ATTEMPTS:
+                print(f"\n❌ Error: Failed to parse JSON from LLM output: {e}")
+                print("LLM output was:", llm_output)
+                raise ValueError(f"Failed to parse JSON from LLM: {e}")
+            print(f"⚠️  Could not parse or repair LLM output ({e}), retrying...")
+
+
 def clean_extracted_data(data: dict) -> dict:
     """
     Clean and validate extracted data.
@@ -298,6 +1189,11 @@ def clean_extracted_data(data: dict) -> dict:
     else:
         cleaned['correspondence_address'] = 'B'
     
+    # City/state from the offline pincode index: fill the gaps, fix a wrong state
+    for field, (old, new) in resolve_locations(cleaned).items():
+        if old and normalize_state(old) != new:
+            print(f"⚠️  {field}: '{old}' doesn't match its pincode, using '{new}'")
+    
     # Image paths (optional)
     if 'photograph' in data and data['photograph']:
         cleaned['photograph'] = str(data['photograph'])
@@ -385,21 +1281,7 @@ def main():
     else:
         # Use sample input for testing
         print("\n📝 Using sample input (you can provide a file as argument)")
-        raw_input = """
-        My name is Priya Singh, my father Rajesh Singh and mother Sunita Singh.
-        I was born on 25th March 1995. I'm a female and married.
-        
-        I live at B-204 Green Valley Apartments, Malviya Nagar, near Metro Station,
-        New Delhi, Delhi 110017. My phone is 011-26543210 and mobile 9876543210.
-        Email: priya.singh@gmail.com
-        
-        I work at Tech Solutions Pvt Ltd, A-15 Cyber City, Sector 18,
-        Gurgaon, Haryana 122015. Office phone: 0124-4567890.
-        
-        I want to open account at Connaught Place branch, code 12345.
-        My PAN is ABCDE1234F. I am Indian citizen.
-        I'm a regular customer and want correspondence at my home address.
-        """
+        raw_input = SAMPLE_INPUT
     
     print("\n--- Raw Input ---")
     print(raw_input)
@@ -361,6 +361,8 @@ DATE_FIELDS = {
 
 # Image fields
 # Each has: page, x (left), y (top), width, height (all in PDF points)
+# and the encoding used when the image is downsampled for embedding
+# ("jpeg" for photographs, "gray_png" for signatures)
 IMAGE_FIELDS = {
     "photograph": {
         "page": 0,
@@ -369,6 +371,7 @@ IMAGE_FIELDS = {
         "width": 71,     # Width in points (2.5 cm ≈ 71 points)
         "height": 290,   # Height in points (3.5 cm ≈ 99 points)
         "type": "image",
+        "encoding": "jpeg",
         "description": "Photograph (2.5 cm X 3.5 cm)"
     },
     "signature": {
@@ -378,6 +381,7 @@ IMAGE_FIELDS = {
         "width": 180,    # Width in points - CALIBRATE THIS
         "height": 40,   # Height in points - CALIBRATE THIS
         "type": "image",
+        "encoding": "gray_png",
         "description": "Signature of the Customer"
     },
 }
@@ -460,6 +464,92 @@ def get_all_checkbox_fields():
     return CHECKBOX_FIELDS
 
 
+# Order in which field kinds are drawn on a page
+RENDER_ORDER = (
+    ("text", FORM_LAYOUT),
+    ("boxed", BOXED_FIELDS),
+    ("date", DATE_FIELDS),
+    ("image", IMAGE_FIELDS),
+    ("checkbox", CHECKBOX_FIELDS),
+)
+
+
+def box_positions(section, count):
+    """
+    Get the (x, y) baseline position of each box in a row of boxes.
+    
+    Args:
+        section: Dict with x_start, y and dx
+        count: Number of boxes
+    """
+    x_start, y, dx = section["x_start"], section["y"], section["dx"]
+    return [(x_start + i * dx, y) for i in range(count)]
+
+
+def date_positions(config):
+    """Get the box positions for the DD, MM and YYYY parts of a date field."""
+    return {
+        "dd": box_positions(config["dd"], 2),
+        "mm": box_positions(config["mm"], 2),
+        "yyyy": box_positions(config["yyyy"], 4),
+    }
+
+
+def option_positions(config):
+    """Get the checkmark position of each option of a checkbox field."""
+    return {option: (coords["x"], coords["y"]) for option, coords in config["options"].items()}
+
+
+def compile_render_plan():
+    """
+    Compile the layout dictionaries into a render plan.
+    
+    Each field becomes one plan entry holding its kind, page, draw order and
+    precomputed positions (glyph boxes for boxed/date fields, option
+    coordinates for checkboxes), so filling a form only has to look up the
+    data keys that are actually present.
+    
+    Returns:
+        Dict with "by_field" (field name -> entry) and "by_page"
+        (page number -> entries in draw order)
+    """
+    by_field = {}
+    by_page = {}
+    order = 0
+    
+    for kind, fields in RENDER_ORDER:
+        for field_name, config in fields.items():
+            entry = {
+                "name": field_name,
+                "kind": kind,
+                "page": config["page"],
+                "order": order,
+                "config": config,
+                "positions": None,
+            }
+            if kind == "boxed":
+                entry["positions"] = box_positions(config, config.get("max_chars", 10))
+            elif kind == "date":
+                entry["positions"] = date_positions(config)
+            elif kind == "checkbox":
+                entry["positions"] = option_positions(config)
+            
+            by_field[field_name] = entry
+            by_page.setdefault(entry["page"], []).append(entry)
+            order += 1
+    
+    return {"by_field": by_field, "by_page": by_page}
+
+
+# Compiled once at import
+RENDER_PLAN = compile_render_plan()
+
+
+def get_render_plan():
+    """Get the compiled render plan for all fields."""
+    return RENDER_PLAN
+
+
 # Calibration notes and manual adjustments can be tracked here
 CALIBRATION_NOTES = """
 CALIBRATION HISTORY:
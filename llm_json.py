@@ -0,0 +1,196 @@
+"""
+LLM JSON Helpers
+Incremental parser for JSON objects streamed token by token from the LLM.
+Each field is reported as soon as its value is complete, without waiting for
+the closing brace.
+
+The same parser backs repair_json(), which salvages the fields from output
+that json.loads rejects (trailing commas, single quotes, Python literals,
+a truncated object).
+"""
+import json
+
+# Bare literals the model sometimes writes in Python rather than JSON form
+LITERALS = {"true": True, "false": False, "null": None,
+            "True": True, "False": False, "None": None}
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for a (mostly flat) JSON object.
+
+    Text before the first "{" (e.g. a markdown fence) is ignored. Keys of
+    nested objects are reported under their own name, the same way
+    flatten_nested_dict() flattens them; array values are skipped. Strings
+    may use single quotes and stray commas are ignored.
+    """
+
+    def __init__(self):
+        self.state = "start"
+        self.depth = 0
+        self.key = ""
+        self.token = ""
+        self.escape = False
+        self.quote = '"'
+        self.skip_depth = 0      # Bracket depth while skipping an array
+        self.skip_in_string = False
+        self.fields = {}
+
+    @property
+    def done(self):
+        """True once the top-level object has been closed."""
+        return self.state == "done"
+
+    def feed(self, text):
+        """
+        Parse the next chunk of streamed text.
+
+        Args:
+            text: Chunk of LLM output
+
+        Returns:
+            List of (key, value) pairs completed by this chunk
+        """
+        completed = []
+        for char in text:
+            handler = getattr(self, f"_on_{self.state}")
+            pair = handler(char)
+            if pair:
+                self.fields[pair[0]] = pair[1]
+                completed.append(pair)
+        return completed
+
+    def _on_start(self, char):
+        if char == "{":
+            self.depth = 1
+            self.state = "key_or_end"
+
+    def _on_done(self, char):
+        pass
+
+    def _on_key_or_end(self, char):
+        if char in "\"'":
+            self.token = ""
+            self.quote = char
+            self.state = "key"
+        elif char == "}":
+            self._close_object()
+
+    def _on_key(self, char):
+        if self.escape:
+            self.token += char
+            self.escape = False
+        elif char == "\\":
+            self.token += char
+            self.escape = True
+        elif char == self.quote:
+            self.key = _decode_string(self.token, self.quote)
+            self.state = "colon"
+        else:
+            self.token += char
+
+    def _on_colon(self, char):
+        if char == ":":
+            self.state = "value"
+
+    def _on_value(self, char):
+        if char.isspace():
+            return None
+        if char in "\"'":
+            self.token = ""
+            self.quote = char
+            self.state = "string_value"
+        elif char == "{":
+            self.depth += 1
+            self.state = "key_or_end"
+        elif char == "[":
+            self.skip_depth = 1
+            self.skip_in_string = False
+            self.state = "array"
+        else:
+            self.token = char
+            self.state = "literal"
+        return None
+
+    def _on_string_value(self, char):
+        if self.escape:
+            self.token += char
+            self.escape = False
+        elif char == "\\":
+            self.token += char
+            self.escape = True
+        elif char == self.quote:
+            self.state = "key_or_end"
+            return self.key, _decode_string(self.token, self.quote)
+        else:
+            self.token += char
+        return None
+
+    def _on_literal(self, char):
+        if char in ",}" or char.isspace():
+            literal = self.token
+            self.state = "key_or_end"
+            if char == "}":
+                self._close_object()
+            if literal in LITERALS:
+                return self.key, LITERALS[literal]
+            try:
+                return self.key, json.loads(literal)
+            except ValueError:
+                return self.key, literal
+        self.token += char
+        return None
+
+    def _on_array(self, char):
+        if self.skip_in_string:
+            if self.escape:
+                self.escape = False
+            elif char == "\\":
+                self.escape = True
+            elif char == '"':
+                self.skip_in_string = False
+        elif char == '"':
+            self.skip_in_string = True
+        elif char == "[":
+            self.skip_depth += 1
+        elif char == "]":
+            self.skip_depth -= 1
+            if self.skip_depth == 0:
+                self.state = "key_or_end"
+
+    def _close_object(self):
+        self.depth -= 1
+        self.state = "done" if self.depth == 0 else "key_or_end"
+
+
+def _decode_string(raw, quote='"'):
+    """Decode the escapes in a JSON string body, keeping it as-is if invalid."""
+    if quote == "'":
+        # Re-quote a single-quoted string as a JSON one
+        raw = raw.replace("\\'", "'").replace('"', '\\"')
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def repair_json(text):
+    """
+    Salvage the fields from malformed JSON output.
+
+    Handles trailing commas, single-quoted strings, Python literals
+    (True/False/None) and objects cut off mid-generation; a value that was
+    cut off is dropped.
+
+    Args:
+        text: Raw LLM output
+
+    Returns:
+        Flat dict of every complete field (empty if nothing was salvageable)
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    # A literal at the very end of truncated output has no terminator yet
+    if parser.state == "literal":
+        parser.feed(",")
+    return dict(parser.fields)
@@ -0,0 +1,231 @@
+"""
+LLM Metrics
+Timing and token metrics from every Ollama response (load time, prompt
+evaluation, generation speed), aggregated into rolling histograms for
+hardware sizing and for spotting model reloads.
+"""
+import contextlib
+import contextvars
+import threading
+from bisect import bisect_left
+from collections import deque
+
+# Histogram bucket upper bounds
+MS_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+# A load_duration above this means the model was (re)loaded for the call
+RELOAD_THRESHOLD_MS = 1000
+
+# Calls made inside llm_call_metrics() are also collected here
+_current_calls = contextvars.ContextVar("llm_current_calls", default=None)
+
+
+class RollingHistogram:
+    """Histogram and percentiles over the most recent observations."""
+
+    def __init__(self, buckets, window=500):
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds (values above the last one
+                go in an overflow bucket)
+            window: Number of recent observations kept
+        """
+        self.buckets = tuple(buckets)
+        self.values = deque(maxlen=window)
+
+    def add(self, value):
+        self.values.append(value)
+
+    def snapshot(self):
+        """Return count, mean, p50/p95/max and per-bucket counts."""
+        values = sorted(self.values)
+        if not values:
+            return {"count": 0}
+
+        counts = [0] * (len(self.buckets) + 1)
+        for value in values:
+            counts[bisect_left(self.buckets, value)] += 1
+        labels = [f"<={b:g}" for b in self.buckets] + [f">{self.buckets[-1]:g}"]
+
+        return {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 2),
+            "p50": round(values[len(values) // 2], 2),
+            "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 2),
+            "max": round(values[-1], 2),
+            "buckets": dict(zip(labels, counts)),
+        }
+
+
+def call_metrics(response):
+    """
+    Pull the timing and token fields out of one Ollama response.
+
+    Args:
+        response: Chat response (or the final chunk of a streamed one)
+
+    Returns:
+        Dict of metrics in milliseconds and tokens/s, or None if the
+        response carries no timing information
+    """
+    if response.get("total_duration") is None and response.get("eval_count") is None:
+        return None
+
+    def ms(key):
+        return (response.get(key) or 0) / 1e6
+
+    eval_count = response.get("eval_count") or 0
+    prompt_eval_count = response.get("prompt_eval_count") or 0
+    return {
+        "model": response.get("model"),
+        "total_ms": round(ms("total_duration"), 1),
+        "load_ms": round(ms("load_duration"), 1),
+        "prompt_eval_count": prompt_eval_count,
+        "prompt_eval_ms": round(ms("prompt_eval_duration"), 1),
+        "eval_count": eval_count,
+        "eval_ms": round(ms("eval_duration"), 1),
+        "prompt_tokens_per_second": round(prompt_eval_count / (ms("prompt_eval_duration") / 1000), 1)
+        if response.get("prompt_eval_duration") else None,
+        "tokens_per_second": round(eval_count / (ms("eval_duration") / 1000), 1)
+        if response.get("eval_duration") else None,
+    }
+
+
+class LLMMetrics:
+    """Thread-safe rolling aggregates of per-call LLM metrics."""
+
+    def __init__(self, window=500):
+        """
+        Initialize the aggregates.
+
+        Args:
+            window: Number of recent calls each histogram covers
+        """
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.reloads = 0
+        self.last_call = None
+        self.histograms = {
+            "tokens_per_second": RollingHistogram(TOKENS_PER_SECOND_BUCKETS, window),
+            "prompt_tokens_per_second": RollingHistogram(TOKENS_PER_SECOND_BUCKETS, window),
+            "prompt_eval_count": RollingHistogram(TOKEN_BUCKETS, window),
+            "load_ms": RollingHistogram(MS_BUCKETS, window),
+            "prompt_eval_ms": RollingHistogram(MS_BUCKETS, window),
+            "eval_ms": RollingHistogram(MS_BUCKETS, window),
+            "total_ms": RollingHistogram(MS_BUCKETS, window),
+        }
+        self.window = window
+        self.cascades = 0
+        self.escalations = 0
+        self.tier_ms = {}  # model -> RollingHistogram of its extraction wall time
+
+    def record(self, response):
+        """
+        Record the metrics of one Ollama response.
+
+        Returns:
+            The call's metrics dict (None if the response had none)
+        """
+        metrics = call_metrics(response)
+        if metrics is None:
+            return None
+
+        with self._lock:
+            self.calls += 1
+            self.last_call = metrics
+            if metrics["load_ms"] > RELOAD_THRESHOLD_MS:
+                self.reloads += 1
+            for name, histogram in self.histograms.items():
+                if metrics[name] is not None:
+                    histogram.add(metrics[name])
+
+        calls = _current_calls.get()
+        if calls is not None:
+            calls.append(metrics)
+        return metrics
+
+    def record_cascade(self, escalated, tier_ms):
+        """
+        Record one model-cascade extraction.
+
+        Args:
+            escalated: Whether fields had to be asked of the larger model
+            tier_ms: Dict of model -> milliseconds spent extracting with it
+        """
+        with self._lock:
+            self.cascades += 1
+            if escalated:
+                self.escalations += 1
+            for model, elapsed in tier_ms.items():
+                if model not in self.tier_ms:
+                    self.tier_ms[model] = RollingHistogram(MS_BUCKETS, self.window)
+                self.tier_ms[model].add(elapsed)
+
+    def prompt_eval_summary(self):
+        """
+        Summarize how much of each recent prompt Ollama had to evaluate.
+
+        A steady, low token count means the cached prompt prefix is reused.
+
+        Returns:
+            Dict with the number of calls, average/max tokens, average ms
+            and the last call's tokens and ms
+        """
+        with self._lock:
+            counts = list(self.histograms["prompt_eval_count"].values)
+            durations = list(self.histograms["prompt_eval_ms"].values)
+            last = self.last_call
+        return {
+            "calls": len(counts),
+            "avg_tokens": sum(counts) / len(counts) if counts else 0,
+            "max_tokens": max(counts, default=0),
+            "avg_ms": sum(durations) / len(durations) if durations else 0,
+            "last_tokens": last["prompt_eval_count"] if last else None,
+            "last_ms": last["prompt_eval_ms"] if last else None,
+        }
+
+    def snapshot(self):
+        """Return call counts, every histogram and the cascade statistics."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "reloads": self.reloads,
+                **{name: h.snapshot() for name, h in self.histograms.items()},
+                "cascade": {
+                    "extractions": self.cascades,
+                    "escalations": self.escalations,
+                    "escalation_rate": round(self.escalations / self.cascades, 3) if self.cascades else None,
+                    "tier_ms": {model: h.snapshot() for model, h in self.tier_ms.items()},
+                },
+            }
+
+
+@contextlib.contextmanager
+def llm_call_metrics():
+    """
+    Collect the metrics of the LLM calls made inside the block.
+
+    Threads started with contextvars.copy_context() (as the parallel
+    section extraction does) report into the same list.
+
+    Yields:
+        List that fills with one metrics dict per call
+    """
+    calls = []
+    token = _current_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _current_calls.reset(token)
+
+
+_llm_metrics = LLMMetrics()
+
+
+def get_llm_metrics():
+    """Get the process-wide LLM metrics."""
+    return _llm_metrics
@@ -0,0 +1,235 @@
+"""
+Ollama Client
+Long-lived, configurable Ollama client shared by the whole process: one
+pooled HTTP connection set, an explicit keep_alive on every request, a
+warm-up call and an optional background keep-warm ping, so the model is
+already loaded when a user request arrives.
+
+Every chat response is recorded in the process-wide LLM metrics
+(llm_metrics), including prompt_eval_count / prompt_eval_duration, which
+show whether Ollama is reusing the cached prompt prefix.
+"""
+import os
+import threading
+import time
+
+from llm_metrics import get_llm_metrics
+
+# Defaults, overridable through the environment
+DEFAULT_HOST = os.environ.get("OLLAMA_HOST")  # None lets the ollama package decide
+DEFAULT_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "120"))  # Seconds per request
+DEFAULT_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")  # How long the model stays loaded
+DEFAULT_MAX_CONNECTIONS = 10
+
+
+def import_ollama():
+    """Import the ollama package with a helpful error if it's missing."""
+    try:
+        import ollama
+    except ImportError:
+        raise ImportError("ollama package not installed. Install with: pip install ollama")
+    return ollama
+
+
+class OllamaClient:
+    """Thread-safe wrapper around ollama.Client with keep-alive and warm-up."""
+
+    def __init__(self, host=DEFAULT_HOST, timeout=DEFAULT_TIMEOUT, keep_alive=DEFAULT_KEEP_ALIVE,
+                 max_connections=DEFAULT_MAX_CONNECTIONS):
+        """
+        Initialize the client.
+
+        Args:
+            host: Ollama server URL (None for the ollama package default)
+            timeout: Request timeout in seconds
+            keep_alive: How long the server keeps the model loaded after a
+                request (e.g. "30m", or -1 for forever)
+            max_connections: Size of the pooled HTTP connection set
+        """
+        import httpx
+
+        ollama = import_ollama()
+        self.host = host
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self._client = ollama.Client(
+            host=host,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        self._lock = threading.Lock()
+        self._keep_warm_thread = None
+        self._keep_warm_stop = threading.Event()
+        self.requests = 0
+        self.last_activity_at = None  # Last request or warm-up
+        self.warm_ups = 0
+        self.last_warm_up_seconds = None
+
+    def _record_request(self):
+        with self._lock:
+            self.requests += 1
+            self.last_activity_at = time.time()
+
+    def _record_metrics(self, response):
+        """Record the call's timing and token metrics (prompt evaluation included)."""
+        get_llm_metrics().record(response)
+
+    def _record_stream(self, chunks):
+        """Pass a streamed response through, recording its final chunk."""
+        for chunk in chunks:
+            if chunk.get("done"):
+                self._record_metrics(chunk)
+            yield chunk
+
+    def chat(self, **kwargs):
+        """ollama.chat() on the shared connection, with this client's keep_alive."""
+        kwargs.setdefault("keep_alive", self.keep_alive)
+        self._record_request()
+        response = self._client.chat(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(response)
+        self._record_metrics(response)
+        return response
+
+    def list(self):
+        """List the models available on the server."""
+        return self._client.list()
+
+    def warm_up(self, model, messages=None, options=None):
+        """
+        Load the model (and optionally a prompt prefix) into the server.
+
+        Without messages the model is loaded with an empty generate call.
+        With messages, a one-token chat is run, so the prompt prefix is
+        evaluated and cached as well.
+
+        Returns:
+            Seconds the warm-up took
+        """
+        start = time.perf_counter()
+        if messages:
+            self._client.chat(
+                model=model,
+                messages=messages,
+                options={**(options or {}), "num_predict": 1},
+                keep_alive=self.keep_alive,
+            )
+        else:
+            self._client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.warm_ups += 1
+            self.last_warm_up_seconds = elapsed
+            self.last_activity_at = time.time()
+        return elapsed
+
+    def start_keep_warm(self, model, interval, messages=None, options=None):
+        """
+        Keep the model loaded from a background thread.
+
+        The ping is skipped while recent requests keep the model loaded anyway.
+
+        Args:
+            model: Model to keep loaded
+            interval: Seconds between pings (keep it below keep_alive)
+            messages: Optional prompt prefix to keep evaluated (see warm_up)
+            options: Model options used with messages
+        """
+        if self._keep_warm_thread and self._keep_warm_thread.is_alive():
+            return
+        self._keep_warm_stop.clear()
+
+        def run():
+            while not self._keep_warm_stop.is_set():
+                idle = time.time() - (self.last_activity_at or 0)
+                if idle >= interval:
+                    try:
+                        elapsed = self.warm_up(model, messages, options)
+                        print(f"✓ Ollama keep-warm: {model} ready ({elapsed:.2f} s)")
+                    except Exception as e:
+                        print(f"⚠️  Ollama keep-warm failed: {e}")
+                self._keep_warm_stop.wait(interval)
+
+        self._keep_warm_thread = threading.Thread(target=run, name="ollama-keep-warm", daemon=True)
+        self._keep_warm_thread.start()
+
+    def stop_keep_warm(self):
+        """Stop the background keep-warm thread."""
+        self._keep_warm_stop.set()
+
+    def stats(self):
+        """Return client settings and counters."""
+        with self._lock:
+            return {
+                "host": self.host or "default",
+                "keep_alive": self.keep_alive,
+                "requests": self.requests,
+                "warm_ups": self.warm_ups,
+                "last_warm_up_seconds": self.last_warm_up_seconds,
+                "keep_warm": bool(self._keep_warm_thread and self._keep_warm_thread.is_alive()),
+                # Read from the shared LLM metrics (process-wide, not per client)
+                "prompt_eval": get_llm_metrics().prompt_eval_summary(),
+            }
+
+
+_ollama_client = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client():
+    """Get the process-wide Ollama client, creating it on first use."""
+    global _ollama_client
+    with _client_lock:
+        if _ollama_client is None:
+            _ollama_client = OllamaClient()
+        return _ollama_client
+
+
+def configure_ollama_client(**options):
+    """
+    Replace the process-wide Ollama client with one using new options.
+
+    Accepts the same keyword arguments as OllamaClient (host, timeout,
+    keep_alive, max_connections).
+    """
+    global _ollama_client
+    with _client_lock:
+        if _ollama_client is not None:
+            _ollama_client.stop_keep_warm()
+        _ollama_client = OllamaClient(**options)
+        return _ollama_client
+
+
+_extra_clients = []
+
+
+def get_ollama_pool():
+    """
+    Get every Ollama client requests can be spread over.
+
+    The process-wide client comes first, followed by any extra instances
+    set up with configure_ollama_pool().
+    """
+    with _client_lock:
+        extra = list(_extra_clients)
+    return [get_ollama_client()] + extra
+
+
+def configure_ollama_pool(hosts, **options):
+    """
+    Add extra Ollama instances for requests that run in parallel.
+
+    Args:
+        hosts: Server URLs of the additional instances
+        **options: Other OllamaClient keyword arguments (timeout, keep_alive, ...)
+
+    Returns:
+        The full pool (see get_ollama_pool)
+    """
+    global _extra_clients
+    clients = [OllamaClient(host=host, **options) for host in hosts]
+    with _client_lock:
+        _extra_clients = clients
+    return get_ollama_pool()
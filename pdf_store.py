@@ -0,0 +1,59 @@
+"""
+In-Memory PDF Store
+Keeps recently generated PDFs in memory for a short window so they can be
+downloaded without ever being written to (and read back from) disk.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class PDFStore:
+    """Bounded, thread-safe store of generated PDFs with a time-to-live."""
+
+    def __init__(self, ttl_seconds=600, max_items=64, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the store.
+
+        Args:
+            ttl_seconds: How long a PDF stays downloadable
+            max_items: Maximum number of PDFs kept at once
+            max_bytes: Maximum total size of the kept PDFs
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # filename -> (expires_at, pdf_bytes)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        """Drop expired items, then the oldest ones while over the limits."""
+        for filename in [f for f, (expires_at, _) in self._items.items() if expires_at <= now]:
+            self._total_bytes -= len(self._items.pop(filename)[1])
+        while self._items and (len(self._items) > self.max_items or self._total_bytes > self.max_bytes):
+            _, (_, pdf_bytes) = self._items.popitem(last=False)
+            self._total_bytes -= len(pdf_bytes)
+
+    def put(self, filename, pdf_bytes):
+        """Store a PDF under a filename."""
+        now = time.monotonic()
+        with self._lock:
+            if filename in self._items:
+                self._total_bytes -= len(self._items.pop(filename)[1])
+            self._items[filename] = (now + self.ttl_seconds, pdf_bytes)
+            self._total_bytes += len(pdf_bytes)
+            self._evict(now)
+
+    def get(self, filename):
+        """Get a stored PDF, or None if it is unknown or has expired."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            item = self._items.get(filename)
+            return item[1] if item else None
+
+    def stats(self):
+        """Return the current number and total size of stored PDFs."""
+        with self._lock:
+            return {"items": len(self._items), "bytes": self._total_bytes}
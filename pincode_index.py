@@ -0,0 +1,391 @@
+"""
+Pincode Index
+Offline pincode -> city/state lookup. A compact binary index is built once
+from a CSV of pincode ranges and memory-mapped at run time, so lookups cost
+a binary search over sorted range arrays (O(log n)) with an O(1) fallback to
+a 3-digit prefix -> state table.
+
+Used to fill in (or check) the city and state next to a pincode without
+asking the LLM for them.
+
+Index file layout (little-endian):
+    b"PINIDX1\\0", uint32 header length, JSON header (city and state names,
+    range count), padding to 4 bytes, uint8[1000] state per prefix
+    (0 = unknown), padding, then the range arrays uint32 starts[n],
+    uint32 ends[n], uint16 city[n] (0 = none), uint8 state[n].
+
+Usage:
+    python pincode_index.py [--source CSV] [--output BIN] [pincode ...]
+
+The source CSV is either the bundled range table (start,end,city,state) or
+the India Post pincode directory (pincode,districtname,statename columns),
+which gives district-level coverage for every pincode.
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter
+
+from rule_extractor import STATE_NAMES
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE_PATH = os.path.join(MODULE_DIR, "pincode_ranges.csv")
+DEFAULT_INDEX_PATH = os.path.join(MODULE_DIR, "pincode_index.bin")
+
+MAGIC = b"PINIDX1\0"
+PREFIXES = 1000
+
+# (pincode field, city field, state field) on the form
+LOCATION_FIELDS = (
+    ("pincode", "city", "state"),
+    ("office_pincode", "office_city", "office_state"),
+)
+
+# Column names accepted for the India Post directory format
+DIRECTORY_PINCODE_COLUMNS = ("pincode", "pin")
+DIRECTORY_CITY_COLUMNS = ("districtname", "district", "city")
+DIRECTORY_STATE_COLUMNS = ("statename", "state")
+
+
+def normalize_state(name):
+    """Canonical state name (as rule_extractor spells it) for a raw state name."""
+    name = " ".join(str(name).upper().replace("&", " AND ").replace(".", "").split())
+    return STATE_NAMES.get(name, name)
+
+
+def parse_pincode(value):
+    """Pincode as an int, or None if the value isn't a valid 6-digit pincode."""
+    number = "".join(filter(str.isdigit, str(value or "")))
+    if len(number) != 6 or number[0] == "0":
+        return None
+    return int(number)
+
+
+def read_ranges(source_path):
+    """
+    Read (start, end, city, state) rows from a range table or an India Post
+    directory CSV.
+
+    Returns:
+        List of (start, end, city, state) with city "" for state-only rows
+    """
+    with open(source_path, newline="", encoding="utf-8") as f:
+        lines = [line for line in f if line.strip() and not line.lstrip().startswith("#")]
+    reader = csv.DictReader(lines)
+    columns = {name.strip().lower(): name for name in reader.fieldnames or ()}
+
+    def column(options):
+        return next((columns[name] for name in options if name in columns), None)
+
+    if "start" in columns and "end" in columns:
+        return [
+            (int(row[columns["start"]]), int(row[columns["end"]]),
+             row.get(columns.get("city"), "").strip().upper(), normalize_state(row[columns["state"]]))
+            for row in reader
+        ]
+
+    pincode_col = column(DIRECTORY_PINCODE_COLUMNS)
+    city_col = column(DIRECTORY_CITY_COLUMNS)
+    state_col = column(DIRECTORY_STATE_COLUMNS)
+    if not (pincode_col and state_col):
+        raise ValueError(f"{source_path}: expected start,end,city,state or pincode,districtname,statename columns")
+
+    # One row per post office: keep the most common district/state of each pincode
+    votes = {}
+    for row in reader:
+        pincode = parse_pincode(row[pincode_col])
+        if pincode:
+            city = row[city_col].strip().upper() if city_col else ""
+            votes.setdefault(pincode, Counter())[(city, normalize_state(row[state_col]))] += 1
+
+    # Merge consecutive pincodes with the same district into one range
+    ranges = []
+    prefix_states = {}
+    for pincode in sorted(votes):
+        city, state = votes[pincode].most_common(1)[0][0]
+        prefix_states.setdefault(pincode // 1000, set()).add(state)
+        if ranges and ranges[-1][1] == pincode - 1 and ranges[-1][2:] == (city, state):
+            ranges[-1] = (ranges[-1][0], pincode, city, state)
+        else:
+            ranges.append((pincode, pincode, city, state))
+
+    # The directory lists every pincode, so a prefix whose pincodes all share
+    # a state can answer for the (new) pincodes it doesn't list yet
+    for prefix, states in prefix_states.items():
+        if len(states) == 1:
+            ranges.append((prefix * 1000, prefix * 1000 + 999, "", states.pop()))
+    return ranges
+
+
+def build_index(source_path=DEFAULT_SOURCE_PATH, index_path=DEFAULT_INDEX_PATH):
+    """
+    Compile a pincode CSV into the binary index file.
+
+    State-only rows spanning whole 3-digit prefixes fill the prefix table;
+    every other row becomes a range.
+
+    Args:
+        source_path: Range table or India Post directory CSV
+        index_path: Where to write the index
+
+    Returns:
+        Dict with 'ranges' and 'prefixes' (prefixes with a known state)
+    """
+    prefix_states = {}
+    ranges = []
+    for start, end, city, state in read_ranges(source_path):
+        if start > end or not (100000 <= start and end <= 999999):
+            raise ValueError(f"Invalid pincode range {start}-{end}")
+        if not city and start % 1000 == 0 and end % 1000 == 999:
+            for prefix in range(start // 1000, end // 1000 + 1):
+                prefix_states[prefix] = state
+        else:
+            ranges.append((start, end, city, state))
+
+    ranges.sort()
+    for previous, current in zip(ranges, ranges[1:]):
+        if current[0] <= previous[1]:
+            raise ValueError(f"Overlapping pincode ranges {previous[:2]} and {current[:2]}")
+
+    states = sorted(set(prefix_states.values()) | {state for *_, state in ranges})
+    cities = sorted({city for _, _, city, _ in ranges if city})
+    if len(states) > 255 or len(cities) > 65535:
+        raise ValueError("Too many distinct states or cities for the index format")
+    state_ids = {state: i + 1 for i, state in enumerate(states)}
+    city_ids = {city: i + 1 for i, city in enumerate(cities)}
+
+    prefix_table = bytearray(PREFIXES)
+    for prefix, state in prefix_states.items():
+        prefix_table[prefix] = state_ids[state]
+
+    starts = array("I", (start for start, _, _, _ in ranges))
+    ends = array("I", (end for _, end, _, _ in ranges))
+    city_column = array("H", (city_ids.get(city, 0) for _, _, city, _ in ranges))
+    state_column = array("B", (state_ids[state] for *_, state in ranges))
+    if sys.byteorder == "big":
+        for column in (starts, ends, city_column):
+            column.byteswap()
+
+    header = json.dumps({"ranges": len(ranges), "cities": cities, "states": states}).encode("utf-8")
+    with open(index_path + ".tmp", "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        f.write(b"\0" * (-f.tell() % 4))
+        f.write(prefix_table)
+        f.write(b"\0" * (-f.tell() % 4))
+        for column in (starts, ends, city_column, state_column):
+            f.write(column.tobytes())
+    os.replace(index_path + ".tmp", index_path)
+    return {"ranges": len(ranges), "prefixes": len(prefix_states)}
+
+
+class PincodeIndex:
+    """Read-only, memory-mapped pincode -> city/state index."""
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        """
+        Map an index file built by build_index().
+
+        Args:
+            index_path: Path of the binary index
+        """
+        self.path = index_path
+        with open(index_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{index_path} is not a pincode index")
+
+        offset = len(MAGIC)
+        (header_len,) = struct.unpack_from("<I", self._mmap, offset)
+        offset += 4
+        header = json.loads(self._mmap[offset:offset + header_len].decode("utf-8"))
+        offset += header_len
+        offset += -offset % 4
+
+        self.cities = [""] + header["cities"]
+        self.states = [""] + header["states"]
+        self.size = n = header["ranges"]
+
+        view = memoryview(self._mmap)
+        self._prefix_states = view[offset:offset + PREFIXES]
+        offset += PREFIXES
+        offset += -offset % 4
+        self._starts = self._column(view, offset, n, "I")
+        offset += 4 * n
+        self._ends = self._column(view, offset, n, "I")
+        offset += 4 * n
+        self._city_ids = self._column(view, offset, n, "H")
+        offset += 2 * n
+        self._state_ids = view[offset:offset + n]
+        self.lookups = 0
+
+    @staticmethod
+    def _column(view, offset, count, typecode):
+        """A little-endian array in the mapped file, viewed without copying."""
+        width = array(typecode).itemsize
+        column = view[offset:offset + count * width]
+        if sys.byteorder == "big":
+            swapped = array(typecode, column.tobytes())
+            swapped.byteswap()
+            return swapped
+        return column.cast(typecode)
+
+    def lookup(self, pincode):
+        """
+        Look up the city and state of a pincode.
+
+        The city is only known for pincodes inside a range of the index; the
+        state also comes from the prefix table.
+
+        Args:
+            pincode: Pincode as a string or int (separators are ignored)
+
+        Returns:
+            Dict with 'city' ("" if unknown), 'state' and 'exact' (True if
+            a range matched, False if only the state-level prefix table
+            did), or None if the pincode is invalid or its state is unknown
+        """
+        number = parse_pincode(pincode)
+        if number is None:
+            return None
+        self.lookups += 1
+
+        i = bisect_right(self._starts, number) - 1
+        if i >= 0 and number <= self._ends[i]:
+            return {"city": self.cities[self._city_ids[i]], "state": self.states[self._state_ids[i]], "exact": True}
+
+        state_id = self._prefix_states[number // 1000]
+        if not state_id:
+            return None
+        return {"city": "", "state": self.states[state_id], "exact": False}
+
+    def stats(self):
+        """Return the size of the index and the number of lookups so far."""
+        return {
+            "path": self.path,
+            "ranges": self.size,
+            "prefixes": sum(1 for state_id in self._prefix_states if state_id),
+            "lookups": self.lookups,
+        }
+
+
+def resolve_locations(data, overwrite_state=True):
+    """
+    Fill in or correct city/state fields from their pincodes.
+
+    Empty city and state fields are filled from the index. A state that
+    disagrees with its pincode is replaced only when the pincode falls in
+    a range of the index: a prefix-level match is too coarse to overrule
+    what the user wrote (e.g. Lakshadweep pincodes inside Kerala's prefix).
+    A city is never overwritten, since localities within a district go by
+    many names.
+
+    Args:
+        data: Form data, updated in place
+        overwrite_state: Replace a state that contradicts an exact match
+
+    Returns:
+        Dict of field name -> (old value, new value) for every change
+    """
+    index = get_pincode_index()
+    changes = {}
+    if index is None:
+        return changes
+
+    for pincode_field, city_field, state_field in LOCATION_FIELDS:
+        location = index.lookup(data.get(pincode_field))
+        if not location:
+            continue
+        city = str(data.get(city_field) or "").strip()
+        state = str(data.get(state_field) or "").strip()
+        if location["city"] and not city:
+            changes[city_field] = (city, location["city"])
+        mismatch = normalize_state(state) != location["state"]
+        if not state or (overwrite_state and location["exact"] and mismatch):
+            changes[state_field] = (state, location["state"])
+        elif normalize_state(state) != state.upper():
+            changes[state_field] = (state, normalize_state(state))
+
+    for field, (_, new) in changes.items():
+        data[field] = new
+    return changes
+
+
+_pincode_index = None
+_index_lock = threading.Lock()
+
+
+def get_pincode_index():
+    """
+    Get the process-wide pincode index, mapping it on first use.
+
+    The index is built from the bundled CSV if the binary file is missing
+    or older than its source.
+
+    Returns:
+        The PincodeIndex, or None if no index or source file is available
+    """
+    global _pincode_index
+    with _index_lock:
+        if _pincode_index is None:
+            _pincode_index = load_index()
+        return _pincode_index or None
+
+
+def configure_pincode_index(index_path=DEFAULT_INDEX_PATH, source_path=DEFAULT_SOURCE_PATH):
+    """Replace the process-wide pincode index with one loaded from other files."""
+    global _pincode_index
+    with _index_lock:
+        _pincode_index = load_index(index_path, source_path)
+        return _pincode_index or None
+
+
+def load_index(index_path=DEFAULT_INDEX_PATH, source_path=DEFAULT_SOURCE_PATH):
+    """Map the index, (re)building it from source first if needed. False if unavailable."""
+    try:
+        stale = (os.path.exists(source_path)
+                 and (not os.path.exists(index_path)
+                      or os.path.getmtime(source_path) > os.path.getmtime(index_path)))
+        if stale:
+            try:
+                build_index(source_path, index_path)
+            except OSError:
+                # e.g. a read-only install: an existing index is still usable
+                if not os.path.exists(index_path):
+                    raise
+        return PincodeIndex(index_path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Pincode index unavailable: {e}")
+        return False
+
+
+def main():
+    """Build the index and look up any pincodes given on the command line."""
+    parser = argparse.ArgumentParser(description="Build the offline pincode index.")
+    parser.add_argument("pincodes", nargs="*", help="Pincodes to look up after building")
+    parser.add_argument("--source", default=DEFAULT_SOURCE_PATH,
+                        help="Range table or India Post pincode directory CSV")
+    parser.add_argument("--output", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args()
+
+    result = build_index(args.source, args.output)
+    size = os.path.getsize(args.output)
+    print(f"✓ Built {args.output}: {result['ranges']} ranges, {result['prefixes']} prefixes ({size:,} bytes)")
+
+    index = PincodeIndex(args.output)
+    for pincode in args.pincodes:
+        location = index.lookup(pincode)
+        if location:
+            print(f"  {pincode}: {location['city'] or '-'}, {location['state']}")
+        else:
+            print(f"  {pincode}: unknown")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Rule-Based Extractor
+Deterministic fast path for structured "Key: value" input (like the README's
+"Example 1 - Structured"). Maps labels to form fields through a synonym
+table, validates values with compiled patterns and reports a confidence per
+field, so the LLM can be skipped when the rules already cover the form.
+"""
+import re
+from datetime import datetime
+
+# Confidence at or above which a field counts as reliably extracted
+HIGH_CONFIDENCE = 0.8
+
+# Fields that must be covered with high confidence before the LLM is skipped
+REQUIRED_FIELDS = (
+    'full_name',
+    'date_of_birth',
+    'gender',
+    'residential_address_line1',
+    'city',
+    'state',
+    'pincode',
+    'mobile_number',
+)
+
+# Label synonyms -> field name. "residential_address" and "office_address"
+# are split into the _line1/2/3 and landmark fields.
+FIELD_SYNONYMS = {
+    'full_name': ['name', 'full name', 'applicant name', 'customer name', 'applicant'],
+    'father_name': ['father', 'father name', 'fathers name', 'dad'],
+    'mother_name': ['mother', 'mother name', 'mothers name', 'mom', 'mum'],
+    'date_of_birth': ['dob', 'date of birth', 'birth date', 'born', 'birthday', 'd.o.b'],
+    'gender': ['gender', 'sex'],
+    'marital_status': ['status', 'marital status', 'married'],
+    'residential_address': ['address', 'residential address', 'home address', 'residence',
+                            'home', 'permanent address', 'current address'],
+    'residential_landmark': ['landmark', 'residential landmark'],
+    'city': ['city', 'town'],
+    'state': ['state'],
+    'pincode': ['pincode', 'pin', 'pin code', 'postal code', 'zip', 'zip code'],
+    'phone_no': ['phone', 'phone no', 'phone number', 'landline', 'telephone', 'tel'],
+    'mobile_number': ['mobile', 'mobile no', 'mobile number', 'cell', 'cell phone', 'contact'],
+    'email_id_1': ['email', 'e-mail', 'email id', 'e-mail id', 'mail'],
+    'email_id_2': ['email 2', 'alternate email', 'secondary email'],
+    'office_address': ['office', 'office address', 'work', 'work address', 'business address',
+                       'employer', 'company'],
+    'office_landmark': ['office landmark'],
+    'office_city': ['office city'],
+    'office_state': ['office state'],
+    'office_pincode': ['office pincode', 'office pin', 'office pin code'],
+    'office_phone_no': ['office phone', 'office phone no', 'office telephone', 'work phone',
+                        'office tel'],
+    'office_fax_no': ['fax', 'office fax', 'fax no'],
+    'branch': ['bank', 'branch', 'bank branch', 'branch name', 'home branch'],
+    'code_no': ['code', 'branch code', 'code no'],
+    'date': ['date', 'form date', 'application date'],
+    'cif_no': ['cif', 'cif no', 'cif number', 'customer id'],
+    'income_tax_pan_form': ['pan', 'pan no', 'pan number', 'pan card', 'income tax pan'],
+    'nationality': ['nationality', 'citizenship', 'citizen'],
+    'customer_type': ['customer type', 'customer category', 'type'],
+    'correspondence_address': ['correspondence', 'correspondence address', 'mailing address',
+                               'send mail to'],
+}
+
+LABEL_TO_FIELD = {
+    label: field for field, labels in FIELD_SYNONYMS.items() for label in labels
+}
+
+# Indian states and union territories, plus common short forms
+STATE_NAMES = {
+    'ANDHRA PRADESH': 'ANDHRA PRADESH', 'ARUNACHAL PRADESH': 'ARUNACHAL PRADESH',
+    'ASSAM': 'ASSAM', 'BIHAR': 'BIHAR', 'CHHATTISGARH': 'CHHATTISGARH', 'GOA': 'GOA',
+    'GUJARAT': 'GUJARAT', 'HARYANA': 'HARYANA', 'HIMACHAL PRADESH': 'HIMACHAL PRADESH',
+    'JHARKHAND': 'JHARKHAND', 'KARNATAKA': 'KARNATAKA', 'KERALA': 'KERALA',
+    'MADHYA PRADESH': 'MADHYA PRADESH', 'MAHARASHTRA': 'MAHARASHTRA', 'MANIPUR': 'MANIPUR',
+    'MEGHALAYA': 'MEGHALAYA', 'MIZORAM': 'MIZORAM', 'NAGALAND': 'NAGALAND', 'ODISHA': 'ODISHA',
+    'ORISSA': 'ODISHA', 'PUNJAB': 'PUNJAB', 'RAJASTHAN': 'RAJASTHAN', 'SIKKIM': 'SIKKIM',
+    'TAMIL NADU': 'TAMIL NADU', 'TELANGANA': 'TELANGANA', 'TRIPURA': 'TRIPURA',
+    'UTTAR PRADESH': 'UTTAR PRADESH', 'UTTARAKHAND': 'UTTARAKHAND',
+    'WEST BENGAL': 'WEST BENGAL', 'DELHI': 'DELHI', 'NCT OF DELHI': 'DELHI',
+    'JAMMU AND KASHMIR': 'JAMMU AND KASHMIR', 'LADAKH': 'LADAKH', 'PUDUCHERRY': 'PUDUCHERRY',
+    'CHANDIGARH': 'CHANDIGARH', 'ANDAMAN AND NICOBAR ISLANDS': 'ANDAMAN AND NICOBAR ISLANDS',
+    'LAKSHADWEEP': 'LAKSHADWEEP',
+    'DADRA AND NAGAR HAVELI AND DAMAN AND DIU': 'DADRA AND NAGAR HAVELI AND DAMAN AND DIU',
+    'UP': 'UTTAR PRADESH', 'MP': 'MADHYA PRADESH', 'HP': 'HIMACHAL PRADESH',
+    'TN': 'TAMIL NADU', 'WB': 'WEST BENGAL', 'AP': 'ANDHRA PRADESH', 'J&K': 'JAMMU AND KASHMIR',
+}
+
+# Large cities whose state is usually left out of an address
+CITY_STATES = {
+    'NEW DELHI': 'DELHI', 'DELHI': 'DELHI', 'MUMBAI': 'MAHARASHTRA', 'PUNE': 'MAHARASHTRA',
+    'BENGALURU': 'KARNATAKA', 'BANGALORE': 'KARNATAKA', 'CHENNAI': 'TAMIL NADU',
+    'KOLKATA': 'WEST BENGAL', 'HYDERABAD': 'TELANGANA', 'AHMEDABAD': 'GUJARAT',
+    'JAIPUR': 'RAJASTHAN', 'LUCKNOW': 'UTTAR PRADESH', 'NOIDA': 'UTTAR PRADESH',
+    'GURGAON': 'HARYANA', 'GURUGRAM': 'HARYANA', 'CHANDIGARH': 'CHANDIGARH',
+}
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# Compiled patterns
+LABEL_LINE_RE = re.compile(r"^\s*([A-Za-z][A-Za-z .'/&()-]{0,30}?)\s*[:=]\s*(.*)$")
+INLINE_PAIR_SPLIT_RE = re.compile(r",\s*(?=[A-Za-z][A-Za-z .'-]{1,25}:)")
+PAN_RE = re.compile(r"\b([A-Z]{5}[0-9]{4}[A-Z])\b", re.IGNORECASE)
+PINCODE_RE = re.compile(r"(?<!\d)([1-9][0-9]{2})\s?([0-9]{3})(?!\d)")
+MOBILE_RE = re.compile(r"(?<!\d)(?:\+?91[\s-]?|0)?([6-9][0-9]{9})(?!\d)")
+PHONE_RE = re.compile(r"(?<!\d)(0[0-9]{2,4})[\s-]?([0-9]{6,8})(?!\d)")
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+NUMERIC_DATE_RE = re.compile(r"\b([0-3]?[0-9])[/.-]([01]?[0-9])[/.-]((?:19|20)?[0-9]{2})\b")
+TEXT_DATE_RE = re.compile(
+    r"\b([0-3]?[0-9])(?:st|nd|rd|th)?\s+(?:of\s+)?([A-Za-z]{3,9})[,\s]+((?:19|20)[0-9]{2})\b"
+)
+DOB_CONTEXT_RE = re.compile(r"(?i)\b(?:born|birth|dob|d\.o\.b)\b[^0-9\n]{0,30}(.{6,30})")
+DIGITS_RE = re.compile(r"[0-9]+")
+# Free text rather than data: a sentence about the applicant, or one that ends like one
+PROSE_RE = re.compile(r"(?i)^(?:i|i'm|i am|i'd|my|we|our|please|also|thanks|thank you|can|could)\b")
+SENTENCE_END_RE = re.compile(r"[.!?]\s*$")
+
+# Labels whose value may continue on the following lines
+MULTILINE_FIELDS = ('residential_address', 'office_address')
+
+
+def normalize_label(label):
+    """Lower-case a label and drop punctuation that doesn't change its meaning."""
+    label = label.lower().replace("'", "").replace("’", "")
+    label = re.sub(r"[^a-z0-9&.\- ]", " ", label)
+    return re.sub(r"\s+", " ", label).strip(" .-")
+
+
+def parse_date(text):
+    """
+    Find a date in text and return it as DD/MM/YYYY, or "" if none is valid.
+    """
+    match = NUMERIC_DATE_RE.search(text)
+    if match:
+        day, month, year = (int(p) for p in match.groups())
+    else:
+        match = TEXT_DATE_RE.search(text)
+        if not match or match.group(2)[:3].lower() not in MONTHS:
+            return ""
+        day, month, year = int(match.group(1)), MONTHS[match.group(2)[:3].lower()], int(match.group(3))
+
+    if year < 100:
+        year += 1900 if year > datetime.now().year % 100 else 2000
+    try:
+        return datetime(year, month, day).strftime('%d/%m/%Y')
+    except ValueError:
+        return ""
+
+
+def split_address(text, prefix):
+    """
+    Split a free-text address into form fields.
+
+    Pulls out the pincode, a known state, the city just before them and a
+    "Near ..." landmark, then packs the rest into up to three 25-character
+    address lines.
+
+    Args:
+        text: Address text (may span several lines)
+        prefix: "residential" or "office", used to name the fields
+
+    Returns:
+        Dict of field name -> (value, confidence)
+    """
+    fields = {}
+    city_field, state_field, pin_field = (
+        ('city', 'state', 'pincode') if prefix == 'residential'
+        else ('office_city', 'office_state', 'office_pincode')
+    )
+
+    pin = PINCODE_RE.search(text)
+    if pin:
+        fields[pin_field] = (pin.group(1) + pin.group(2), 0.95)
+        text = text[:pin.start()] + text[pin.end():]
+
+    parts = [p.strip(" -") for p in re.split(r"[,\n]+", text) if p.strip(" -")]
+
+    # State (and the city right before it) from the tail of the address
+    for i in range(len(parts) - 1, -1, -1):
+        state = STATE_NAMES.get(parts[i].upper().replace('.', '').strip())
+        if state:
+            fields[state_field] = (state, 0.9)
+            parts.pop(i)
+            if i > 0 and not re.search(r"\d", parts[i - 1]):
+                fields[city_field] = (parts.pop(i - 1).upper(), 0.85)
+            break
+    else:
+        # No state given - fall back to a well-known city at the end
+        for i in range(len(parts) - 1, -1, -1):
+            city = parts[i].upper().strip()
+            if city in CITY_STATES:
+                fields[city_field] = (city, 0.85)
+                fields[state_field] = (CITY_STATES[city], 0.85)
+                parts.pop(i)
+                break
+            if not re.search(r"\d", city):
+                break
+
+    # "Near ..." / "Opp. ..." segment becomes the landmark
+    for i, part in enumerate(parts):
+        if re.match(r"(?i)^(near|opp\.?|opposite|behind|beside)\b", part):
+            fields[f'{prefix}_landmark'] = (part.upper()[:27], 0.85)
+            parts.pop(i)
+            break
+
+    # Pack the remaining segments into up to three lines of 25 characters
+    # (long segments are wrapped at word boundaries)
+    lines = []
+    for part in parts:
+        part = part.upper()
+        if lines and len(lines[-1]) + 1 + len(part) <= 25:
+            lines[-1] = f"{lines[-1]} {part}"
+            continue
+        lines.append("")
+        for word in part.split():
+            if lines[-1] and len(lines[-1]) + 1 + len(word) > 25:
+                lines.append("")
+            lines[-1] = f"{lines[-1]} {word}".strip()[:25]
+    score = 0.85 if len(lines) <= 3 else 0.6  # Address didn't fit, let the LLM redo it
+    for number, line in enumerate(lines[:3], start=1):
+        fields[f'{prefix}_address_line{number}'] = (line, score)
+    return fields
+
+
+def normalize_value(field, value):
+    """
+    Validate and normalise a labelled value for its field.
+
+    Returns:
+        (value, confidence), or ("", 0.0) if the value doesn't fit the field
+    """
+    value = value.strip().strip(',;')
+    if not value:
+        return "", 0.0
+    if "\n" in value:
+        # Only addresses span lines; keep the first line, but not as a sure thing
+        first_value, score = normalize_value(field, value.split("\n", 1)[0])
+        return first_value, min(score, HIGH_CONFIDENCE - 0.2)
+
+    if field == 'income_tax_pan_form':
+        match = PAN_RE.search(value)
+        return (match.group(1).upper(), 1.0) if match else (value.upper()[:10], 0.4)
+    if field in ('pincode', 'office_pincode'):
+        match = PINCODE_RE.search(value)
+        return (match.group(1) + match.group(2), 1.0) if match else ("", 0.0)
+    if field == 'mobile_number':
+        match = MOBILE_RE.search(value.replace(' ', ''))
+        return (match.group(1), 1.0) if match else ("", 0.0)
+    if field in ('phone_no', 'office_phone_no', 'office_fax_no'):
+        digits = "".join(DIGITS_RE.findall(value))
+        return (digits, 0.95) if 6 <= len(digits) <= 16 else ("", 0.0)
+    if field in ('email_id_1', 'email_id_2'):
+        match = EMAIL_RE.search(value)
+        return (match.group(0).lower(), 1.0) if match else ("", 0.0)
+    if field in ('date_of_birth', 'date'):
+        date = parse_date(value)
+        return (date, 1.0) if date else ("", 0.0)
+    if field in ('code_no', 'cif_no'):
+        digits = "".join(DIGITS_RE.findall(value))
+        return (digits, 0.95) if digits else ("", 0.0)
+    if field == 'gender':
+        lowered = value.lower()
+        if lowered in ('male', 'm') or lowered.startswith('male'):
+            return 'Male', 1.0
+        if lowered in ('female', 'f') or lowered.startswith('female'):
+            return 'Female', 1.0
+        return "", 0.0
+    if field == 'marital_status':
+        lowered = value.lower()
+        if lowered.startswith(('married', 'yes')):
+            return 'Married', 1.0
+        if lowered.startswith(('unmarried', 'single', 'no')):
+            return 'Unmarried', 1.0
+        return 'Others', 0.6
+    if field == 'customer_type':
+        return ('Staff', 1.0) if 'staff' in value.lower() or 'employee' in value.lower() else ('Public', 0.9)
+    if field == 'correspondence_address':
+        lowered = value.lower()
+        if lowered in ('c', 'office', 'work') or 'office' in lowered:
+            return 'C', 1.0
+        if lowered in ('b', 'home', 'residential') or 'home' in lowered or 'resid' in lowered:
+            return 'B', 1.0
+        return "", 0.0
+    if field == 'state' or field == 'office_state':
+        state = STATE_NAMES.get(value.upper().replace('.', '').strip())
+        return (state, 1.0) if state else (value.upper()[:30], 0.7)
+    if field == 'nationality':
+        return value.upper()[:10], 0.95
+
+    # Names, city, branch, landmark
+    if len(value) > 60 or re.search(r"\d", value) and field.endswith('name'):
+        return value.upper(), 0.5
+    return value.upper(), 0.9
+
+
+def is_prose(text):
+    """True if text reads like a sentence of free text rather than a value."""
+    text = text.strip()
+    return bool(PROSE_RE.match(text) or (SENTENCE_END_RE.search(text) and len(text.split()) >= 4))
+
+
+def iter_labelled_values(raw_input):
+    """
+    Yield (label, value) pairs from "Key: value" lines.
+
+    Lines without a recognised label continue an address value (e.g. its
+    second line); any other value ends at the end of its line. A blank line
+    or a line of prose also ends an address. Several pairs on one line
+    ("Bank: X, Code: 123") are split apart.
+    """
+    current_label, current_value = None, []
+    for line in raw_input.splitlines():
+        if not line.strip():
+            if current_label:
+                yield current_label, "\n".join(current_value)
+            current_label, current_value = None, []
+            continue
+        segments = INLINE_PAIR_SPLIT_RE.split(line)
+        for segment in segments:
+            match = LABEL_LINE_RE.match(segment)
+            label = normalize_label(match.group(1)) if match else None
+            if label in LABEL_TO_FIELD:
+                if current_label:
+                    yield current_label, "\n".join(current_value)
+                current_label, current_value = label, [match.group(2)]
+            elif (current_label and LABEL_TO_FIELD[current_label] in MULTILINE_FIELDS
+                  and not is_prose(segment)):
+                current_value.append(segment)
+            elif current_label:
+                yield current_label, "\n".join(current_value)
+                current_label, current_value = None, []
+    if current_label:
+        yield current_label, "\n".join(current_value)
+
+
+def extract_with_rules(raw_input):
+    """
+    Extract form fields from structured input without the LLM.
+
+    Args:
+        raw_input: Raw text input from the user
+
+    Returns:
+        (data, confidence): dict of field name -> value and dict of
+        field name -> confidence between 0 and 1
+    """
+    data, confidence = {}, {}
+
+    def put(field, value, score):
+        if value and score > confidence.get(field, 0.0):
+            data[field] = value
+            confidence[field] = score
+
+    for label, value in iter_labelled_values(raw_input):
+        field = LABEL_TO_FIELD[label]
+        if field in ('residential_address', 'office_address'):
+            prefix = field.split('_')[0]
+            for address_field, (address_value, score) in split_address(value, prefix).items():
+                put(address_field, address_value, score)
+        else:
+            put(field, *normalize_value(field, value))
+
+    # "Phone: 9876543210" is usually the applicant's mobile
+    if 'mobile_number' not in data and re.fullmatch(r"(?:91)?[6-9][0-9]{9}", data.get('phone_no', '')):
+        put('mobile_number', data.pop('phone_no')[-10:], confidence.pop('phone_no'))
+
+    # Unlabelled but unambiguous patterns anywhere in the text
+    if 'income_tax_pan_form' not in data:
+        pans = {m.upper() for m in PAN_RE.findall(raw_input)}
+        if len(pans) == 1:
+            put('income_tax_pan_form', pans.pop(), 0.85)
+    if 'mobile_number' not in data:
+        mobiles = set(MOBILE_RE.findall(raw_input))
+        if len(mobiles) == 1:
+            put('mobile_number', mobiles.pop(), 0.85)
+    if 'pincode' not in data and 'office_pincode' not in data:
+        pincodes = {a + b for a, b in PINCODE_RE.findall(raw_input)} - set(data.values())
+        if len(pincodes) == 1:
+            put('pincode', pincodes.pop(), 0.8)
+    if 'date_of_birth' not in data:
+        birth = DOB_CONTEXT_RE.search(raw_input)
+        date = parse_date(birth.group(1)) if birth else ""
+        if date:
+            put('date_of_birth', date, 0.85)
+    if 'email_id_1' not in data:
+        emails = EMAIL_RE.findall(raw_input)
+        if emails:
+            put('email_id_1', emails[0].lower(), 0.85)
+            if len(emails) > 1 and 'email_id_2' not in data:
+                put('email_id_2', emails[1].lower(), 0.8)
+
+    return data, confidence
+
+
+def covers_required_fields(confidence, required=REQUIRED_FIELDS, threshold=HIGH_CONFIDENCE):
+    """Check whether every required field was extracted with high confidence."""
+    return all(confidence.get(field, 0.0) >= threshold for field in required)
@@ -0,0 +1,143 @@
+"""
+Single Flight
+Coalesces identical concurrent work: while one caller (the leader) computes
+the result for a key, every other caller with the same key waits for that
+result instead of starting the work again.
+
+Used to keep double-clicked or retried form submissions from running the
+same LLM extraction twice.
+"""
+import threading
+
+
+class LeaderCancelled(Exception):
+    """The leader was cancelled before finishing; a waiter should take over."""
+
+
+class InFlightCall:
+    """One in-progress computation that other callers can wait on."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.waiters = 0
+
+    def wait(self, timeout=None):
+        """
+        Wait for the leader to finish.
+
+        Returns:
+            A copy of the leader's result
+
+        Raises:
+            The leader's exception, if it failed
+            LeaderCancelled: If the leader was cancelled (begin() again to
+                take over or join the new leader)
+            TimeoutError: If the timeout expired first
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("Timed out waiting for the in-flight extraction")
+        if self.cancelled:
+            raise LeaderCancelled()
+        if self.error is not None:
+            raise self.error
+        return dict(self.result) if isinstance(self.result, dict) else self.result
+
+
+class SingleFlight:
+    """Thread-safe registry of in-flight calls, keyed on a string."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.takeovers = 0
+
+    def begin(self, key):
+        """
+        Join the call in flight for key, or start one.
+
+        A leader must call finish() when done, whether it succeeded or not.
+
+        Returns:
+            (call, is_leader)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                return call, False
+            call = InFlightCall()
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        """
+        Publish the leader's result (or exception) and release the waiters.
+
+        A leader that was cancelled rather than failed (GeneratorExit from a
+        disconnected stream, KeyboardInterrupt) passes no error on: its
+        waiters get LeaderCancelled and one of them runs the work instead.
+        """
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            if error is not None and not isinstance(error, Exception):
+                call.cancelled = True
+                error = None
+                if call.waiters:
+                    self.takeovers += 1
+        call.result = result
+        call.error = error
+        call._done.set()
+
+    def do(self, key, fn):
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the work (e.g. an extraction cache key)
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            (result, shared) - shared is True if another caller's run was reused
+        """
+        while True:
+            call, is_leader = self.begin(key)
+            if is_leader:
+                break
+            try:
+                return call.wait(), True
+            except LeaderCancelled:
+                continue  # Take over (or join whoever did)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result=result)
+        return result, False
+
+    def stats(self):
+        """Return leader / coalesced / takeover counts and the number of calls in flight."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "takeovers": self.takeovers,
+            }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight():
+    """Get the process-wide single-flight registry for extractions."""
+    return _single_flight
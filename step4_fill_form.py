@@ -4,38 +4,168 @@ This script fills the PDF form using the coordinates from layout_config.py
 """
 import fitz  # PyMuPDF
 import os
+import shutil
+import tempfile
+from itertools import groupby
 from layout_config import (
-    get_all_text_fields,
-    get_all_boxed_fields,
-    get_all_date_fields,
-    get_all_image_fields,
-    get_all_checkbox_fields,
+    get_render_plan,
+    box_positions,
+    date_positions,
+    option_positions,
     PAGE_CONFIG
 )
 from dummy_data import generate_dummy_data
+from template_cache import get_template_registry
+from image_cache import get_image_cache, ENCODING_JPEG
+
+# Named save profiles: keyword arguments for fitz.Document.save()/tobytes()
+#   fast        - no garbage collection or compression (quickest to write)
+#   compact     - garbage collection, deflate and object streams (smallest file)
+#   incremental - append only the filled content to a copy of the template
+SAVE_PROFILES = {
+    "fast": {"garbage": 0, "deflate": False},
+    "compact": {
+        "garbage": 3,
+        "deflate": True,
+        "deflate_images": True,
+        "deflate_fonts": True,
+        "use_objstms": 1,
+    },
+    "incremental": {"incremental": True, "encryption": fitz.PDF_ENCRYPT_KEEP},
+}
+
+DEFAULT_SAVE_PROFILE = "fast"
+
+
+class PageGlyphBatch:
+    """
+    Collect single-glyph text insertions for one page and write them out as
+    one content stream, instead of one BT/ET stream per character.
+
+    The generated operators match what page.insert_text() emits per glyph
+    (same Tm origin, font and fill colour), so the rendered output is
+    unchanged - only the number of content objects and font lookups drops.
+    """
+    
+    def __init__(self, page):
+        self.page = page
+        self.glyphs = []  # (x, y, text, fontname, fontsize)
+        
+    def add(self, x, y, text, fontname, fontsize):
+        """Queue text at (x, y) in top-left page coordinates."""
+        self.glyphs.append((x, y, text, fontname, fontsize))
+        
+    def flush(self):
+        """Write all queued glyphs to the page as a single content stream."""
+        if not self.glyphs:
+            return
+        
+        # Register each font on the page once
+        for fontname in {g[3] for g in self.glyphs}:
+            self.page.insert_font(fontname=fontname)
+        
+        # Page -> PDF coordinates (unpacked once; fitz.Point math per glyph is slow)
+        a, b, c, d, e, f = tuple(self.page.transformation_matrix)
+        ops = ["q\n0 0 0 RG 0 0 0 rg\nBT\n"]
+        current_font = None
+        for x, y, text, fontname, fontsize in self.glyphs:
+            if (fontname, fontsize) != current_font:
+                ops.append(f"/{fontname} {fontsize:g} Tf\n")
+                current_font = (fontname, fontsize)
+            codes = "".join(f"{ord(ch):02x}" if ord(ch) < 256 else "b7" for ch in text)
+            ops.append(f"1 0 0 1 {x * a + y * c + e:g} {x * b + y * d + f:g} Tm [<{codes}>]TJ\n")
+        ops.append("ET\nQ\n")
+        
+        shape = self.page.new_shape()
+        shape.text_cont = "".join(ops)
+        shape.commit()
+        self.glyphs = []
 
 
 class PDFFormFiller:
     """Fill PDF forms using coordinate-based layout configuration."""
     
-    def __init__(self, template_pdf_path, output_pdf_path):
+    def __init__(self, template_pdf_path, output_pdf_path=None, use_template_cache=True,
+                 batch_glyphs=True, preprocess_images=True, save_profile=DEFAULT_SAVE_PROFILE):
         """
         Initialize the form filler.
         
         Args:
             template_pdf_path: Path to the blank form template
-            output_pdf_path: Path to save the filled form
+            output_pdf_path: Path to save the filled form (not needed when
+                rendering to bytes with to_bytes())
+            use_template_cache: Open the template from the in-memory
+                template registry instead of re-reading it from disk
+            batch_glyphs: Write boxed/date characters and checkmarks as one
+                content stream per page instead of one insert_text per glyph
+            preprocess_images: Embed images downsampled to their target box
+                (via the shared image cache) instead of the original files
+            save_profile: Default profile for save()/to_bytes(), one of
+                SAVE_PROFILES. "incremental" has to be chosen here, because
+                the template copy is then written out before filling
         """
+        if save_profile not in SAVE_PROFILES:
+            raise ValueError(f"Unknown save profile: {save_profile}")
+        
         self.template_path = template_pdf_path
         self.output_path = output_pdf_path
+        self.use_template_cache = use_template_cache
+        self.batch_glyphs = batch_glyphs
+        self.preprocess_images = preprocess_images
+        self.save_profile = save_profile
+        self._incremental_path = None  # on-disk template copy for incremental saves
+        self._incremental_is_temp = False
         self.doc = None
         self.font_name = "helv"  # Helvetica - standard PDF font
+        self._glyph_batches = {}  # page number -> PageGlyphBatch
+        self._image_xrefs = {}  # image key -> xref of the image already embedded in self.doc
+        self._prefilled = set()  # fields already drawn by prefill()
         
     def open_template(self):
-        """Open the PDF template."""
-        self.doc = fitz.open(self.template_path)
+        """Open the PDF template (a cached in-memory copy by default)."""
+        self._image_xrefs = {}
+        if self.save_profile == "incremental":
+            self._open_incremental_copy()
+        elif self.use_template_cache:
+            self.doc = get_template_registry().open_copy(self.template_path)
+        else:
+            self.doc = fitz.open(self.template_path)
         print(f"✓ Opened template: {self.template_path}")
         
+    def _open_incremental_copy(self):
+        """
+        Write a copy of the template where the output goes and open it, so
+        the filled content can later be appended with an incremental save.
+        """
+        if self.output_path:
+            self._incremental_path = self.output_path
+        else:
+            fd, self._incremental_path = tempfile.mkstemp(suffix=".pdf")
+            os.close(fd)
+            self._incremental_is_temp = True
+        
+        if self.use_template_cache:
+            with open(self._incremental_path, "wb") as f:
+                f.write(get_template_registry().get(self.template_path).data)
+        else:
+            shutil.copyfile(self.template_path, self._incremental_path)
+        self.doc = fitz.open(self._incremental_path)
+        
+    def _save_options(self, profile):
+        """
+        Get the fitz save keyword arguments for a profile.
+        
+        Incremental saves need the document to have been opened from its
+        on-disk copy; otherwise this falls back to a full "fast" save.
+        """
+        profile = profile or self.save_profile
+        if profile not in SAVE_PROFILES:
+            raise ValueError(f"Unknown save profile: {profile}")
+        if profile == "incremental" and self._incremental_path is None:
+            print("  ⚠️  Incremental save needs save_profile='incremental' at creation, using 'fast'")
+            profile = "fast"
+        return profile, SAVE_PROFILES[profile]
+        
     def fill_text_field(self, page, field_name, value, config):
         """
         Fill a standard text field.
@@ -68,7 +198,36 @@ class PDFFormFiller:
         
         print(f"  ✓ Filled '{field_name}': {value} at ({x}, {y})")
         
-    def fill_boxed_field(self, page, field_name, value, config):
+    def insert_glyph(self, page, x, y, text, fontname=None, fontsize=9):
+        """
+        Insert a single glyph (or short run of text) at a baseline position.
+        
+        With batch_glyphs enabled the glyph is queued and written when the
+        page is flushed; otherwise it is inserted immediately.
+        """
+        fontname = fontname or self.font_name
+        if not self.batch_glyphs:
+            page.insert_text(
+                (x, y),
+                text,
+                fontsize=fontsize,
+                fontname=fontname,
+                color=(0, 0, 0)
+            )
+            return
+        
+        batch = self._glyph_batches.get(page.number)
+        if batch is None:
+            batch = self._glyph_batches[page.number] = PageGlyphBatch(page)
+        batch.add(x, y, text, fontname, fontsize)
+        
+    def flush_glyphs(self):
+        """Write all queued glyphs to their pages."""
+        for batch in self._glyph_batches.values():
+            batch.flush()
+        self._glyph_batches = {}
+        
+    def fill_boxed_field(self, page, field_name, value, config, positions=None):
         """
         Fill a boxed field where each character goes in a separate box.
         
@@ -77,34 +236,29 @@ class PDFFormFiller:
             field_name: Name of the field
             value: Text value to fill (one char per box)
             config: Field configuration dict
+            positions: Precomputed (x, y) per box from the render plan
         """
         if not value:
             return
             
         x_start = config["x_start"]
         y = config["y"]
-        dx = config["dx"]
         font_size = config.get("font_size", 10)
         max_chars = config.get("max_chars", 10)
         
         # Convert to uppercase and limit length
         value = str(value).upper()[:max_chars]
         
+        if positions is None:
+            positions = box_positions(config, max_chars)
+        
         # Fill character by character
-        x = x_start
-        for char in value:
-            page.insert_text(
-                (x, y),
-                char,
-                fontsize=font_size,
-                fontname=self.font_name,
-                color=(0, 0, 0)
-            )
-            x += dx
+        for char, (x, y) in zip(value, positions):
+            self.insert_glyph(page, x, y, char, fontsize=font_size)
         
         print(f"  ✓ Filled boxed '{field_name}': {value} starting at ({x_start}, {y})")
         
-    def fill_date_field(self, page, field_name, value, config):
+    def fill_date_field(self, page, field_name, value, config, positions=None):
         """
         Fill a date field with separate DD/MM/YYYY sections.
         
@@ -113,6 +267,7 @@ class PDFFormFiller:
             field_name: Name of the field
             value: Date string (DD/MM/YYYY format)
             config: Field configuration dict with dd, mm, yyyy sections
+            positions: Precomputed box positions per section from the render plan
         """
         if not value:
             return
@@ -131,54 +286,17 @@ class PDFFormFiller:
         
         font_size = config.get("font_size", 9)
         
-        # Fill DD section
-        dd_config = config["dd"]
-        x = dd_config["x_start"]
-        y = dd_config["y"]
-        dx = dd_config["dx"]
-        for char in dd:
-            page.insert_text(
-                (x, y),
-                char,
-                fontsize=font_size,
-                fontname=self.font_name,
-                color=(0, 0, 0)
-            )
-            x += dx
-        
-        # Fill MM section
-        mm_config = config["mm"]
-        x = mm_config["x_start"]
-        y = mm_config["y"]
-        dx = mm_config["dx"]
-        for char in mm:
-            page.insert_text(
-                (x, y),
-                char,
-                fontsize=font_size,
-                fontname=self.font_name,
-                color=(0, 0, 0)
-            )
-            x += dx
-        
-        # Fill YYYY section
-        yyyy_config = config["yyyy"]
-        x = yyyy_config["x_start"]
-        y = yyyy_config["y"]
-        dx = yyyy_config["dx"]
-        for char in yyyy:
-            page.insert_text(
-                (x, y),
-                char,
-                fontsize=font_size,
-                fontname=self.font_name,
-                color=(0, 0, 0)
-            )
-            x += dx
+        if positions is None:
+            positions = date_positions(config)
+        
+        # Fill DD, MM and YYYY sections
+        for part, section in ((dd, "dd"), (mm, "mm"), (yyyy, "yyyy")):
+            for char, (x, y) in zip(part, positions[section]):
+                self.insert_glyph(page, x, y, char, fontsize=font_size)
         
         print(f"  ✓ Filled date '{field_name}': {dd}/{mm}/{yyyy}")
         
-    def fill_checkbox(self, page, field_name, selected_option, config):
+    def fill_checkbox(self, page, field_name, selected_option, config, positions=None):
         """
         Fill a checkbox or radio button.
         
@@ -187,23 +305,19 @@ class PDFFormFiller:
             field_name: Name of the field
             selected_option: Which option is selected
             config: Field configuration dict with options
+            positions: Precomputed option -> (x, y) from the render plan
         """
-        if not selected_option or selected_option not in config["options"]:
+        if positions is None:
+            positions = option_positions(config)
+        
+        if not selected_option or selected_option not in positions:
             return
             
-        option_config = config["options"][selected_option]
-        x = option_config["x"]
-        y = option_config["y"]
+        x, y = positions[selected_option]
         
         # Draw a checkmark using ZapfDingbats font
         # In ZapfDingbats, character "4" is a checkmark
-        page.insert_text(
-            (x, y),
-            "4",
-            fontsize=10,
-            fontname="zadb",  # ZapfDingbats font for checkmark symbol
-            color=(0, 0, 0)
-        )
+        self.insert_glyph(page, x, y, "4", fontname="zadb", fontsize=10)
         
         print(f"  ✓ Checked '{field_name}': {selected_option} at ({x}, {y})")
         
@@ -235,12 +349,92 @@ class PDFFormFiller:
         rect = fitz.Rect(x, y, x + width, y + height)
         
         try:
+            # Reuse the image if it is already embedded in this document
+            encoding = config.get("encoding", ENCODING_JPEG)
+            image_key = (os.path.abspath(image_path), width, height, encoding, self.preprocess_images)
+            xref = self._image_xrefs.get(image_key)
+            
             # Insert image into the rectangle
-            page.insert_image(rect, filename=image_path)
+            if xref:
+                page.insert_image(rect, xref=xref)
+            elif self.preprocess_images:
+                image_data = get_image_cache().prepare(image_path, width, height, encoding)
+                self._image_xrefs[image_key] = page.insert_image(rect, stream=image_data)
+            else:
+                self._image_xrefs[image_key] = page.insert_image(rect, filename=image_path)
             print(f"  ✓ Inserted image '{field_name}' at ({x}, {y}) size ({width}x{height})")
         except Exception as e:
             print(f"  ❌ Failed to insert '{field_name}': {str(e)}")
         
+    def fill_entry(self, page, entry, value):
+        """
+        Fill one field from its compiled render plan entry.
+        
+        Args:
+            page: PDF page object
+            entry: Render plan entry (see layout_config.compile_render_plan)
+            value: Value to fill
+        """
+        field_name = entry["name"]
+        config = entry["config"]
+        kind = entry["kind"]
+        
+        if kind == "text":
+            self.fill_text_field(page, field_name, value, config)
+        elif kind == "boxed":
+            self.fill_boxed_field(page, field_name, value, config, entry["positions"])
+        elif kind == "date":
+            self.fill_date_field(page, field_name, value, config, entry["positions"])
+        elif kind == "image":
+            self.fill_image(page, field_name, value, config)
+        elif kind == "checkbox":
+            self.fill_checkbox(page, field_name, value, config, entry["positions"])
+        
+    def fill_pages(self, pages, data):
+        """
+        Fill the fields in data onto the given pages.
+        
+        Args:
+            pages: Dict of layout page number -> PDF page object to draw on
+            data: Dictionary with field names and values
+        """
+        # Single pass over the data keys that have a layout entry,
+        # drawn in the plan's page/kind order
+        plan = get_render_plan()["by_field"]
+        entries = sorted(
+            (plan[field_name] for field_name in data if field_name in plan),
+            key=lambda entry: (entry["page"], entry["order"])
+        )
+        
+        for page_num, page_entries in groupby(entries, key=lambda entry: entry["page"]):
+            page = pages.get(page_num)
+            if page is None:
+                continue
+            print(f"\n--- Processing Page {page_num} ---")
+            
+            for entry in page_entries:
+                self.fill_entry(page, entry, data[entry["name"]])
+            
+            # Write this page's queued glyphs as a single content stream
+            self.flush_glyphs()
+        
+    def prefill(self, data):
+        """
+        Open the template and fill some fields ahead of the rest.
+        
+        Used to do the expensive, input-independent work (template copy,
+        image embedding) while the LLM is still running. Fields filled here
+        are skipped by a later fill_form() call.
+        
+        Args:
+            data: Dictionary with the field names and values to fill now
+        """
+        if not self.doc:
+            self.open_template()
+        
+        self.fill_pages(dict(enumerate(self.doc)), data)
+        self._prefilled.update(data)
+        
     def fill_form(self, data):
         """
         Fill the entire form with provided data.
@@ -255,60 +449,166 @@ class PDFFormFiller:
         print("FILLING FORM WITH DATA")
         print("=" * 60)
         
-        # Get all field configurations
-        text_fields = get_all_text_fields()
-        boxed_fields = get_all_boxed_fields()
-        date_fields = get_all_date_fields()
-        image_fields = get_all_image_fields()
-        checkbox_fields = get_all_checkbox_fields()
-        
-        # Process each page
-        for page_num, page in enumerate(self.doc):
-            print(f"\n--- Processing Page {page_num} ---")
-            
-            # Fill text fields
-            for field_name, config in text_fields.items():
-                if config["page"] == page_num and field_name in data:
-                    self.fill_text_field(page, field_name, data[field_name], config)
-            
-            # Fill boxed fields
-            for field_name, config in boxed_fields.items():
-                if config["page"] == page_num and field_name in data:
-                    self.fill_boxed_field(page, field_name, data[field_name], config)
-            
-            # Fill date fields (DD/MM/YYYY with separate sections)
-            for field_name, config in date_fields.items():
-                if config["page"] == page_num and field_name in data:
-                    self.fill_date_field(page, field_name, data[field_name], config)
-            
-            # Fill images
-            for field_name, config in image_fields.items():
-                if config["page"] == page_num and field_name in data:
-                    self.fill_image(page, field_name, data[field_name], config)
-            
-            # Fill checkboxes
-            for field_name, config in checkbox_fields.items():
-                if config["page"] == page_num and field_name in data:
-                    self.fill_checkbox(page, field_name, data[field_name], config)
+        if self._prefilled:
+            data = {name: value for name, value in data.items() if name not in self._prefilled}
+        self.fill_pages(dict(enumerate(self.doc)), data)
         
         print("\n" + "=" * 60)
         
-    def save(self):
-        """Save the filled PDF."""
+    def save(self, profile=None):
+        """
+        Save the filled PDF.
+        
+        Args:
+            profile: Save profile name (defaults to the filler's save_profile)
+            
+        Raises:
+            ValueError: If the filler was created without an output_pdf_path
+                (render with to_bytes() instead)
+        """
+        if self.doc and not self.output_path:
+            raise ValueError("save() needs an output_pdf_path; use to_bytes() to render without one")
         if self.doc:
-            self.doc.save(self.output_path)
-            self.doc.close()
-            print(f"\n✓ Filled form saved to: {self.output_path}")
+            self.flush_glyphs()
+            profile, options = self._save_options(profile)
+            if profile == "incremental":
+                self.doc.save(self._incremental_path, **options)
+                self.doc.close()
+                if self._incremental_path != self.output_path:
+                    shutil.move(self._incremental_path, self.output_path)
+            else:
+                self.doc.save(self.output_path, **options)
+                self.doc.close()
+            self.doc = None
+            print(f"\n✓ Filled form saved to: {self.output_path} (profile: {profile})")
             print("\nNEXT STEPS:")
             print("  1. Open the filled PDF")
             print("  2. Compare with the original template")
             print("  3. Adjust coordinates in layout_config.py if needed")
             print("  4. Re-run this script until perfect alignment")
         
+    def to_bytes(self, profile=None):
+        """
+        Render the filled PDF to bytes without touching the disk (except for
+        the "incremental" profile, which appends to its on-disk copy).
+        
+        Args:
+            profile: Save profile name (defaults to the filler's save_profile)
+        
+        Returns:
+            The PDF document as bytes
+        """
+        if not self.doc:
+            return b""
+        self.flush_glyphs()
+        profile, options = self._save_options(profile)
+        if profile == "incremental":
+            # Incremental writes can only go to the file the document came from
+            try:
+                self.doc.save(self._incremental_path, **options)
+                self.doc.close()
+                with open(self._incremental_path, "rb") as f:
+                    pdf_bytes = f.read()
+            finally:
+                if self._incremental_is_temp:
+                    os.remove(self._incremental_path)
+        else:
+            pdf_bytes = self.doc.tobytes(**options)
+            self.doc.close()
+        self.doc = None
+        return pdf_bytes
+        
+    def close(self):
+        """Discard the document without saving it."""
+        if self.doc:
+            self.doc.close()
+            self.doc = None
+        if self._incremental_is_temp and self._incremental_path and os.path.exists(self._incremental_path):
+            os.remove(self._incremental_path)
+        
     def fill_and_save(self, data):
         """Convenience method to fill and save in one call."""
         self.fill_form(data)
         self.save()
+        
+    def fill_to_bytes(self, data):
+        """Convenience method to fill and render to bytes in one call."""
+        self.fill_form(data)
+        return self.to_bytes()
+
+
+class MergedFormWriter:
+    """
+    Fill many records onto the pages of one print-ready PDF.
+    
+    Each output page shows the template page as a shared Form XObject (the
+    template's content, fonts and images are stored once), and images that
+    repeat across records, such as the default photograph and signature,
+    are embedded once and referenced by xref. Only the per-record overlay
+    grows the file.
+    """
+    
+    def __init__(self, template_pdf_path, **filler_options):
+        """
+        Initialize the writer.
+        
+        Args:
+            template_pdf_path: Path to the blank form template
+            **filler_options: Options passed on to PDFFormFiller
+                (batch_glyphs, preprocess_images, use_template_cache)
+        """
+        self.filler = PDFFormFiller(template_pdf_path, **filler_options)
+        if self.filler.use_template_cache:
+            self.template = get_template_registry().open_copy(template_pdf_path)
+        else:
+            self.template = fitz.open(template_pdf_path)
+        self.filler.doc = fitz.open()
+        self.record_count = 0
+        
+    def add_record(self, data):
+        """
+        Append one filled copy of the template for a record.
+        
+        If filling fails, the record's pages are removed again before the
+        error is raised, so the output never holds a half-filled form.
+        """
+        doc = self.filler.doc
+        first_page = doc.page_count
+        try:
+            pages = {}
+            for page_num, template_page in enumerate(self.template):
+                page = doc.new_page(width=template_page.rect.width, height=template_page.rect.height)
+                page.show_pdf_page(page.rect, self.template, page_num)
+                pages[page_num] = page
+            self.filler.fill_pages(pages, data)
+        except Exception:
+            self.filler._glyph_batches = {}
+            if doc.page_count > first_page:
+                doc.delete_pages(from_page=first_page, to_page=doc.page_count - 1)
+            raise
+        self.record_count += 1
+        
+    def save(self, output_pdf_path, profile="fast"):
+        """
+        Save the merged PDF.
+        
+        Args:
+            output_pdf_path: Path to save the merged PDF
+            profile: "fast" or "compact" (incremental saves don't apply here)
+        """
+        if profile not in ("fast", "compact"):
+            raise ValueError(f"Unsupported save profile for merged output: {profile}")
+        self.filler.doc.save(output_pdf_path, **SAVE_PROFILES[profile])
+        self.close()
+        print(f"\n✓ Merged {self.record_count} form(s) into: {output_pdf_path}")
+        
+    def close(self):
+        """Close the output and template documents."""
+        if self.filler.doc:
+            self.filler.doc.close()
+            self.filler.doc = None
+        if not self.template.is_closed:
+            self.template.close()
 
 
 def main():
@@ -0,0 +1,114 @@
+"""
+Template Cache
+Process-wide registry that loads each PDF template once and hands out cheap
+in-memory copies, so filling a form no longer re-reads the template from disk.
+"""
+import hashlib
+import os
+import threading
+
+import fitz  # PyMuPDF
+
+
+class TemplateEntry:
+    """A template loaded into memory, together with what it was loaded from."""
+
+    def __init__(self, path, data, mtime_ns, size):
+        """
+        Initialize a template entry.
+
+        Args:
+            path: Path the template was read from
+            data: Raw PDF bytes
+            mtime_ns: Modification time of the file when it was read
+            size: File size in bytes when it was read
+        """
+        self.path = path
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        self.hits = 0
+
+        # Parse once up front so a broken template fails at load time,
+        # not halfway through a request
+        master = fitz.open(stream=self.data, filetype="pdf")
+        self.page_count = len(master)
+        master.close()
+
+    def open_copy(self):
+        """Open a fresh, independent document from the cached bytes."""
+        return fitz.open(stream=self.data, filetype="pdf")
+
+
+class TemplateRegistry:
+    """Thread-safe cache of PDF templates keyed by absolute path."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, template_path):
+        """
+        Get the cached entry for a template, (re)loading it if needed.
+
+        The file is stat()ed on every call. If its mtime or size changed, it is
+        read again; when the content hash is unchanged the old entry is kept.
+
+        Args:
+            template_path: Path to the PDF template
+
+        Returns:
+            TemplateEntry for the template
+        """
+        key = os.path.abspath(template_path)
+        stat = os.stat(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                entry.hits += 1
+                return entry
+
+            with open(key, "rb") as f:
+                data = f.read()
+
+            if entry and entry.sha256 == hashlib.sha256(data).hexdigest():
+                # Touched but not modified - keep the parsed entry
+                entry.mtime_ns = stat.st_mtime_ns
+                entry.size = stat.st_size
+                entry.hits += 1
+                return entry
+
+            entry = TemplateEntry(key, data, stat.st_mtime_ns, stat.st_size)
+            self._entries[key] = entry
+            print(f"✓ Cached template: {template_path} ({entry.size} bytes, {entry.page_count} page(s))")
+            return entry
+
+    def open_copy(self, template_path):
+        """Open an independent in-memory copy of a template for filling."""
+        return self.get(template_path).open_copy()
+
+    def invalidate(self, template_path=None):
+        """Drop one cached template, or all of them if no path is given."""
+        with self._lock:
+            if template_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(template_path), None)
+
+    def stats(self):
+        """Return a summary of the cached templates."""
+        with self._lock:
+            return {
+                path: {"size": e.size, "sha256": e.sha256, "pages": e.page_count, "hits": e.hits}
+                for path, e in self._entries.items()
+            }
+
+
+_registry = TemplateRegistry()
+
+
+def get_template_registry():
+    """Get the process-wide template registry."""
+    return _registry
@@ -0,0 +1,33 @@
+"""Tests for saving filled forms with the different save profiles."""
+import os
+
+import pytest
+
+from step4_fill_form import PDFFormFiller
+
+TEMPLATE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "45679523-SBI-Account-Opening-Form-I (1)_removed.pdf")
+
+
+def test_incremental_save_without_output_path_is_rejected():
+    filler = PDFFormFiller(TEMPLATE_PDF, save_profile="incremental")
+    filler.open_template()
+    temp_copy = filler._incremental_path
+
+    with pytest.raises(ValueError, match="output_pdf_path"):
+        filler.save()
+
+    # The document is left open, so it can still be rendered or discarded
+    assert filler.to_bytes().startswith(b"%PDF")
+    assert not os.path.exists(temp_copy)
+
+
+def test_incremental_save_writes_to_output_path(tmp_path):
+    output_pdf = str(tmp_path / "filled.pdf")
+    filler = PDFFormFiller(TEMPLATE_PDF, output_pdf, save_profile="incremental")
+    filler.open_template()
+
+    filler.save()
+
+    with open(output_pdf, "rb") as f:
+        assert f.read(4) == b"%PDF"
@@ -0,0 +1,19 @@
+"""Tests for the image preprocessing cache."""
+import os
+import shutil
+
+from image_cache import ImageCache, ENCODING_JPEG
+
+PHOTOGRAPH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "photograph.jpg")
+
+
+def test_digest_memo_is_bounded(tmp_path):
+    cache = ImageCache(max_entries=2)
+    for i in range(5):
+        upload = tmp_path / f"photograph_{i}.jpg"
+        shutil.copyfile(PHOTOGRAPH, upload)
+        cache.prepare(str(upload), 100, 120, ENCODING_JPEG)
+
+    assert len(cache._digests) == 2
+    # Same content under another path is still served from the cache
+    assert cache.stats()["hits"] == 4
@@ -0,0 +1,52 @@
+"""Tests for parsing and retrying LLM extraction output."""
+import json
+
+import pytest
+
+import intelligent_form_filler
+
+
+class ScriptedClient:
+    """Stands in for OllamaClient, answering each chat call with the next output."""
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        content = self.outputs.pop(0)
+        if kwargs.get('stream'):
+            return iter([{'message': {'content': content}}])
+        return {'message': {'content': content}}
+
+
+@pytest.mark.parametrize('output', ['[]', '"PRIYA SINGH"', 'null', '42'])
+def test_non_object_json_is_a_parse_error(output):
+    with pytest.raises(json.JSONDecodeError):
+        intelligent_form_filler.parse_llm_output(output)
+
+
+def test_request_extraction_retries_non_object_json():
+    client = ScriptedClient(['["PRIYA SINGH"]', '{"full_name": "PRIYA SINGH"}'])
+
+    data = intelligent_form_filler.request_extraction(client, [], {})
+
+    assert data == {'full_name': 'PRIYA SINGH'}
+    assert client.calls == 2
+
+
+def test_stream_extraction_retries_unparseable_output(monkeypatch):
+    client = ScriptedClient(['null', '{"full_name": "PRIYA SINGH"}'])
+    monkeypatch.setattr(intelligent_form_filler, 'get_ollama_client', lambda: client)
+    plan = {'messages': [], 'response_format': {}}
+
+    events = intelligent_form_filler.stream_extraction(plan, {})
+    fields = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            fields.append(next(events)['field'])
+
+    assert stop.value.value == {'full_name': 'PRIYA SINGH'}
+    assert fields == ['full_name']
+    assert client.calls == 2
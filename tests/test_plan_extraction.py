@@ -0,0 +1,19 @@
+"""Tests for which rule values plan_extraction() treats as already resolved."""
+import intelligent_form_filler
+
+
+def test_invalid_rule_values_are_left_to_the_llm(monkeypatch):
+    rule_data = {
+        'full_name': "PRIYA SINGH\nI NEED A SAVINGS ACCOUNT PLEASE.",
+        'pincode': '12345',
+        'nationality': 'INDIAN',
+    }
+    confidence = {'full_name': 0.9, 'pincode': 1.0, 'nationality': 0.95}
+    monkeypatch.setattr(intelligent_form_filler, 'extract_with_rules', lambda raw: (rule_data, confidence))
+
+    plan = intelligent_form_filler.plan_extraction("Name: Priya Singh")
+
+    assert plan['local_data'] == {'nationality': 'INDIAN'}
+    assert 'full_name' in plan['missing_fields']
+    assert 'pincode' in plan['missing_fields']
+    assert not plan['complete']
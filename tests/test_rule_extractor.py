@@ -0,0 +1,56 @@
+"""Tests for the rule-based extractor's handling of labelled values."""
+import os
+
+from rule_extractor import extract_with_rules, covers_required_fields, HIGH_CONFIDENCE
+
+SAMPLE_INPUT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_input.txt")
+
+STRUCTURED_INPUT = """Name: Priya Singh
+Father: Rajesh Singh
+Mother: Sunita Singh
+DOB: 25/03/1995
+Gender: Female
+Status: Married
+
+Address: B-204 Green Valley Apartments, Malviya Nagar
+Near Metro Station, New Delhi 110017
+Phone: 9876543210
+Email: priya.singh@gmail.com
+"""
+
+
+def test_sample_input_values_stay_on_one_line():
+    with open(SAMPLE_INPUT_FILE, encoding="utf-8") as f:
+        data, _ = extract_with_rules(f.read())
+
+    assert data["nationality"] == "INDIAN"
+    assert not [field for field, value in data.items() if "\n" in value]
+    # Multi-line addresses are still joined and split into the form's fields
+    assert data["residential_address_line1"] == "FLAT 501 TOWER A"
+    assert data["pincode"] == "201301"
+    assert data["office_pincode"] == "122002"
+
+
+def test_chatter_after_a_labelled_value_is_not_part_of_it():
+    data, confidence = extract_with_rules("Name: Priya Singh\nI need a savings account please.")
+
+    assert data["full_name"] == "PRIYA SINGH"
+    assert confidence["full_name"] >= HIGH_CONFIDENCE
+
+
+def test_prose_ends_an_address():
+    data, _ = extract_with_rules(
+        "Address: Flat 2, MG Road\nNear Park\nPune, Maharashtra 411001\nI work at Infosys as an engineer."
+    )
+
+    assert data["pincode"] == "411001"
+    assert data["city"] == "PUNE"
+    assert not any("INFOSYS" in value for value in data.values())
+
+
+def test_structured_input_still_covers_the_required_fields():
+    data, confidence = extract_with_rules(STRUCTURED_INPUT)
+
+    assert covers_required_fields(confidence)
+    assert data["full_name"] == "PRIYA SINGH"
+    assert data["city"] == "NEW DELHI"